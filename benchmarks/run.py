@@ -0,0 +1,294 @@
+"""
+Benchmarks for config validation, input expansion, row counting and singularity bindings.
+
+Each benchmark is timed (best of --repeat runs) and then run once more under tracemalloc to get
+its peak memory. Results are compared against the stored baselines for the same scale and the
+run fails if any result is slower or uses more memory than the baseline by more than the
+threshold. Baselines depend on the machine, so save them (--save) on the machine the comparison
+will be run on
+
+Example:
+    python -m benchmarks --scale small --save
+    python -m benchmarks --scale small --threshold 0.2
+"""
+
+import argparse
+import copy
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from . import workloads
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+# absolute differences below these are never treated as regressions (timer and allocator noise)
+MIN_SECONDS = 0.002
+MIN_BYTES = 1 << 16
+
+
+class Scale(NamedTuple):
+    libraries: int
+    tree_depth: int
+    tree_fanout: int
+    tsv_size: int  # uncompressed size of each of the plain and gzipped inputs in bytes
+
+
+SCALES = {
+    'tiny': Scale(libraries=10, tree_depth=2, tree_fanout=3, tsv_size=1 << 20),
+    'small': Scale(libraries=100, tree_depth=3, tree_fanout=4, tsv_size=64 << 20),
+    'medium': Scale(libraries=1000, tree_depth=4, tree_fanout=5, tsv_size=512 << 20),
+    'large': Scale(libraries=10000, tree_depth=5, tree_fanout=6, tsv_size=4 << 30),
+}
+
+
+class Workload(NamedTuple):
+    config: Dict
+    brace_pattern: str
+    plain_tsv: str
+    gzip_tsv: str
+
+
+def build_workload(workdir: str, scale: Scale) -> Workload:
+    """
+    Generate the synthetic inputs for a scale, re-using them if the working directory already
+    has a complete workload for the same scale
+    """
+    marker = os.path.join(workdir, 'workload.json')
+    if os.path.exists(marker):
+        with open(marker, 'r') as fh:
+            saved = json.load(fh)
+        if saved['scale'] == list(scale):
+            return Workload(**saved['workload'])
+
+    tree_root = os.path.join(workdir, 'tree')
+    workloads.make_tree(tree_root, depth=scale.tree_depth, fanout=scale.tree_fanout)
+    plain_tsv = os.path.join(workdir, 'rows.tab')
+    gzip_tsv = os.path.join(workdir, 'rows.tab.gz')
+    rows = workloads.write_tsv(plain_tsv, scale.tsv_size)
+    workloads.write_tsv(gzip_tsv, scale.tsv_size, compress=True, start=rows)
+    workload = Workload(
+        config=workloads.make_config(workdir, scale.libraries),
+        brace_pattern=workloads.brace_pattern(
+            tree_root, depth=scale.tree_depth, fanout=scale.tree_fanout
+        ),
+        plain_tsv=plain_tsv,
+        gzip_tsv=gzip_tsv,
+    )
+    with open(marker, 'w') as fh:
+        json.dump({'scale': list(scale), 'workload': workload._asdict()}, fh)
+    return workload
+
+
+# each benchmark returns (setup, run): setup is called before every run (untimed) and its result
+# is passed to run
+Benchmark = Callable[[Workload], Tuple[Callable[[], tuple], Callable]]
+
+
+def _validate_config(workload: Workload):
+    from mavis_config import validate_config
+
+    return (lambda: (copy.deepcopy(workload.config),), validate_config)
+
+
+def _bash_expands(workload: Workload):
+    from mavis_config import bash_expands
+
+    return (lambda: (workload.brace_pattern,), bash_expands)
+
+
+def _count_plain(workload: Workload):
+    from mavis_config.counting import count_total_rows
+
+    return (lambda: ([workload.plain_tsv],), count_total_rows)
+
+
+def _count_gzip(workload: Workload):
+    from mavis_config.counting import count_total_rows
+
+    return (lambda: ([workload.gzip_tsv],), count_total_rows)
+
+
+def _guess_total_batches(workload: Workload):
+    from mavis_config import DEFAULTS, guess_total_batches
+
+    return (lambda: (DEFAULTS, [workload.plain_tsv, workload.gzip_tsv]), guess_total_batches)
+
+
+def _singularity_bindings(workload: Workload):
+    from mavis_config import get_singularity_bindings, validate_config
+
+    config = copy.deepcopy(workload.config)
+    validate_config(config)
+    return (lambda: (config,), get_singularity_bindings)
+
+
+BENCHMARKS: Dict[str, Benchmark] = {
+    'validate_config': _validate_config,
+    'bash_expands': _bash_expands,
+    'count_total_rows.plain': _count_plain,
+    'count_total_rows.gzip': _count_gzip,
+    'guess_total_batches': _guess_total_batches,
+    'get_singularity_bindings': _singularity_bindings,
+}
+
+_IMPORT_SCRIPT = '''
+import sys, time, tracemalloc
+if sys.argv[1] == 'memory':
+    tracemalloc.start()
+start = time.perf_counter()
+import mavis_config
+elapsed = time.perf_counter() - start
+print(elapsed if sys.argv[1] == 'time' else tracemalloc.get_traced_memory()[1])
+'''
+
+
+def measure_import(repeat: int) -> Dict[str, float]:
+    """
+    Time a cold import of the package in a fresh interpreter
+    """
+
+    def child(mode: str) -> float:
+        output = subprocess.check_output([sys.executable, '-c', _IMPORT_SCRIPT, mode])
+        return float(output.decode('utf8').strip())
+
+    return {
+        'seconds': min(child('time') for _ in range(repeat)),
+        'peak_bytes': int(child('memory')),
+    }
+
+
+def measure(setup: Callable[[], tuple], run: Callable, repeat: int) -> Dict[str, float]:
+    """
+    Best wall time over repeat runs and the peak traced memory of one more run
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        run(*args)
+        best = min(best, time.perf_counter() - start)
+
+    args = setup()
+    tracemalloc.start()
+    try:
+        run(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+def run_benchmarks(
+    workdir: str, scale: Scale, repeat: int = 3, only: Optional[List[str]] = None
+) -> Dict[str, Dict[str, float]]:
+    results = {}
+    if not only or 'import' in only:
+        results['import'] = measure_import(repeat)
+    workload = build_workload(workdir, scale)
+    for name, benchmark in BENCHMARKS.items():
+        if only and name not in only:
+            continue
+        setup, run = benchmark(workload)
+        results[name] = measure(setup, run, repeat)
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baselines: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    """
+    Find the results which are worse than their baseline by more than the threshold (a fraction,
+    ex. 0.25 for 25%)
+
+    Returns:
+        a message for each regression
+    """
+    regressions = []
+    for name, result in results.items():
+        baseline = baselines.get(name)
+        if not baseline:
+            continue
+        for metric, slack in [('seconds', MIN_SECONDS), ('peak_bytes', MIN_BYTES)]:
+            if metric not in baseline:
+                continue
+            limit = max(baseline[metric] * (1 + threshold), baseline[metric] + slack)
+            if result[metric] > limit:
+                regressions.append(
+                    f'{name} {metric}: {result[metric]:.6g} > {baseline[metric]:.6g} '
+                    f'(+{threshold:.0%} allowed)'
+                )
+    return regressions
+
+
+def load_baselines(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as fh:
+        return json.load(fh)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--scale', choices=list(SCALES), default='small')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per benchmark')
+    parser.add_argument(
+        '--only',
+        nargs='+',
+        choices=['import'] + list(BENCHMARKS),
+        help='run only these benchmarks',
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.25,
+        help='fail if a result is worse than its baseline by more than this fraction',
+    )
+    parser.add_argument('--baselines', default=BASELINES, help='baselines JSON file')
+    parser.add_argument(
+        '--save', action='store_true', help='store the results as the baselines for this scale'
+    )
+    parser.add_argument(
+        '--workdir',
+        help='directory for the generated inputs. Re-used between runs if given, otherwise a '
+        'temporary directory is created and removed afterwards',
+    )
+    parser.add_argument('-o', '--report', help='file to write the JSON results to')
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='mavis_config_benchmarks_')
+    os.makedirs(workdir, exist_ok=True)
+    try:
+        results = run_benchmarks(workdir, SCALES[args.scale], repeat=args.repeat, only=args.only)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    for name, result in results.items():
+        print(
+            f'{name:<28} {result["seconds"] * 1000:>12.3f} ms {result["peak_bytes"] / 2 ** 20:>10.2f} MiB'
+        )
+    if args.report:
+        with open(args.report, 'w') as fh:
+            json.dump({'scale': args.scale, 'results': results}, fh, indent=2)
+
+    baselines = load_baselines(args.baselines)
+    if args.save:
+        baselines.setdefault(args.scale, {}).update(results)
+        with open(args.baselines, 'w') as fh:
+            json.dump(baselines, fh, indent=2, sort_keys=True)
+        return 0
+
+    if args.scale not in baselines:
+        print(f'no baselines for the {args.scale} scale, nothing to compare against')
+        return 0
+    regressions = compare(results, baselines[args.scale], args.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}', file=sys.stderr)
+    return 1 if regressions else 0
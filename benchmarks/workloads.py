@@ -0,0 +1,113 @@
+"""
+Synthetic workload generators for the benchmarks. Everything is written below a scratch directory
+and is deterministic for a given set of arguments
+"""
+
+import gzip
+import os
+from typing import Dict, List
+
+# columns written to the synthetic mavis-style TSV inputs
+TSV_HEADER = '#break1_chromosome\tbreak1_position_start\tbreak2_chromosome\tbreak2_position_start\n'
+ROWS_PER_CHUNK = 20000
+
+
+def make_tree(root: str, depth: int = 3, fanout: int = 4, files_per_dir: int = 4) -> List[str]:
+    """
+    Create a balanced directory tree of (empty) input files
+
+    Returns:
+        the leaf directories which contain files (named sample<N>.tab)
+    """
+    leaves = [root]
+    for level in range(depth):
+        leaves = [os.path.join(parent, f'd{level}_{i}') for parent in leaves for i in range(fanout)]
+    for leaf in leaves:
+        os.makedirs(leaf, exist_ok=True)
+        for i in range(files_per_dir):
+            open(os.path.join(leaf, f'sample{i}.tab'), 'a').close()
+    return leaves
+
+
+def brace_pattern(root: str, depth: int = 3, fanout: int = 4, files_per_dir: int = 4) -> str:
+    """
+    A brace/glob expression which matches every file created by make_tree
+    """
+    parts = [root]
+    for level in range(depth):
+        parts.append('{' + ','.join(f'd{level}_{i}' for i in range(fanout)) + '}')
+    parts.append('sample[0-9]*.tab' if files_per_dir > 1 else 'sample0.tab')
+    return os.path.join(*parts)
+
+
+def make_config(root: str, libraries: int, inputs_per_library: int = 2) -> Dict:
+    """
+    Create a setup config with the given number of libraries. Half the libraries assign a shared
+    conversion alias, the rest assign glob expressions, and every library has a bam file, so all
+    the validation paths (expansion, conversions, bam checks) are exercised
+    """
+    input_dir = os.path.join(root, 'inputs')
+    bam_dir = os.path.join(root, 'bams')
+    ref_dir = os.path.join(root, 'reference')
+    for dirname in [input_dir, bam_dir, ref_dir]:
+        os.makedirs(dirname, exist_ok=True)
+
+    def touch(path: str) -> str:
+        open(path, 'a').close()
+        return path
+
+    references = {
+        key: [touch(os.path.join(ref_dir, f'{key}.ref'))]
+        for key in ['annotations', 'reference_genome', 'aligner_reference', 'masking']
+    }
+    config: Dict = {
+        'output_dir': os.path.join(root, 'output'),
+        'libraries': {},
+        'convert': {
+            'converted': {
+                'inputs': [touch(os.path.join(input_dir, 'converted.vcf'))],
+                'file_type': 'vcf',
+            }
+        },
+    }
+    for key, files in references.items():
+        config[f'reference.{key}'] = files
+
+    for lib in range(libraries):
+        library_dir = os.path.join(input_dir, f'lib{lib // 100}')
+        os.makedirs(library_dir, exist_ok=True)
+        for i in range(inputs_per_library):
+            touch(os.path.join(library_dir, f'lib{lib}_{i}.tab'))
+        assign = [os.path.join(library_dir, f'lib{lib}_*.tab')]
+        if lib % 2:
+            assign.append('converted')
+        config['libraries'][f'lib{lib}'] = {
+            'assign': assign,
+            'disease_status': 'diseased' if lib % 2 else 'normal',
+            'protocol': 'genome' if lib % 3 else 'transcriptome',
+            'bam_file': touch(os.path.join(bam_dir, f'lib{lib}.bam')),
+        }
+    return config
+
+
+def write_tsv(path: str, size: int, compress: bool = False, start: int = 0) -> int:
+    """
+    Write a TSV of distinct rows of roughly the given size in bytes (uncompressed)
+
+    Returns:
+        the number of rows written
+    """
+    opener = gzip.open if compress else open
+    written = 0
+    rows = 0
+    with opener(path, 'wt') as fh:
+        fh.write(TSV_HEADER)
+        while written < size:
+            chunk = ''.join(
+                f'{1 + (i % 22)}\t{i * 7}\t{1 + (i * 3 % 22)}\t{i * 11}\n'
+                for i in range(start + rows, start + rows + ROWS_PER_CHUNK)
+            )
+            fh.write(chunk)
+            written += len(chunk)
+            rows += ROWS_PER_CHUNK
+    return rows
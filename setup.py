@@ -53,6 +53,7 @@ setup(
     author_email='creisle@bcgsc.ca',
     test_suite='tests',
     include_package_data=True,
+    entry_points={'console_scripts': ['mavis_config = mavis_config.main:main']},
     data_files=[
         ('mavis_config', ['src/mavis_config/config.json', 'src/mavis_config/overlay.json'])
     ],
@@ -4,45 +4,39 @@ try:
 except ImportError:  # pragma: no cover
     from collections import Mapping  # pragma: no cover
 
-import gzip
+import copy
 import math
 import os
-from glob import glob
-from typing import Dict, List
-
-from braceexpand import braceexpand
-from snakemake.exceptions import WorkflowError
-from snakemake.utils import validate as snakemake_validate
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Optional
 
+from .bindings import covering_directories
 from .constants import SUBCOMMAND
+from .counting import RowCountCache, count_rows_by_file, count_total_rows
+from .estimate import RowEstimate, estimate_total_rows
+from .expand import ExpansionCache, bash_expands
+from .index import ConfigIndex
+from .instrument import count, phase, record
+from .plan import BatchPlan, Shard, plan_batches
+from .schema import schema_defaults, schema_name, validate_schema
+from .stage_config import export_stage_configs, load_stage_config
+from .typed import TypedConfig, typed_config
+from .util import IO_THREADS, converted_output_path, index_sections, scan_prefix
+from .validation_cache import ValidationCache
 
 
-def bash_expands(*expressions) -> List[str]:
+class ImmutableDict(Mapping):
     """
-    expand a file glob expression, allowing bash-style brackets.
-
-    Returns:
-        a list of files
-
-    Example:
-        >>> bash_expands('./{test,doc}/*py')
-        [...]
+    Read-only mapping which indexes its dotted keys by prefix when it is built, so sections
+    (ex. 'cluster.') can be looked up without scanning or copying. The wrapped data must not be
+    modified afterwards
     """
-    result = []
-    for expression in expressions:
-        eresult = []
-        for name in braceexpand(expression):
-            for fname in glob(name):
-                eresult.append(fname)
-        if not eresult:
-            raise FileNotFoundError('The expression does not match any files', expression)
-        result.extend(eresult)
-    return [os.path.abspath(f) for f in result]
-
 
-class ImmutableDict(Mapping):
     def __init__(self, data):
         self._data = data
+        self._sections = index_sections(data.items())
 
     def __getitem__(self, key):
         return self._data[key]
@@ -53,29 +47,106 @@ class ImmutableDict(Mapping):
     def __iter__(self):
         return iter(self._data)
 
+    def section(self, prefix: str) -> Mapping:
+        """
+        Read-only view of the items whose keys start with prefix, with the prefix removed
+        """
+        if prefix.endswith('.'):
+            return self._sections.get(prefix, _EMPTY_SECTION)
+        return MappingProxyType(scan_prefix(self._data, prefix))
+
 
-def get_by_prefix(config: Dict, prefix: str) -> Dict:
-    return {k.replace(prefix, ''): v for k, v in config.items() if k.startswith(prefix)}
+_EMPTY_SECTION: Mapping = MappingProxyType({})
 
 
-def validate_config(config: Dict, stage: str = SUBCOMMAND.SETUP) -> None:
+def get_by_prefix(config: Mapping, prefix: str) -> Mapping:
+    """
+    Get the items whose keys start with prefix, with the prefix removed. Indexed configs
+    (ImmutableDict, ConfigIndex) return a shared read-only view, otherwise a new dict is built
+    """
+    if isinstance(config, (ImmutableDict, ConfigIndex)):
+        return config.section(prefix)
+    return scan_prefix(config, prefix)
+
+
+def validate_config(
+    config: Dict,
+    stage: str = SUBCOMMAND.SETUP,
+    expansion_cache: Optional[ExpansionCache] = None,
+    io_threads: int = IO_THREADS,
+    result_cache: Optional[ValidationCache] = None,
+) -> None:
     """
     Check that the input JSON config conforms to the expected schema as well
     as the other relevant checks such as file exsts
+
+    Args:
+        config: the config to validate (updated in place with defaults and expanded file paths)
+        stage: the pipeline stage the config is being validated for
+        expansion_cache: directory listing cache for expanding the input file globs. By default a
+            new cache is used for each call so that directories are only listed once per call
+        io_threads: maximum number of threads used to check input files concurrently
+        result_cache: re-use the result of validating an identical config for the same stage
+            as long as none of the files it refers to have changed
+    """
+    with phase('validate_config'):
+        if result_cache is None:
+            _validate_config(config, stage, expansion_cache, io_threads)
+            return
+
+        validated = result_cache.get(config, stage)
+        if validated is None:
+            original = copy.deepcopy(config)
+            if expansion_cache is None:
+                expansion_cache = ExpansionCache()
+            _validate_config(config, stage, expansion_cache, io_threads)
+            result_cache.set(original, stage, config, expansion_cache.searched_directories())
+        else:
+            config.clear()
+            config.update(validated)
+
+
+def _bam_exists(path: str) -> bool:
+    count('validate_config.bam_files', files=1, stats=1)
+    return os.path.exists(path)
+
+
+class ValidationCancelledError(Exception):
+    """
+    Raised when validation in a background thread was stopped before it finished
     """
-    schema = 'config' if stage != SUBCOMMAND.OVERLAY else 'overlay'
+
+
+def _unless_stopped(stop: Optional[threading.Event], func, *args, **kwargs):
+    if stop is not None and stop.is_set():
+        raise ValidationCancelledError()
+    return func(*args, **kwargs)
+
+
+def _validate_config(
+    config: Dict,
+    stage: str,
+    expansion_cache: Optional[ExpansionCache],
+    io_threads: int,
+    stop: Optional[threading.Event] = None,
+) -> None:
+    # snakemake is slow to import so defer it until validation is actually requested
+    from snakemake.exceptions import WorkflowError
+
+    schema = schema_name(stage)
 
     try:
-        snakemake_validate(
-            config,
-            os.path.join(os.path.dirname(__file__), f'{schema}.json'),
-        )
+        with phase('validate_config.schema'):
+            validate_schema(config, schema)
     except Exception as err:
         short_msg = '. '.join(
             [line for line in str(err).split('\n') if line.strip()][:3]
         )  # these can get super long
         raise WorkflowError(short_msg)
 
+    if expansion_cache is None:
+        expansion_cache = ExpansionCache()
+
     required = []
     if (
         stage not in {SUBCOMMAND.CONVERT, SUBCOMMAND.CLUSTER}
@@ -100,78 +171,100 @@ def validate_config(config: Dict, stage: str = SUBCOMMAND.SETUP) -> None:
         if req not in config:
             raise WorkflowError(f'missing required property: {req}')
 
-    if schema == 'config':
-        # check all assignments are conversions aliases or existing files
-        for libname, library in config['libraries'].items():
-            assignments = []
-            for i, assignment in enumerate(library['assign']):
-                if assignment in config.get('convert', {}):
-                    if 'output_dir' not in config:
-                        raise WorkflowError('missing required property: output_dir')
-                    # replace the alias with the expected output path
-                    converted_output = os.path.join(
-                        os.path.join(config['output_dir'], 'converted_outputs'), f'{assignment}.tab'
-                    )
-                    if stage != SUBCOMMAND.SETUP:
-                        assignments.append(converted_output)
-                    else:
-                        assignments.append(assignment)
-                    continue
-                try:
-                    expanded = bash_expands(assignment)
-                    assignments.extend(expanded)
-                except FileNotFoundError:
-                    raise FileNotFoundError(f'cannot find the expected input file {assignment}')
-
-            library['assign'] = assignments
-
-            if not config.get('skip_stage.validate') and stage in {
-                SUBCOMMAND.VALIDATE,
-                SUBCOMMAND.SETUP,
-            }:
-                if not library.get('bam_file', None) or not os.path.exists(library['bam_file']):
+    check_bams = not config.get('skip_stage.validate') and stage in {
+        SUBCOMMAND.VALIDATE,
+        SUBCOMMAND.SETUP,
+    }
+    conversions = config.get('convert', {}) if schema == 'config' else {}
+    libraries = config['libraries'] if schema == 'config' else {}
+
+    # the file system checks are latency bound (esp. on network file systems) so issue them all
+    # up front and then check the results in config order so the first error is the same as if
+    # they had been run one at a time. Once stop is set the checks which have not started yet
+    # raise instead so that abandoned validation in a background thread finishes quickly
+    with phase('validate_config.files'), ThreadPoolExecutor(max_workers=io_threads) as pool:
+        submitted = []
+
+        def submit(func, *args, **kwargs) -> Future:
+            future = pool.submit(_unless_stopped, stop, func, *args, **kwargs)
+            submitted.append(future)
+            return future
+
+        def expand(expression: str) -> Future:
+            return submit(bash_expands, expression, cache=expansion_cache)
+
+        library_checks = {}
+        for libname, library in libraries.items():
+            assignments = [None if a in conversions else expand(a) for a in library['assign']]
+            bam_exists = None
+            if check_bams and library.get('bam_file', None):
+                bam_exists = submit(_bam_exists, library['bam_file'])
+            library_checks[libname] = (assignments, bam_exists)
+
+        conversion_checks = {
+            alias: [expand(f) for f in conversion['inputs']]
+            for alias, conversion in conversions.items()
+        }
+        reference_checks = {
+            ref_type: [expand(f) for f in config[ref_type]]
+            for ref_type in list(config.keys())
+            if ref_type.startswith('reference.')
+        }
+
+        try:
+            # check all assignments are conversions aliases or existing files
+            for libname, library in libraries.items():
+                assignments = []
+                expansions, bam_exists = library_checks[libname]
+                for assignment, expansion in zip(library['assign'], expansions):
+                    if expansion is None:
+                        if 'output_dir' not in config:
+                            raise WorkflowError('missing required property: output_dir')
+                        # replace the alias with the expected output path
+                        if stage != SUBCOMMAND.SETUP:
+                            assignments.append(
+                                converted_output_path(config['output_dir'], assignment)
+                            )
+                        else:
+                            assignments.append(assignment)
+                        continue
+                    try:
+                        assignments.extend(expansion.result())
+                    except FileNotFoundError:
+                        raise FileNotFoundError(f'cannot find the expected input file {assignment}')
+
+                library['assign'] = assignments
+
+                if check_bams and (bam_exists is None or not bam_exists.result()):
                     raise FileNotFoundError(
                         f'missing bam file for library ({libname}), it is a required input when the validate stage is not skipped'
                     )
 
-        # expand and check the input files exist for any conversions
-        for conversion in config.get('convert', {}).values():
-            expanded = []
-            for input_file in conversion['inputs']:
-                expanded.extend(bash_expands(input_file))
-            conversion['inputs'] = expanded
-
-    # make sure all the reference files specified exist and overload with environment variables where applicable
-    for ref_type in list(config.keys()):
-        if not ref_type.startswith('reference.'):
-            continue
-        expanded = []
-        for input_file in config[ref_type]:
-            expanded.extend(bash_expands(input_file))
-        config[ref_type] = expanded
-
-
-def count_total_rows(filenames: List[str]) -> int:
-    """
-    For some list of files, count the total cumulative lines excluding comments and blank lines
-    """
-    row_count = 0
-    for filename in filenames:
-        if filename.endswith('.gz'):
-            with gzip.open(filename, 'rt') as fh:
-                lines = {l for l in fh.readlines() if not l.startswith('#') and l.strip()}
-                row_count += len(lines)
-        else:
-            with open(filename, 'r') as fh:
-                lines = {l for l in fh.readlines() if not l.startswith('#') and l.strip()}
-                row_count += len(lines)
-    return row_count
+            # expand and check the input files exist for any conversions
+            for alias, conversion in conversions.items():
+                expanded = []
+                for expansion in conversion_checks[alias]:
+                    expanded.extend(expansion.result())
+                conversion['inputs'] = expanded
+
+            # make sure all the reference files specified exist and overload with environment variables where applicable
+            for ref_type, expansions in reference_checks.items():
+                expanded = []
+                for expansion in expansions:
+                    expanded.extend(expansion.result())
+                config[ref_type] = expanded
+        except BaseException:
+            for future in submitted:
+                future.cancel()
+            raise
 
 
 def get_library_inputs(config: Dict, library_name: str) -> List[str]:
     """
     Get all the raw/initial input files for a given library name
     """
+    if isinstance(config, ConfigIndex):
+        return list(config.library_inputs(library_name))
     lib_config = config['libraries'][library_name]
     inputs = []
     for assignment in lib_config['assign']:
@@ -182,41 +275,54 @@ def get_library_inputs(config: Dict, library_name: str) -> List[str]:
     return inputs
 
 
-def get_singularity_bindings(config: Dict) -> List[str]:
+def get_singularity_bindings(config: Dict, max_binds: Optional[int] = None) -> List[str]:
     """
     Extract bindings for singularity from the library inputs and reference files
     specified in the JSON config file
+
+    Args:
+        config: the validated config
+        max_binds: limit the number of read-only bindings by binding common parent directories
+            instead (see covering_directories)
+
+    Returns:
+        the read-write binding for the output directory followed by the minimal set of read-only
+        bindings for the directories containing the inputs
     """
-    inputs = []
     output_dir = os.path.abspath(config['output_dir'])
-    for library_name in config['libraries']:
-        inputs.extend(get_library_inputs(config, library_name))
+    if isinstance(config, ConfigIndex):
+        inputs = list(config.all_inputs())
+    else:
+        inputs = []
+        for library_name in config['libraries']:
+            inputs.extend(get_library_inputs(config, library_name))
 
-        if config['libraries'][library_name].get('bam_file', ''):
-            inputs.append(config['libraries'][library_name]['bam_file'])
+            if config['libraries'][library_name].get('bam_file', ''):
+                inputs.append(config['libraries'][library_name]['bam_file'])
 
         for files in get_by_prefix(config, 'reference.').values():
             inputs.extend(files)
 
+    directories = {os.path.abspath(os.path.dirname(i)) for i in inputs}
     bindings = [f'{output_dir}:{output_dir}']
 
-    for path in {os.path.abspath(os.path.dirname(i)) for i in inputs}:
-        if not path.startswith(output_dir):
-            bindings.append(f'{path}:{path}:ro')
+    for path in covering_directories(directories, max_binds, exclude=output_dir):
+        bindings.append(f'{path}:{path}:ro')
 
     return bindings
 
 
-def guess_total_batches(config: Dict, input_files) -> int:
+def _saturation_rows(max_files: int, min_rows: int) -> int:
     """
-    Given a list of input files for a library, give an estimate of the optimal number
-    of jobs to split it into based on the config settings
+    The smallest total number of rows for which guess_total_batches returns max_files
     """
-    # if not input by user, estimate the clusters based on the input files
-    max_files = config['cluster.max_files']
-    min_rows = config['cluster.min_clusters_per_file']
-    total_rows = count_total_rows(input_files)
+    total_rows = max(0, math.floor((min_rows - 0.5) * max_files) - 1)
+    while round(total_rows / max_files) < min_rows:
+        total_rows += 1
+    return total_rows
+
 
+def _batches_from_rows(max_files: int, min_rows: int, total_rows: int) -> int:
     if round(total_rows / max_files) >= min_rows:
         # use max number of jobs
         return max_files
@@ -224,10 +330,100 @@ def guess_total_batches(config: Dict, input_files) -> int:
         return math.ceil(total_rows / min_rows)
 
 
-DEFAULTS = {}  # type: ignore
-snakemake_validate(
-    DEFAULTS,
-    os.path.join(os.path.dirname(__file__), 'config.json'),
-    set_default=True,
-)
-DEFAULTS = ImmutableDict(DEFAULTS)  # type: ignore
+def _batches_from_estimate(max_files: int, min_rows: int, estimated: RowEstimate) -> Optional[int]:
+    """
+    The number of batches for an estimated row count, or None if the confidence interval of the
+    estimate is too wide to tell whether the result should be max_files or not
+    """
+    saturation_rows = _saturation_rows(max_files, min_rows)
+    if estimated.lower >= saturation_rows:
+        return max_files
+    elif estimated.upper < saturation_rows:
+        return math.ceil(estimated.rows / min_rows)
+    return None
+
+
+def guess_total_batches(
+    config: Dict,
+    input_files,
+    processes: Optional[int] = 1,
+    cache: Optional[RowCountCache] = None,
+    estimate: bool = False,
+) -> int:
+    """
+    Given a list of input files for a library, give an estimate of the optimal number
+    of jobs to split it into based on the config settings
+
+    Args:
+        config: the validated config
+        input_files: the input files for the library
+        processes: number of worker processes to use counting the input files
+        cache: row count cache (see RowCountCache.for_output_dir) to skip unchanged files
+        estimate: estimate the rows by sampling the input files instead of counting them. Falls
+            back to counting when the confidence interval of the estimate spans the point where
+            the result switches to max_files
+    """
+    # if not input by user, estimate the clusters based on the input files
+    max_files = config['cluster.max_files']
+    min_rows = config['cluster.min_clusters_per_file']
+
+    with phase('guess_total_batches'):
+        if estimate:
+            with phase('guess_total_batches.estimate'):
+                estimated = estimate_total_rows(input_files)
+            batches = _batches_from_estimate(max_files, min_rows, estimated)
+            if batches is not None:
+                return batches
+
+        # past this many rows the answer is always max_files so there is no need to count further
+        total_rows = count_total_rows(
+            input_files,
+            processes=processes,
+            cache=cache,
+            limit=_saturation_rows(max_files, min_rows),
+        )
+        return _batches_from_rows(max_files, min_rows, total_rows)
+
+
+def guess_cohort_batches(
+    config: Dict,
+    processes: Optional[int] = 1,
+    cache: Optional[RowCountCache] = None,
+) -> Dict[str, int]:
+    """
+    Guess the number of batches for every library in the config at once. Input files shared by
+    several libraries (directly or through the same conversion) are only counted once, and all
+    the distinct inputs are counted together so they can be spread over the worker processes
+
+    Args:
+        config: the validated config
+        processes: number of worker processes to use counting the input files
+        cache: row count cache (see RowCountCache.for_output_dir) to skip unchanged files
+
+    Returns:
+        the number of batches for each library, the same as guess_total_batches would give for
+        each library's inputs
+    """
+    max_files = config['cluster.max_files']
+    min_rows = config['cluster.min_clusters_per_file']
+    # past this many rows a library always gets max_files, so no single file needs counting further
+    saturation_rows = _saturation_rows(max_files, min_rows)
+
+    with phase('guess_cohort_batches'):
+        library_inputs = {
+            library_name: get_library_inputs(config, library_name)
+            for library_name in config['libraries']
+        }
+        counts = count_rows_by_file(
+            [f for inputs in library_inputs.values() for f in inputs],
+            processes=processes,
+            cache=cache,
+            limit=saturation_rows,
+        )
+        return {
+            library_name: _batches_from_rows(max_files, min_rows, sum(counts[f] for f in inputs))
+            for library_name, inputs in library_inputs.items()
+        }
+
+
+DEFAULTS = ImmutableDict(schema_defaults('config'))
@@ -0,0 +1,188 @@
+import asyncio
+import copy
+import math
+import threading
+from collections import Counter
+from concurrent.futures import Executor
+from functools import partial
+from typing import Dict, List, Optional
+
+from . import (
+    IO_THREADS,
+    _batches_from_estimate,
+    _batches_from_rows,
+    _saturation_rows,
+    _validate_config,
+)
+from .constants import SUBCOMMAND
+from .counting import RowCountCache, _count_file_rows
+from .estimate import estimate_total_rows
+from .expand import ExpansionCache
+from .instrument import phase
+
+
+def _validate_config_until(
+    config: Dict,
+    stage: str,
+    expansion_cache: Optional[ExpansionCache],
+    io_threads: int,
+    stop: threading.Event,
+) -> None:
+    with phase('validate_config'):
+        _validate_config(config, stage, expansion_cache, io_threads, stop)
+
+
+async def validate_config_async(
+    config: Dict,
+    stage: str = SUBCOMMAND.SETUP,
+    timeout: Optional[float] = None,
+    executor: Optional[Executor] = None,
+    expansion_cache: Optional[ExpansionCache] = None,
+    io_threads: int = IO_THREADS,
+) -> None:
+    """
+    Async version of validate_config. Validation runs on a copy of the config in an executor
+    thread (the event loop default unless one is given) and the config is only updated once
+    validation has succeeded, so a timed out or cancelled validation leaves it untouched.
+
+    When timed out or cancelled the file system checks which have not started yet are skipped,
+    but a check which is already blocked (ex. a stat on an unresponsive network mount) cannot be
+    interrupted and holds its thread until it returns. Pass a dedicated executor so that these
+    threads cannot starve other work submitted to the event loop default executor
+
+    Raises:
+        asyncio.TimeoutError: validation did not finish within the timeout (in seconds)
+    """
+    loop = asyncio.get_event_loop()
+    validated = copy.deepcopy(config)
+    stop = threading.Event()
+    try:
+        await asyncio.wait_for(
+            loop.run_in_executor(
+                executor,
+                partial(
+                    _validate_config_until, validated, stage, expansion_cache, io_threads, stop
+                ),
+            ),
+            timeout,
+        )
+    finally:
+        # tell the validation thread to give up if it is still running
+        stop.set()
+    config.clear()
+    config.update(validated)
+
+
+async def _count_total_rows(
+    filenames: List[str],
+    approximate: bool,
+    cache: Optional[RowCountCache],
+    limit: Optional[int],
+    executor: Optional[Executor],
+) -> int:
+    loop = asyncio.get_event_loop()
+    multiplicity = Counter(filenames)
+    counts = {}
+    if cache is not None:
+        for filename in multiplicity:
+            rows = await loop.run_in_executor(
+                executor, partial(cache.get, filename, approximate=approximate)
+            )
+            if rows is not None:
+                counts[filename] = rows
+    total = sum(counts[f] * multiplicity[f] for f in counts)
+    if limit is not None and total >= limit:
+        return total
+
+    file_limits = {}
+    tasks = {}
+    stop = threading.Event()
+    for filename in multiplicity:
+        if filename in counts:
+            continue
+        if limit is not None:
+            file_limits[filename] = max(1, math.ceil((limit - total) / multiplicity[filename]))
+        else:
+            file_limits[filename] = None
+        task = loop.run_in_executor(
+            executor,
+            partial(_count_file_rows, filename, approximate, file_limits[filename], stop),
+        )
+        tasks[task] = filename
+
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                filename = tasks[task]
+                counts[filename] = task.result()
+                total += counts[filename] * multiplicity[filename]
+            if limit is not None and total >= limit:
+                break
+    finally:
+        # tell any counting threads which are still running to give up
+        stop.set()
+        for task in tasks:
+            task.cancel()
+
+    if cache is not None:
+        for filename, file_limit in file_limits.items():
+            # partial counts (stopped at the limit) are not cached
+            if filename in counts and (file_limit is None or counts[filename] < file_limit):
+                cache.set(filename, counts[filename], approximate=approximate)
+        await loop.run_in_executor(executor, cache.save)
+    return total
+
+
+async def count_total_rows_async(
+    filenames: List[str],
+    approximate: bool = False,
+    cache: Optional[RowCountCache] = None,
+    limit: Optional[int] = None,
+    timeout: Optional[float] = None,
+    executor: Optional[Executor] = None,
+) -> int:
+    """
+    Async version of count_total_rows. Files are counted concurrently in the executor, which
+    must be a thread pool (or None for the event loop default). When cancelled or timed out the
+    counting threads stop at the end of their current chunk
+
+    Raises:
+        asyncio.TimeoutError: counting did not finish within the timeout (in seconds)
+    """
+    return await asyncio.wait_for(
+        _count_total_rows(filenames, approximate, cache, limit, executor), timeout
+    )
+
+
+async def guess_total_batches_async(
+    config: Dict,
+    input_files: List[str],
+    cache: Optional[RowCountCache] = None,
+    estimate: bool = False,
+    timeout: Optional[float] = None,
+    executor: Optional[Executor] = None,
+) -> int:
+    """
+    Async version of guess_total_batches
+
+    Raises:
+        asyncio.TimeoutError: the batches could not be determined within the timeout (in seconds)
+    """
+    max_files = config['cluster.max_files']
+    min_rows = config['cluster.min_clusters_per_file']
+
+    async def guess() -> int:
+        if estimate:
+            loop = asyncio.get_event_loop()
+            estimated = await loop.run_in_executor(executor, estimate_total_rows, input_files)
+            batches = _batches_from_estimate(max_files, min_rows, estimated)
+            if batches is not None:
+                return batches
+        total_rows = await _count_total_rows(
+            input_files, False, cache, _saturation_rows(max_files, min_rows), executor
+        )
+        return _batches_from_rows(max_files, min_rows, total_rows)
+
+    return await asyncio.wait_for(guess(), timeout)
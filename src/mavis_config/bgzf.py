@@ -0,0 +1,161 @@
+"""
+Reading BGZF (blocked gzip, as written by bgzip/htslib) files in independent pieces. A BGZF file is
+a series of gzip members of at most 64 KiB, each with its compressed size in a 'BC' extra field,
+so the block boundaries can be found without decompressing anything
+"""
+
+import os
+import struct
+import zlib
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+GZIP_MAGIC = b'\x1f\x8b'
+READ_SIZE = 1 << 20  # bytes of compressed data to read at a time
+
+
+def block_size(header: bytes) -> Optional[int]:
+    """
+    Get the total size of a BGZF block from its header (at least the first 12 bytes plus the
+    extra field), or None if it is not a BGZF block header
+    """
+    if len(header) < 18 or header[:2] != GZIP_MAGIC or header[2] != 8 or not header[3] & 4:
+        return None
+    (xlen,) = struct.unpack_from('<H', header, 10)
+    position = 12
+    end = min(12 + xlen, len(header))
+    while position + 4 <= end:
+        subfield = header[position : position + 2]
+        (length,) = struct.unpack_from('<H', header, position + 2)
+        if subfield == b'BC' and length == 2 and position + 6 <= end:
+            return struct.unpack_from('<H', header, position + 4)[0] + 1
+        position += 4 + length
+    return None
+
+
+def is_bgzf(filename: str) -> bool:
+    """
+    Check if a file starts with a BGZF block (plain or multi-member gzip files do not)
+    """
+    try:
+        with open(filename, 'rb') as fh:
+            return block_size(fh.read(64)) is not None
+    except OSError:
+        return False
+
+
+def read_gzi(filename: str) -> Optional[List[int]]:
+    """
+    Read the compressed offsets of the blocks from a bgzip (.gzi) index. The first block (at 0)
+    is not listed in the index
+
+    Returns:
+        the offsets, or None if the index cannot be read
+    """
+    try:
+        with open(filename, 'rb') as fh:
+            data = fh.read()
+    except OSError:
+        return None
+    if len(data) < 8:
+        return None
+    (entries,) = struct.unpack_from('<Q', data)
+    if len(data) != 8 + 16 * entries:
+        return None
+    return [struct.unpack_from('<Q', data, 8 + 16 * i)[0] for i in range(entries)]
+
+
+def scan_block_offsets(fh: BinaryIO) -> Optional[List[int]]:
+    """
+    Find the offsets of all the blocks in a BGZF file by reading each block header
+
+    Returns:
+        the offsets, or None if any block is not a BGZF block
+    """
+    offsets = []
+    size = os.fstat(fh.fileno()).st_size
+    offset = 0
+    while offset < size:
+        fh.seek(offset)
+        length = block_size(fh.read(64))
+        if length is None:
+            return None
+        offsets.append(offset)
+        offset += length
+    return offsets
+
+
+def block_offsets(filename: str) -> Optional[List[int]]:
+    """
+    The offsets of the blocks in a BGZF file, from its .gzi index if there is one that is newer
+    than the file and otherwise by scanning the block headers
+
+    Returns:
+        the offsets, or None if the file is not BGZF
+    """
+    index = f'{filename}.gzi'
+    with open(filename, 'rb') as fh:
+        if block_size(fh.read(64)) is None:
+            return None
+        size = os.fstat(fh.fileno()).st_size
+        try:
+            fresh = os.path.getmtime(index) >= os.fstat(fh.fileno()).st_mtime
+        except OSError:
+            fresh = False
+        offsets = read_gzi(index) if fresh else None
+        if offsets is not None and all(0 < o < size for o in offsets):
+            return [0] + offsets
+        return scan_block_offsets(fh)
+
+
+def split_ranges(offsets: List[int], size: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Group consecutive blocks into at most parts byte ranges of about the same compressed size
+    """
+    ranges = []
+    start = 0
+    for offset in offsets[1:]:
+        if offset - start >= (size - start) / max(1, parts - len(ranges)):
+            ranges.append((start, offset))
+            start = offset
+    ranges.append((start, size))
+    return ranges
+
+
+def inflate_range(fh: BinaryIO, start: int, end: int) -> Iterator[bytes]:
+    """
+    Decompress the gzip members in a byte range which starts and ends on member boundaries
+    """
+    fh.seek(start)
+    remaining = end - start
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    in_member = False
+    while remaining > 0:
+        data = fh.read(min(READ_SIZE, remaining))
+        if not data:
+            break
+        remaining -= len(data)
+        while data:
+            in_member = True
+            output = decompressor.decompress(data)
+            if output:
+                yield output
+            if not decompressor.eof:
+                break
+            in_member = False
+            data = decompressor.unused_data
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if in_member or remaining > 0:
+        raise EOFError('Compressed file ended before the end-of-stream marker was reached')
+
+
+def starts_blocks(filename: str, offsets: List[int]) -> bool:
+    """
+    Check that there is a BGZF block header at each of the offsets (ex. to check that a .gzi
+    index belongs to the file)
+    """
+    with open(filename, 'rb') as fh:
+        for offset in offsets:
+            fh.seek(offset)
+            if block_size(fh.read(64)) is None:
+                return False
+    return True
@@ -0,0 +1,84 @@
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _components(path: str) -> Tuple[str, ...]:
+    return tuple(os.path.abspath(path).split(os.sep))
+
+
+def _join(components: Tuple[str, ...]) -> str:
+    return os.sep.join(components) or os.sep
+
+
+def is_subpath(path: str, parent: str) -> bool:
+    """
+    Check if a path is the same as or inside of a parent directory (by path components so that
+    /data2 is not considered to be inside /data)
+    """
+    path_parts = _components(path)
+    parent_parts = _components(parent)
+    return path_parts[: len(parent_parts)] == parent_parts
+
+
+def covering_directories(
+    directories: Iterable[str], max_paths: Optional[int] = None, exclude: Optional[str] = None
+) -> List[str]:
+    """
+    Reduce a list of directories to the smallest set which contains all of them by dropping
+    directories which are inside of another directory in the set. Paths are sorted by their
+    components (the depth-first order of the directory trie) so this is O(n log n)
+
+    Args:
+        directories: the directories to be covered
+        max_paths: if there are still more than this many directories, replace the deepest
+            directories sharing a parent with that parent until there are not. The file system root
+            is never used so this is a best effort
+        exclude: a directory to keep out of the result (ex. the read-write output directory).
+            Directories inside of it are dropped and directories are never replaced by it or any
+            of its parents
+
+    Returns:
+        the covering directories in sorted order
+    """
+    excluded = _components(exclude) if exclude is not None else None
+    covering: List[Tuple[str, ...]] = []
+    for parts in sorted({_components(d) for d in directories}):
+        if covering and parts[: len(covering[-1])] == covering[-1]:
+            continue
+        if excluded is not None and parts[: len(excluded)] == excluded:
+            continue
+        covering.append(parts)
+
+    if max_paths is None or len(covering) <= max_paths:
+        return [_join(parts) for parts in covering]
+
+    # count the covering directories below each parent in the trie. Once all the deeper parents
+    # have been collapsed each child of a parent holds exactly one covering directory, so
+    # collapsing it saves (number of children - 1)
+    children: Dict[Tuple[str, ...], set] = {}
+    for parts in covering:
+        for depth in range(2, len(parts)):  # never collapse into the file system root
+            if excluded is not None and excluded[:depth] == parts[:depth]:
+                continue  # a parent of the excluded directory would cover it
+            children.setdefault(parts[:depth], set()).add(parts[depth])
+    parents = sorted(
+        (parent for parent, names in children.items() if len(names) > 1),
+        key=lambda parent: (-len(parent), -len(children[parent]), parent),
+    )
+    total = len(covering)
+    collapsed = set()
+    for parent in parents:
+        if total <= max_paths:
+            break
+        collapsed.add(parent)
+        total -= len(children[parent]) - 1
+
+    result: List[Tuple[str, ...]] = []
+    for parts in covering:
+        for depth in range(2, len(parts)):
+            if parts[:depth] in collapsed:
+                parts = parts[:depth]
+                break
+        if not result or result[-1] != parts:
+            result.append(parts)
+    return [_join(parts) for parts in result]
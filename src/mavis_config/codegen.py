@@ -0,0 +1,345 @@
+"""
+Generates fastschema.py, the specialized validation functions for the package JSON schemas. The
+generated functions check a config without modifying it and only set the default values once the
+whole config is known to be valid, so that invalid configs can be passed on unchanged to the
+jsonschema validator for its error message. Re-generate after any change to the schemas:
+
+    python -m mavis_config.codegen
+"""
+
+import argparse
+import itertools
+import json
+import os
+from typing import Dict, List, Optional
+
+from .schema import SCHEMAS, load_schema, schema_digest
+
+MODULE_PATH = os.path.join(os.path.dirname(__file__), 'fastschema.py')
+
+TYPE_CHECKS = {
+    'object': 'isinstance({0}, dict)',
+    'array': 'isinstance({0}, list)',
+    'string': 'isinstance({0}, str)',
+    'boolean': 'isinstance({0}, bool)',
+    'null': '{0} is None',
+    # anything other than plain int/float (ex. Decimal) is left to jsonschema
+    'number': 'type({0}) in (int, float)',
+    'integer': '(type({0}) is int or type({0}) is float and {0}.is_integer())',
+}
+
+
+def _literal(value) -> str:
+    # plain (not ordered) dicts and lists, evaluated to a new object each time like a deep copy
+    return repr(json.loads(json.dumps(value)))
+
+
+def _has_defaults(schema) -> bool:
+    """
+    Check if validating against the schema would set any default values
+    """
+    if not isinstance(schema, dict):
+        return False
+    properties = schema.get('properties', {})
+    if any(isinstance(sub, dict) and 'default' in sub for sub in properties.values()):
+        return True
+    subschemas = list(properties.values())
+    subschemas.extend([schema.get('additionalProperties'), schema.get('items'), schema.get('not')])
+    subschemas.extend(schema.get('anyOf', []))
+    return any(_has_defaults(sub) for sub in subschemas)
+
+
+def _validated_keywords() -> set:
+    from jsonschema import Draft7Validator
+
+    return set(Draft7Validator.VALIDATORS)
+
+
+class _Generator:
+    def __init__(self):
+        self.constants: List[str] = []
+        self.functions: List[str] = []
+        self._counter = itertools.count()
+        self._constants: Dict[str, str] = {}
+        self._keywords = _validated_keywords()
+
+    def _name(self, prefix: str) -> str:
+        return f'_{prefix}_{next(self._counter)}'
+
+    def constant(self, prefix: str, expression: str) -> str:
+        # identical constants (ex. the same colour pattern on many settings) are shared
+        name = self._constants.get(expression)
+        if name is None:
+            name = self._constants[expression] = self._name(prefix)
+            self.constants.append(f'{name} = {expression}')
+        return name
+
+    def function(self, prefix: str, body: List[str], result: Optional[str]) -> str:
+        name = self._name(prefix)
+        lines = [f'def {name}(v0):'] + (body or ['    pass'])
+        if result:
+            lines.append(f'    {result}')
+        self.functions.append('\n'.join(lines))
+        return name
+
+    def check_function(self, schema, virtual: Dict) -> str:
+        """
+        Function returning whether a value is valid for the schema
+        """
+        body: List[str] = []
+        self.check(schema, 0, body, 1, dict(virtual))
+        return self.function('check', body, 'return True')
+
+    def defaults_function(self, schema) -> str:
+        """
+        Function setting the default values on a value which is valid for the schema
+        """
+        body: List[str] = []
+        self.defaults(schema, 0, body, 1)
+        return self.function('defaults', body, None)
+
+    def check(self, schema, depth: int, out: List[str], indent: int, virtual: Dict) -> None:
+        """
+        Add the statements checking the value (named v<depth>) against a schema to out
+
+        Args:
+            virtual: defaults jsonschema would already have set on the value when checking the
+                remaining keywords (default values are only set as the properties keyword is
+                checked, and keywords are checked in the order they appear in the schema)
+        """
+        pad = '    ' * indent
+        var = f'v{depth}'
+        child = f'v{depth + 1}'
+        if schema is True or schema == {}:
+            return
+        if schema is False:
+            out.append(f'{pad}return False')
+            return
+
+        for keyword, value in schema.items():
+            if keyword not in self._keywords:
+                continue  # annotations (description, default, etc.) and unknown keywords
+            elif keyword == 'type':
+                types = [value] if isinstance(value, str) else value
+                test = ' or '.join(TYPE_CHECKS[t].format(var) for t in types)
+                out.append(f'{pad}if not ({test}):')
+                out.append(f'{pad}    return False')
+            elif keyword == 'enum':
+                if not all(isinstance(v, str) for v in value):
+                    raise NotImplementedError('only string enums are supported', value)
+                options = self.constant('ENUM', f'frozenset({_literal(value)})')
+                out.append(f'{pad}if not (isinstance({var}, str) and {var} in {options}):')
+                out.append(f'{pad}    return False')
+            elif keyword == 'const':
+                if isinstance(value, bool) or value is None:
+                    out.append(f'{pad}if {var} is not {value!r}:')
+                elif isinstance(value, str):
+                    out.append(f'{pad}if not (isinstance({var}, str) and {var} == {value!r}):')
+                else:
+                    raise NotImplementedError('only string, boolean and null const', value)
+                out.append(f'{pad}    return False')
+            elif keyword == 'pattern':
+                pattern = self.constant('PATTERN', f're.compile({value!r})')
+                out.append(f'{pad}if isinstance({var}, str) and not {pattern}.search({var}):')
+                out.append(f'{pad}    return False')
+            elif keyword in {'minimum', 'maximum'}:
+                operator = '>=' if keyword == 'minimum' else '<='
+                out.append(
+                    f'{pad}if isinstance({var}, Number) and not isinstance({var}, bool) and not '
+                    f'(type({var}) in (int, float) and {var} {operator} {value!r}):'
+                )
+                out.append(f'{pad}    return False')
+            elif keyword in {'minItems', 'maxItems'}:
+                operator = '<' if keyword == 'minItems' else '>'
+                out.append(f'{pad}if isinstance({var}, list) and len({var}) {operator} {value}:')
+                out.append(f'{pad}    return False')
+            elif keyword == 'minProperties':
+                size = f'len({var})'
+                if virtual:
+                    names = self.constant('KEYS', f'{_literal(list(virtual))}')
+                    size += f' + sum(k not in {var} for k in {names})'
+                out.append(f'{pad}if isinstance({var}, dict) and {size} < {value}:')
+                out.append(f'{pad}    return False')
+            elif keyword == 'required':
+                missing = [f'{p!r} in {var}' for p in value if p not in virtual]
+                if missing:
+                    out.append(
+                        f'{pad}if isinstance({var}, dict) and not ({" and ".join(missing)}):'
+                    )
+                    out.append(f'{pad}    return False')
+            elif keyword == 'items':
+                if not isinstance(value, (dict, bool)):
+                    raise NotImplementedError('only a single items schema is supported', value)
+                body = []
+                self.check(value, depth + 1, body, indent + 2, {})
+                if body:
+                    out.append(f'{pad}if isinstance({var}, list):')
+                    out.append(f'{pad}    for {child} in {var}:')
+                    out.extend(body)
+            elif keyword == 'properties':
+                defaults = {
+                    p: s['default']
+                    for p, s in value.items()
+                    if isinstance(s, dict) and 'default' in s
+                }
+                self._check_defaults(value, defaults)
+                if defaults:
+                    # jsonschema fails (TypeError) setting defaults on anything but a dict
+                    out.append(f'{pad}if not isinstance({var}, dict):')
+                    out.append(f'{pad}    return False')
+                    inner = indent
+                else:
+                    out.append(f'{pad}if isinstance({var}, dict):')
+                    inner = indent + 1
+                inner_pad = '    ' * inner
+                body_start = len(out)
+                for prop, subschema in value.items():
+                    body: List[str] = []
+                    if prop in virtual:
+                        # already set to the default if missing, so always checked
+                        self.check(subschema, depth + 1, body, inner, {})
+                        if body:
+                            default = _literal(virtual[prop])
+                            out.append(f'{inner_pad}{child} = {var}.get({prop!r}, {default})')
+                    else:
+                        self.check(subschema, depth + 1, body, inner + 1, {})
+                        if body:
+                            out.append(f'{inner_pad}{child} = {var}.get({prop!r}, _MISSING)')
+                            out.append(f'{inner_pad}if {child} is not _MISSING:')
+                    out.extend(body)
+                if not defaults and len(out) == body_start:
+                    out.pop()  # nothing to check
+                virtual.update(defaults)
+            elif keyword == 'additionalProperties':
+                if 'patternProperties' in schema:
+                    raise NotImplementedError('patternProperties is not supported')
+                properties = list(schema.get('properties', {}))
+                if value is False:
+                    names = self.constant('KEYS', f'frozenset({_literal(properties)})')
+                    out.append(
+                        f'{pad}if isinstance({var}, dict) and not {names}.issuperset({var}):'
+                    )
+                    out.append(f'{pad}    return False')
+                elif value is not True:
+                    body = []
+                    self.check(value, depth + 1, body, indent + (3 if properties else 2), {})
+                    if body:
+                        out.append(f'{pad}if isinstance({var}, dict):')
+                        out.extend(self._additional(properties, var, child, indent + 1))
+                        out.extend(body)
+            elif keyword in {'anyOf', 'not'}:
+                subschemas = value if keyword == 'anyOf' else [value]
+                if any(_has_defaults(s) for s in subschemas):
+                    raise NotImplementedError(f'defaults inside {keyword} are not supported')
+                checks = [f'{self.check_function(s, virtual)}({var})' for s in subschemas]
+                if keyword == 'anyOf':
+                    out.append(f'{pad}if not ({" or ".join(checks)}):')
+                else:
+                    out.append(f'{pad}if {checks[0]}:')
+                out.append(f'{pad}    return False')
+            else:
+                raise NotImplementedError(f'unsupported schema keyword: {keyword}')
+
+    def _additional(self, properties: List[str], var: str, child: str, indent: int) -> List[str]:
+        """
+        Loop header over the values of the properties not in properties
+        """
+        pad = '    ' * indent
+        if not properties:
+            return [f'{pad}for {child} in {var}.values():']
+        names = self.constant('KEYS', f'frozenset({_literal(properties)})')
+        return [f'{pad}for key, {child} in {var}.items():', f'{pad}    if key not in {names}:']
+
+    def _check_defaults(self, properties: Dict, defaults: Dict) -> None:
+        # invalid defaults would make every config invalid, which the generated code does not check
+        from jsonschema import Draft7Validator
+
+        for prop, default in defaults.items():
+            if not Draft7Validator(properties[prop]).is_valid(default):
+                raise ValueError(f'default value for {prop} does not match its schema', default)
+
+    def defaults(self, schema, depth: int, out: List[str], indent: int) -> None:
+        """
+        Add the statements setting the default values on a valid value (named v<depth>) to out
+        """
+        if not _has_defaults(schema):
+            return
+        pad = '    ' * indent
+        var = f'v{depth}'
+        child = f'v{depth + 1}'
+        properties = schema.get('properties', {})
+        for prop, subschema in properties.items():
+            if isinstance(subschema, dict) and 'default' in subschema:
+                out.append(f'{pad}if {prop!r} not in {var}:')
+                out.append(f'{pad}    {var}[{prop!r}] = {_literal(subschema["default"])}')
+        for prop, subschema in properties.items():
+            if _has_defaults(subschema):
+                out.append(f'{pad}{child} = {var}.get({prop!r}, _MISSING)')
+                out.append(f'{pad}if {child} is not _MISSING:')
+                self.defaults(subschema, depth + 1, out, indent + 1)
+        if _has_defaults(schema.get('additionalProperties')):
+            out.extend(self._additional(list(properties), var, child, indent))
+            self.defaults(
+                schema['additionalProperties'], depth + 1, out, indent + (2 if properties else 1)
+            )
+        if _has_defaults(schema.get('items')):
+            out.append(f'{pad}for {child} in {var}:')
+            self.defaults(schema['items'], depth + 1, out, indent + 1)
+
+
+def generate_module() -> str:
+    """
+    Generate the source of the fastschema module for all the package schemas
+    """
+    generator = _Generator()
+    validators = []
+    for name in SCHEMAS:
+        schema = load_schema(name)
+        check = generator.check_function(schema, {})
+        defaults = generator.defaults_function(schema)
+        generator.functions.append(
+            '\n'.join(
+                [
+                    f'def validate_{name}(config) -> bool:',
+                    '    """',
+                    f'    Check a config against the {name} schema, setting any default values if it',
+                    '    is valid. Invalid configs are not modified',
+                    '    """',
+                    f'    if not {check}(config):',
+                    '        return False',
+                    f'    {defaults}(config)',
+                    '    return True',
+                ]
+            )
+        )
+        validators.append(name)
+
+    digests = ', '.join(f'{name!r}: {schema_digest(name)!r}' for name in validators)
+    lines = [
+        '# generated from the package JSON schemas by python -m mavis_config.codegen, do not edit',
+        '# fmt: off',
+        'import re',
+        'from numbers import Number',
+        '',
+        f'SCHEMA_DIGESTS = {{{digests}}}',
+        '',
+        '_MISSING = object()',
+    ]
+    lines.extend(generator.constants)
+    for function in generator.functions:
+        lines.extend(['', '', function])
+    validators_map = ', '.join(f'{name!r}: validate_{name}' for name in validators)
+    lines.extend(['', '', f'VALIDATORS = {{{validators_map}}}', ''])
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('-o', '--output', default=MODULE_PATH, help='file to write the module to')
+    args = parser.parse_args(argv)
+    with open(args.output, 'w') as fh:
+        fh.write(generate_module())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,776 @@
+import codecs
+import gzip
+import json
+import locale
+import math
+import multiprocessing
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing
+from hashlib import blake2b
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from . import bgzf
+
+from .instrument import count, enabled, phase
+from .util import write_json_atomic
+
+CHUNK_SIZE = 1 << 20  # bytes of lines to read at a time
+BGZF_RANGES = 4  # ranges of blocks to split a BGZF file into per process
+DISTINCT_BUFFER_SIZE = 1 << 18  # distinct digests buffered in a set before packing them into a run
+RUN_FAN_IN = 8  # runs of packed digests merged at a time
+MERGE_SLICE_SIZE = 1 << 18  # digests per slice of the digest range when merging runs
+HLL_PRECISION = 14  # 2**14 registers, standard error of 1.04 / sqrt(2**14) ~ 0.81%
+ROW_COUNT_CACHE_FILENAME = '.row_counts.json'
+
+
+def open_input(filename: str) -> IO[str]:
+    """
+    Open a (possibly gzipped) input file for reading as text
+    """
+    if filename.endswith('.gz'):
+        return gzip.open(filename, 'rt')
+    return open(filename, 'r')
+
+
+def iter_row_chunks(filename: str, chunk_size: int = CHUNK_SIZE) -> Iterator[List[str]]:
+    """
+    Iterate over the non-comment, non-blank lines in a file in lists of roughly chunk_size bytes
+    so that memory use does not depend on the size of the file
+    """
+    with open_input(filename) as fh:
+        count('read_rows', files=1)
+        position = 0
+        while True:
+            lines = fh.readlines(chunk_size)
+            if not lines:
+                break
+            if enabled():
+                # the position of the binary (decompressed) stream, since lines are characters
+                offset = fh.buffer.tell()
+                count('read_rows', bytes_read=offset - position)
+                position = offset
+            yield [line for line in lines if not line.startswith('#') and line.strip()]
+
+
+def iter_rows(filename: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """
+    Iterate over the non-comment, non-blank lines in a file
+    """
+    for rows in iter_row_chunks(filename, chunk_size):
+        yield from rows
+
+
+def line_digest(line: str) -> int:
+    """
+    Fixed-width (64-bit, unsigned) digest of a line. Unlike the builtin hash this is stable between
+    processes so estimates do not depend on which worker counted a file
+    """
+    return int.from_bytes(
+        blake2b(line.encode('utf8', 'surrogateescape'), digest_size=8).digest(), 'big'
+    )
+
+
+def _merged_slices(runs: List[array]) -> Iterator[Dict[int, None]]:
+    """
+    Merge sorted runs of digests a slice of the digest range at a time, so that only the digests
+    of one slice are boxed at once. Yields the distinct digests of each slice in order (as the
+    keys of a dict)
+    """
+    slices = max(1, sum(map(len, runs)) // MERGE_SLICE_SIZE)
+    starts = [0] * len(runs)
+    for i in range(1, slices + 1):
+        # the (exclusive) end of the slice of the signed 64-bit digest range
+        bound = i * (1 << 64) // slices - (1 << 63)
+        digests: List[int] = []
+        for j, run in enumerate(runs):
+            end = bisect_left(run, bound, starts[j]) if i < slices else len(run)
+            digests.extend(run[starts[j] : end])
+            starts[j] = end
+        # sorting the concatenated runs only merges them, the dict drops the adjacent duplicates
+        digests.sort()
+        yield dict.fromkeys(digests)
+
+
+def _merge_runs(runs: List[array]) -> array:
+    """
+    Merge sorted runs of digests into one sorted run without duplicates
+    """
+    merged = array('q')
+    for digests in _merged_slices(runs):
+        merged.extend(digests)
+    return merged
+
+
+class DistinctCounter:
+    """
+    Exact count of distinct lines. The builtin str hash of each line is buffered in a set which is
+    packed into a sorted array of 64-bit digests (a run) whenever it fills, and runs are merged
+    RUN_FAN_IN at a time to drop the duplicates between them. Memory is the buffer plus ~8 bytes
+    per distinct line (up to twice that while merging) instead of ~70 bytes per distinct line for
+    a set of ints. Sorting the digests in Python makes counting a file with more distinct lines
+    than the buffer holds ~2-3x slower. The probability of a hash collision is ~n**2 / 2**65
+    (~3e-4 for 1e8 lines)
+    """
+
+    def __init__(self):
+        self._buffer: set = set()
+        self._levels: List[List[array]] = []  # runs, by the number of times they were merged
+
+    def add(self, line: str) -> None:
+        self._buffer.add(hash(line))
+        if len(self._buffer) >= DISTINCT_BUFFER_SIZE:
+            self._spill()
+
+    def update(self, lines: Iterable[str]) -> None:
+        self._buffer.update(map(hash, lines))
+        if len(self._buffer) >= DISTINCT_BUFFER_SIZE:
+            self._spill()
+
+    def merge(self, other: 'DistinctCounter') -> None:
+        for level in other._levels:
+            for run in level:
+                self._add_run(run)
+        self.update_digests(other._buffer)
+
+    def update_digests(self, digests: Iterable[int]) -> None:
+        # digests from another process are only comparable if it has the same hash seed
+        if isinstance(digests, array):
+            self._add_run(digests)  # a sorted run of distinct digests (see digests)
+            return
+        self._buffer.update(digests)
+        if len(self._buffer) >= DISTINCT_BUFFER_SIZE:
+            self._spill()
+
+    def _spill(self) -> None:
+        self._add_run(array('q', sorted(self._buffer)))
+        self._buffer = set()
+
+    def _add_run(self, run: array, level: int = 0) -> None:
+        while True:
+            if level == len(self._levels):
+                self._levels.append([])
+            runs = self._levels[level]
+            runs.append(run)
+            if len(runs) < RUN_FAN_IN:
+                return
+            run = _merge_runs(runs)
+            self._levels[level] = []
+            level += 1
+
+    def _runs(self) -> List[array]:
+        if self._buffer:
+            self._spill()
+        return [run for level in self._levels for run in level]
+
+    def digests(self) -> array:
+        """
+        The sorted digests of the distinct lines, merging all of the runs into one
+        """
+        runs = self._runs()
+        merged = runs[0] if len(runs) == 1 else _merge_runs(runs)
+        # kept as the only run, on a level above any of the runs still to come
+        self._levels = [[] for _ in self._levels] + [[merged]]
+        return merged
+
+    def count(self) -> int:
+        if not self._levels:
+            return len(self._buffer)
+        # counted a slice at a time instead of merging the runs into a copy of all the digests
+        return sum(map(len, _merged_slices(self._runs())))
+
+    def reached(self, limit: int) -> bool:
+        """
+        Whether at least limit distinct lines have been counted. This does not merge the runs, so
+        once lines have been packed into runs it may only be true some lines after the limit
+        """
+        largest = max((len(run) for level in self._levels for run in level), default=0)
+        return max(len(self._buffer), largest) >= limit
+
+
+class HyperLogLog:
+    """
+    Approximate count of distinct lines in constant memory (2**precision bytes). The relative
+    standard error of the estimate is 1.04 / sqrt(2**precision)
+
+    This bounds memory, it does not save time: each line is hashed with blake2b (see line_digest)
+    one at a time in Python, which is ~2x slower than an exact count of a file with fewer distinct
+    lines than DISTINCT_BUFFER_SIZE and about as fast as one with more
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        if not 4 <= precision <= 18:
+            raise ValueError('precision must be between 4 and 18', precision)
+        self.precision = precision
+        self._registers = bytearray(1 << precision)
+
+    def add(self, line: str) -> None:
+        digest = line_digest(line)
+        bits = 64 - self.precision
+        index = digest >> bits
+        rank = bits - (digest & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def update(self, lines: Iterable[str]) -> None:
+        # the same as add for each line, without the method call per line
+        bits = 64 - self.precision
+        mask = (1 << bits) - 1
+        registers = self._registers
+        for line in lines:
+            digest = line_digest(line)
+            index = digest >> bits
+            rank = bits - (digest & mask).bit_length() + 1
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        if other.precision != self.precision:
+            raise ValueError('cannot merge counters with different precision')
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def reached(self, limit: int) -> bool:
+        return self.count() >= limit
+
+    def count(self) -> int:
+        size = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0**-r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            # small range correction (linear counting)
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
+
+
+# the ASCII characters str.strip removes (bytes.strip leaves \x1c-\x1f)
+_WHITESPACE = b' \t\n\x0b\x0c\r\x1c\x1d\x1e\x1f'
+# a line after the first with only whitespace (\r is excluded since text containing it falls back
+# to the text reader). Anchoring on the newlines instead of using ^ and $ lets re find candidates
+# with memchr
+_BLANK_LINE = re.compile(rb'\n[ \t\x0b\x0c\x1c-\x1f]*\n')
+
+
+def _isascii(data: bytes) -> bool:
+    try:
+        return data.isascii()
+    except AttributeError:  # pragma: no cover (python < 3.7)
+        return not re.search(rb'[\x80-\xff]', data)
+
+
+class _FallBack(Exception):
+    pass
+
+
+def _split_rows(data: bytes, encoding: str) -> List:
+    """
+    Split the decompressed text of a range of BGZF blocks into the non-comment, non-blank lines
+    (without the newline) with bulk byte operations. Lines are only filtered one at a time when
+    the text may contain comments, blank lines or non-ASCII characters. Undecoded lines are
+    distinct exactly when the decoded lines would be, so the count is the same as reading the file
+    in text mode. A final line without a newline is returned wrapped in a tuple since it is not
+    the same as the line with one
+
+    Raises:
+        _FallBack: the text needs the text mode reader (carriage returns which are translated to
+            newlines, or bytes which would not decode)
+    """
+    if b'\r' in data:
+        raise _FallBack()
+    lines = data.split(b'\n')
+    # the final line of the file without a newline, or b'' if there is not one
+    last = lines.pop()
+    ascii_only = _isascii(data)
+    if not ascii_only:
+        try:
+            data.decode(encoding)
+        except UnicodeDecodeError:
+            raise _FallBack()
+    if (
+        not ascii_only
+        or data.startswith(b'#')
+        or b'\n#' in data
+        or (lines and not lines[0].strip(_WHITESPACE))
+        or _BLANK_LINE.search(data)
+    ):
+        lines = [
+            line
+            for line in lines
+            if not line.startswith(b'#')
+            and line.strip(_WHITESPACE)
+            and (ascii_only or _isascii(line) or line.decode(encoding).strip())
+        ]
+    if last and not last.startswith(b'#') and last.decode(encoding).strip():
+        lines.append((last,))
+    return lines
+
+
+def _bytes_encoding() -> Optional[str]:
+    # the undecoded rows can only be used when the encoding is ASCII compatible and has a single
+    # encoding for each character
+    encoding = codecs.lookup(locale.getpreferredencoding(False)).name
+    return encoding if encoding in {'utf-8', 'ascii'} else None
+
+
+class _RangeText:
+    """
+    The partial lines at either end of a range of BGZF blocks, to be joined to the neighbouring
+    ranges
+    """
+
+    __slots__ = ['head', 'tail', 'size']
+
+    def __init__(self):
+        self.head: Optional[bytes] = None  # the text up to and including the first newline
+        self.tail = b''  # the text after the last newline (all the text if there was no newline)
+        self.size = 0  # uncompressed bytes in the range
+
+
+def _iter_bgzf_rows(
+    filename: str, start: int, end: int, encoding: str, text: _RangeText
+) -> Iterator[List]:
+    """
+    Decompress a range of BGZF blocks and split the complete lines between the first and last
+    newline into rows (see _split_rows). The text before and after them is stored on text
+    """
+    pending = b''
+    with open(filename, 'rb') as fh:
+        for data in bgzf.inflate_range(fh, start, end):
+            text.size += len(data)
+            data = pending + data
+            cut = data.rfind(b'\n') + 1
+            if not cut:
+                pending = data
+                continue
+            pending = data[cut:]
+            if text.head is None:
+                first = data.find(b'\n') + 1
+                text.head = data[:first]
+                data = data[first:cut]
+            else:
+                data = data[:cut]
+            yield _split_rows(data, encoding)
+    text.tail = pending
+
+
+class _RangeRows(NamedTuple):
+    head: Optional[bytes]
+    digests: bytes  # the distinct rows between the head and the tail as a sorted array of hashes
+    tail: bytes
+    size: int
+
+
+def _count_bgzf_range(filename: str, start: int, end: int, encoding: str) -> Optional[_RangeRows]:
+    """
+    Hash the distinct rows in a range of BGZF blocks (in a worker process)
+
+    Returns:
+        the rows, or None if the text cannot be counted as bytes
+    """
+    text = _RangeText()
+    counter = DistinctCounter()
+    try:
+        for rows in _iter_bgzf_rows(filename, start, end, encoding, text):
+            counter.update(rows)
+    except _FallBack:
+        return None
+    return _RangeRows(text.head, counter.digests().tobytes(), text.tail, text.size)
+
+
+def _star_count_bgzf_range(args: Tuple) -> Optional[_RangeRows]:
+    return _count_bgzf_range(*args)
+
+
+def _count_bgzf_rows(
+    filename: str,
+    limit: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+    processes: int = 1,
+) -> Optional[int]:
+    """
+    Count the distinct rows in a BGZF file by decompressing ranges of its blocks in separate
+    processes. The processes must be forked so that they hash lines the same way as this one,
+    where fork is not available the file is read here instead
+
+    Returns:
+        the count or None if the file is not BGZF or cannot be counted this way
+    """
+    encoding = _bytes_encoding()
+    if encoding is None:
+        return None
+    offsets = bgzf.block_offsets(filename)
+    if offsets is None:
+        return None
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        processes = 1
+    size = os.path.getsize(filename)
+    # more ranges than processes to balance the work and check the limit more often
+    ranges = bgzf.split_ranges(offsets, size, processes * BGZF_RANGES if processes > 1 else 1)
+    if not bgzf.starts_blocks(filename, [start for start, _ in ranges]):
+        return None
+
+    counter = DistinctCounter()
+    try:
+        if len(ranges) == 1:
+            text = _RangeText()
+            for rows in _iter_bgzf_rows(filename, 0, size, encoding, text):
+                if stop is not None and stop.is_set():
+                    raise CountCancelledError(filename)
+                counter.update(rows)
+                if limit is not None and counter.reached(limit):
+                    break
+            else:
+                counter.update(_split_rows((text.head or b'') + text.tail, encoding))
+            count('read_rows', files=1, bytes_read=text.size)
+            return counter.count()
+
+        tasks = [(filename, start, end, encoding) for start, end in ranges]
+        carry = b''
+        uncompressed = 0
+        with multiprocessing.get_context('fork').Pool(min(processes, len(ranges))) as pool:
+            for result in pool.imap(_star_count_bgzf_range, tasks):
+                if stop is not None and stop.is_set():
+                    raise CountCancelledError(filename)
+                if result is None:
+                    return None
+                uncompressed += result.size
+                if result.head is None:
+                    carry += result.tail
+                    continue
+                counter.update(_split_rows(carry + result.head, encoding))
+                counter.update_digests(array('q', result.digests))
+                carry = result.tail
+                if limit is not None and counter.reached(limit):
+                    break
+            else:
+                counter.update(_split_rows(carry, encoding))
+    except _FallBack:
+        return None
+    count('read_rows', files=1, bytes_read=uncompressed)
+    return counter.count()
+
+
+def count_file_rows(
+    filename: str, approximate: bool = False, limit: Optional[int] = None, processes: int = 1
+) -> int:
+    """
+    Count the distinct non-comment, non-blank lines in a single file
+
+    Args:
+        filename: the file to count rows in
+        approximate: use a HyperLogLog estimate instead of an exact count
+        limit: stop reading once at least this many rows have been counted. If the returned
+            count is below the limit then it is the count for the whole file
+        processes: number of processes to decompress BGZF files with
+    """
+    return _count_file_rows(filename, approximate, limit, processes=processes)
+
+
+def _count_file_rows(
+    filename: str,
+    approximate: bool = False,
+    limit: Optional[int] = None,
+    stop: Optional[threading.Event] = None,
+    processes: int = 1,
+) -> int:
+    # stop is checked between chunks so that counting in a thread can be abandoned
+    if not approximate and filename.endswith('.gz'):
+        rows = _count_bgzf_rows(filename, limit, stop, processes)
+        if rows is not None:
+            return rows
+    counter = HyperLogLog() if approximate else DistinctCounter()
+    with closing(iter_row_chunks(filename)) as chunks:
+        for rows in chunks:
+            if stop is not None and stop.is_set():
+                raise CountCancelledError(filename)
+            counter.update(rows)
+            if limit is not None and counter.reached(limit):
+                break
+    return counter.count()
+
+
+# a line ending in any of the newlines translated in text mode, or a final unterminated line
+_UNIVERSAL_LINE = re.compile(rb'[^\r\n]*(?:\r\n|\r|\n)|[^\r\n]+')
+
+
+class RowOffsets(NamedTuple):
+    rows: int  # distinct non-comment, non-blank rows
+    offsets: array  # the byte offset after every step-th distinct row
+    size: int  # bytes of (uncompressed) text
+
+
+def scan_row_offsets(filename: str, step: int = 1) -> RowOffsets:
+    """
+    Count the distinct rows in a file (the same as count_file_rows) while recording the byte
+    offsets of the line boundaries after every step rows. Offsets in gzipped files are positions
+    in the uncompressed text. Lines are split on universal newlines as in text mode, so an offset
+    is never between the carriage return and newline of a line ending
+    """
+    if step < 1:
+        raise ValueError('step must be a positive integer', step)
+    encoding = locale.getpreferredencoding(False)
+    opener = gzip.open if filename.endswith('.gz') else open
+    seen = set()
+    offsets = array('q')
+    rows = 0
+    position = 0
+    with opener(filename, 'rb') as fh:
+        for data in fh:
+            # split on universal newlines (\r\n or a lone \r as well) as in text mode
+            lines = _UNIVERSAL_LINE.findall(data) if b'\r' in data else (data,)
+            for line in lines:
+                position += len(line)
+                if line.startswith(b'#'):
+                    continue
+                text = line.decode(encoding)
+                if text.endswith('\r\n'):
+                    text = text[:-2] + '\n'
+                elif text.endswith('\r'):
+                    text = text[:-1] + '\n'
+                if not text.strip():
+                    continue
+                digest = hash(text)
+                if digest in seen:
+                    continue
+                seen.add(digest)
+                rows += 1
+                if rows % step == 0:
+                    offsets.append(position)
+    count('read_rows', files=1, bytes_read=position)
+    return RowOffsets(rows, offsets, position)
+
+
+class CountCancelledError(Exception):
+    """
+    Raised when counting in a background thread was stopped before it finished
+    """
+
+
+class RowCountCache:
+    """
+    On-disk cache of row counts so that unchanged input files do not need to be re-counted. Entries
+    are keyed by the absolute path of the file and are only used while the size, modification time
+    and inode of the file are unchanged. The least recently used entries are dropped once the cache
+    holds more than max_entries
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: Dict = OrderedDict()
+        self._modified = False
+        try:
+            with open(path, 'r') as fh:
+                self._entries.update(json.load(fh, object_pairs_hook=OrderedDict))
+        except (OSError, ValueError):
+            # missing or corrupt, start over
+            pass
+
+    @classmethod
+    def for_output_dir(cls, output_dir: str, **kwargs) -> 'RowCountCache':
+        return cls(os.path.join(output_dir, ROW_COUNT_CACHE_FILENAME), **kwargs)
+
+    @staticmethod
+    def _key(filename: str, approximate: bool) -> str:
+        return ('approximate:' if approximate else 'exact:') + os.path.abspath(filename)
+
+    @staticmethod
+    def _signature(filename: str) -> List[int]:
+        stat = os.stat(filename)
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+    def get(self, filename: str, approximate: bool = False) -> Optional[int]:
+        """
+        Get the cached row count for a file or None if it is not cached or the file has changed
+        """
+        key = self._key(filename, approximate)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry['signature'] != self._signature(filename):
+            del self._entries[key]
+            self._modified = True
+            return None
+        # the new recency is only written when the cache is next saved for another change, so
+        # re-runs which only read the cache do not rewrite it
+        self._entries.move_to_end(key)
+        return entry['rows']
+
+    def set(self, filename: str, rows: int, approximate: bool = False) -> None:
+        key = self._key(filename, approximate)
+        self._entries[key] = {'signature': self._signature(filename), 'rows': rows}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._modified = True
+
+    def __len__(self):
+        return len(self._entries)
+
+    def save(self) -> None:
+        """
+        Write the cache to disk (if it has changed). The file is replaced atomically so concurrent
+        writers cannot leave a partially written cache behind
+        """
+        if not self._modified:
+            return
+        write_json_atomic(self.path, self._entries)
+        self._modified = False
+
+
+def count_total_rows(
+    filenames: List[str],
+    approximate: bool = False,
+    processes: Optional[int] = 1,
+    cache: Optional[RowCountCache] = None,
+    limit: Optional[int] = None,
+) -> int:
+    """
+    For some list of files, count the total cumulative lines excluding comments and blank lines
+
+    Duplicate lines within a file are only counted once. Files are streamed, but exact counts
+    keep a 64-bit digest of every distinct line of the file being counted (see DistinctCounter)
+    so memory use is still O(distinct lines), ~8 bytes each. Use approximate=True to count in
+    constant memory.
+
+    Args:
+        filenames: the files to count rows in
+        approximate: estimate the distinct lines with a HyperLogLog counter instead (constant
+            memory per file, ~0.81% relative standard error, but not faster)
+        processes: number of worker processes to count files in parallel (None to use all
+            cores). Rows are de-duplicated per file so the result is the same as counting serially
+        cache: re-use counts for files which have not changed since they were last counted
+        limit: stop counting as soon as the total reaches this many rows. A result of at least
+            limit means counting stopped early, anything less is the exact total
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes < 1:
+        raise ValueError('processes must be a positive integer', processes)
+
+    multiplicity = Counter(filenames)
+    counts = {}
+    if cache is not None:
+        for filename in multiplicity:
+            rows = cache.get(filename, approximate=approximate)
+            if rows is not None:
+                counts[filename] = rows
+    total = sum(counts[f] * multiplicity[f] for f in counts)
+    pending = [f for f in multiplicity if f not in counts]
+    file_limits: Dict[str, Optional[int]] = {}
+
+    def file_limit(filename: str) -> Optional[int]:
+        # rows needed from this file alone to reach the limit given what has been counted so far
+        if limit is None:
+            return None
+        return max(1, math.ceil((limit - total) / multiplicity[filename]))
+
+    if limit is not None and total >= limit:
+        pending = []
+    with phase('count_total_rows'):
+        if processes == 1 or len(pending) < 2:
+            for filename in pending:
+                file_limits[filename] = file_limit(filename)
+                counts[filename] = count_file_rows(
+                    filename, approximate, file_limits[filename], processes=processes
+                )
+                total += counts[filename] * multiplicity[filename]
+                if limit is not None and total >= limit:
+                    break
+        else:
+            with ProcessPoolExecutor(max_workers=min(processes, len(pending))) as pool:
+                futures = {}
+                for filename in pending:
+                    file_limits[filename] = file_limit(filename)
+                    futures[
+                        pool.submit(count_file_rows, filename, approximate, file_limits[filename])
+                    ] = filename
+                for future in as_completed(futures):
+                    filename = futures[future]
+                    counts[filename] = future.result()
+                    total += counts[filename] * multiplicity[filename]
+                    if limit is not None and total >= limit:
+                        for other in futures:
+                            other.cancel()
+                        break
+    if enabled():
+        count('count_total_rows', files=sum(f in counts for f in pending))
+
+    if cache is not None:
+        for filename in pending:
+            # partial counts (stopped at the limit) are not cached
+            if filename in counts and (
+                file_limits[filename] is None or counts[filename] < file_limits[filename]
+            ):
+                cache.set(filename, counts[filename], approximate=approximate)
+        cache.save()
+    return total
+
+
+def count_rows_by_file(
+    filenames: List[str],
+    approximate: bool = False,
+    processes: Optional[int] = 1,
+    cache: Optional[RowCountCache] = None,
+    limit: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Count the rows (as count_total_rows does) in each of a list of files. Each distinct file is
+    only read once no matter how many times it is listed
+
+    Args:
+        filenames: the files to count rows in
+        approximate: estimate the distinct lines with a HyperLogLog counter instead
+        processes: number of worker processes to count files in parallel (None to use all cores)
+        cache: re-use counts for files which have not changed since they were last counted
+        limit: stop counting each file once it reaches this many rows. Counts of at least limit
+            are partial, anything less is the exact count
+
+    Returns:
+        the row count of each distinct file
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes < 1:
+        raise ValueError('processes must be a positive integer', processes)
+
+    unique_files = list(dict.fromkeys(filenames))
+    counts = {}
+    if cache is not None:
+        for filename in unique_files:
+            rows = cache.get(filename, approximate=approximate)
+            if rows is not None:
+                counts[filename] = rows
+    pending = [f for f in unique_files if f not in counts]
+
+    with phase('count_total_rows'):
+        if processes == 1 or len(pending) < 2:
+            for filename in pending:
+                counts[filename] = count_file_rows(
+                    filename, approximate, limit, processes=processes
+                )
+        else:
+            with ProcessPoolExecutor(max_workers=min(processes, len(pending))) as pool:
+                for filename, rows in zip(
+                    pending,
+                    pool.map(
+                        count_file_rows,
+                        pending,
+                        [approximate] * len(pending),
+                        [limit] * len(pending),
+                    ),
+                ):
+                    counts[filename] = rows
+    count('count_total_rows', files=len(pending))
+
+    if cache is not None:
+        for filename in pending:
+            if limit is None or counts[filename] < limit:
+                cache.set(filename, counts[filename], approximate=approximate)
+        cache.save()
+    return {filename: counts[filename] for filename in unique_files}
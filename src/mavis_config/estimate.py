@@ -0,0 +1,185 @@
+import math
+import os
+import struct
+import zlib
+from typing import Iterator, List, NamedTuple, Set, Tuple
+
+from .counting import count_file_rows
+
+SAMPLE_COUNT = 16  # number of regions sampled per file
+SAMPLE_SIZE = 1 << 16  # bytes per sampled region
+Z_SCORE = 1.96  # 95% confidence interval
+
+
+class RowEstimate(NamedTuple):
+    """
+    Estimated number of (non-comment, non-blank) rows and the bounds of its confidence interval.
+    Exact counts have rows == lower == upper
+    """
+
+    rows: float
+    lower: float
+    upper: float
+
+    @property
+    def exact(self) -> bool:
+        return self.lower == self.upper
+
+
+def _count_sample_rows(data: bytes, partial_start: bool, seen: Set[bytes]) -> Tuple[int, int]:
+    """
+    Count the rows in the complete lines of a block of bytes and add them to seen
+
+    Returns:
+        the number of rows and the number of bytes of complete lines they were counted from
+    """
+    start = data.find(b'\n') + 1 if partial_start else 0
+    end = data.rfind(b'\n') + 1
+    if end <= start:
+        return 0, 0
+    rows = [
+        line for line in data[start:end].split(b'\n') if line.strip() and not line.startswith(b'#')
+    ]
+    seen.update(rows)
+    return len(rows), end - start
+
+
+def _plain_samples(
+    filename: str, size: int, samples: int, sample_size: int, seen: Set[bytes]
+) -> Iterator[Tuple]:
+    with open(filename, 'rb') as fh:
+        for i in range(samples):
+            offset = (size - sample_size) * i // (samples - 1) if samples > 1 else 0
+            fh.seek(offset)
+            yield _count_sample_rows(fh.read(sample_size), offset > 0, seen)
+
+
+def _gzip_samples(
+    filename: str, samples: int, sample_size: int, seen: Set[bytes]
+) -> Tuple[List[Tuple], bool]:
+    """
+    Gzip streams cannot be read from an arbitrary offset, so sample consecutive compressed blocks
+    from the start of the file instead
+
+    Returns:
+        the rows, uncompressed bytes and compressed offset of each block and a flag indicating if
+        more than one gzip member was seen
+    """
+    decompressor = zlib.decompressobj(wbits=31)
+    remainder = b''
+    multi_member = False
+    result = []
+    with open(filename, 'rb') as fh:
+        for _ in range(samples):
+            compressed = fh.read(sample_size)
+            if not compressed:
+                break
+            data = b''
+            while compressed:
+                data += decompressor.decompress(compressed)
+                compressed = b''
+                if decompressor.eof and decompressor.unused_data:
+                    # start decompressing the next member
+                    multi_member = True
+                    compressed = decompressor.unused_data
+                    decompressor = zlib.decompressobj(wbits=31)
+            data = remainder + data
+            cut = data.rfind(b'\n') + 1
+            remainder = data[cut:]
+            rows, nbytes = _count_sample_rows(data[:cut], False, seen)
+            result.append((rows, nbytes, fh.tell()))
+    return result, multi_member
+
+
+def gzip_uncompressed_size(filename: str) -> int:
+    """
+    Read the ISIZE field from the trailer of a gzip file. This is the uncompressed size (modulo
+    2**32) of the last member only, so it only describes single-member files under 4 GB
+    """
+    with open(filename, 'rb') as fh:
+        fh.seek(-4, os.SEEK_END)
+        return struct.unpack('<I', fh.read(4))[0]
+
+
+def _interval(total_bytes: float, samples: List[Tuple[int, int]], z: float) -> RowEstimate:
+    """
+    Ratio estimate of the total rows from the rows/bytes of each sample. The interval uses the
+    standard error of the per-sample row density
+    """
+    rows = sum(r for r, _ in samples)
+    nbytes = sum(b for _, b in samples)
+    density = rows / nbytes
+    densities = [r / b for r, b in samples]
+    if len(densities) > 1:
+        mean = sum(densities) / len(densities)
+        variance = sum((d - mean) ** 2 for d in densities) / (len(densities) - 1)
+        error = z * math.sqrt(variance / len(densities)) * total_bytes
+    else:
+        error = density * total_bytes
+    estimate = density * total_bytes
+    return RowEstimate(estimate, max(0.0, estimate - error), estimate + error)
+
+
+def _exact_rows(filename: str) -> RowEstimate:
+    rows = count_file_rows(filename)
+    return RowEstimate(rows, rows, rows)
+
+
+def estimate_file_rows(
+    filename: str, samples: int = SAMPLE_COUNT, sample_size: int = SAMPLE_SIZE, z: float = Z_SCORE
+) -> RowEstimate:
+    """
+    Estimate the number of rows in a file from the bytes-per-row of a few sampled regions.
+    Small files are counted exactly. Like count_file_rows, duplicate lines are only counted once:
+    the sampled rows cannot tell how often a line repeats over the rest of the file, so files with
+    duplicates in their samples are counted exactly as well
+
+    Args:
+        filename: the file to estimate the rows of
+        samples: the number of regions to sample
+        sample_size: the number of bytes to read per region
+        z: z-score for the width of the confidence interval
+    """
+    size = os.path.getsize(filename)
+
+    if size <= samples * sample_size:
+        return _exact_rows(filename)
+
+    seen: Set[bytes] = set()
+    if not filename.endswith('.gz'):
+        counted = [s for s in _plain_samples(filename, size, samples, sample_size, seen) if s[1]]
+        if not counted or sum(s[0] for s in counted) > len(seen):
+            return _exact_rows(filename)
+        return _interval(size, counted, z)
+
+    sampled, multi_member = _gzip_samples(filename, samples, sample_size, seen)
+    sampled = [s for s in sampled if s[1]]
+    if not sampled or sum(s[0] for s in sampled) > len(seen):
+        return _exact_rows(filename)
+    # extrapolate the uncompressed size from the compression ratio of the sampled blocks, then
+    # use ISIZE (which wraps every 4 GB) to correct it if it is consistent with the extrapolation
+    compressed_read = sampled[-1][2]
+    uncompressed_read = sum(s[1] for s in sampled)
+    extrapolated = size * uncompressed_read / compressed_read
+    if not multi_member:
+        isize = gzip_uncompressed_size(filename)
+        candidate = isize + max(0, round((extrapolated - isize) / 2**32)) * 2**32
+        if candidate >= uncompressed_read and abs(candidate - extrapolated) <= 0.5 * extrapolated:
+            return _interval(candidate, [s[:2] for s in sampled], z)
+    # otherwise estimate the rows per compressed byte directly
+    offsets = [0] + [s[2] for s in sampled]
+    return _interval(
+        size, [(s[0], end - start) for s, start, end in zip(sampled, offsets, offsets[1:])], z
+    )
+
+
+def estimate_total_rows(filenames: List[str], **kwargs) -> RowEstimate:
+    """
+    Estimate the total rows over a list of files. The confidence intervals of the individual
+    files are combined assuming their errors are independent
+    """
+    estimates = [estimate_file_rows(filename, **kwargs) for filename in filenames]
+    rows = sum(e.rows for e in estimates)
+    lower_error = math.sqrt(sum((e.rows - e.lower) ** 2 for e in estimates))
+    upper_error = math.sqrt(sum((e.upper - e.rows) ** 2 for e in estimates))
+    return RowEstimate(rows, max(0.0, rows - lower_error), rows + upper_error)
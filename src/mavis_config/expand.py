@@ -0,0 +1,238 @@
+import fnmatch
+import os
+from glob import has_magic
+from typing import Dict, List, Optional, Set
+
+from .instrument import count, phase
+
+LISTING_THRESHOLD = 8  # list a directory instead of checking more than this many names in it
+
+
+def _ishidden(name: str) -> bool:
+    return name[0] == '.'
+
+
+class ExpansionCache:
+    """
+    Caches directory listings so that many glob patterns pointing into the same directories only
+    list each directory once. Matches the behaviour of glob.glob (non-recursive) but answers
+    existence checks from the listing of the parent directory when it has already been read.
+
+    The cache is not aware of changes on disk, call invalidate after files are added or removed
+
+    Example:
+        >>> cache = ExpansionCache()
+        >>> bash_expands('./{test,doc}/*py', cache=cache)
+        [...]
+        >>> cache.invalidate('./test')
+    """
+
+    def __init__(self):
+        self._listings: Dict[str, Optional[Dict[str, bool]]] = {}
+        self._exists: Dict[str, bool] = {}
+        self._isdir: Dict[str, bool] = {}
+        self._searched: Set[str] = set()
+
+    def listdir(self, dirname: str) -> Optional[Dict[str, bool]]:
+        """
+        Get the names in a directory mapped to whether they are directories, or None if the
+        directory cannot be listed
+        """
+        key = os.path.normpath(dirname or os.curdir)
+        self._searched.add(key)
+        if key not in self._listings:
+            count('bash_expands', stats=1)
+            try:
+                listing = {}
+                with os.scandir(key) as entries:
+                    for entry in entries:
+                        try:
+                            listing[entry.name] = entry.is_dir()
+                        except OSError:
+                            listing[entry.name] = False
+                self._listings[key] = listing
+            except OSError:
+                self._listings[key] = None
+        return self._listings[key]
+
+    def _parent_listing(self, path: str) -> Optional[Dict[str, bool]]:
+        # only use listings that have already been read, a single stat is cheaper than listing
+        parent, name = os.path.split(path)
+        if name in {'', '.', '..'}:
+            return None
+        return self._listings.get(os.path.normpath(parent or os.curdir))
+
+    def lexists(self, path: str) -> bool:
+        key = os.path.normpath(path)
+        if key not in self._exists:
+            listing = self._parent_listing(path)
+            if listing is None:
+                count('bash_expands', stats=1)
+                self._exists[key] = os.path.lexists(path)
+            else:
+                self._exists[key] = os.path.basename(path) in listing
+            if not self._exists[key]:
+                self._searched.add(os.path.normpath(os.path.dirname(path) or os.curdir))
+        return self._exists[key]
+
+    def isdir(self, path: str) -> bool:
+        if not path:
+            return False
+        key = os.path.normpath(path)
+        if key not in self._isdir:
+            listing = self._parent_listing(path)
+            if listing is None:
+                count('bash_expands', stats=1)
+                self._isdir[key] = os.path.isdir(path)
+            else:
+                self._isdir[key] = listing.get(os.path.basename(path), False)
+            if not self._isdir[key]:
+                self._searched.add(os.path.normpath(os.path.dirname(path) or os.curdir))
+        return self._isdir[key]
+
+    def searched_directories(self) -> List[str]:
+        """
+        The directories whose contents decided what the patterns matched: those listed to match
+        a pattern and those a name was looked for in and not found. Adding files to any other
+        directory cannot change the matches of the patterns expanded with this cache
+        """
+        return sorted(self._searched)
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """
+        Forget cached results for a directory (and the entries of its parent listing for it), or
+        everything if no path is given
+        """
+        if path is None:
+            self._listings.clear()
+            self._exists.clear()
+            self._isdir.clear()
+            return
+        key = os.path.normpath(path)
+        parent = os.path.dirname(key) or os.curdir
+        for target in [key, parent]:
+            self._listings.pop(target, None)
+        for cache in [self._exists, self._isdir]:
+            for cached in [k for k in cache if k == key or os.path.dirname(k) in {key, parent}]:
+                del cache[cached]
+
+    def _match_names(self, listing: Dict[str, bool], pattern: str) -> List[str]:
+        names = listing.keys()
+        if not _ishidden(pattern):
+            names = [name for name in names if not _ishidden(name)]
+        return fnmatch.filter(names, pattern)
+
+    def _walk(self, node: '_PatternNode', path: str, results: List[List[str]]) -> None:
+        if sum(not has_magic(c) for c in node.children) > LISTING_THRESHOLD:
+            # cheaper to list the directory once than to stat every literal child
+            self.listdir(path)
+
+        for component, child in node.children.items():
+            descend = bool(child.children or child.dir_terminals)
+            if has_magic(component):
+                listing = self.listdir(path)
+                if listing is None:
+                    continue
+                candidates = [
+                    (name, listing[name], True) for name in self._match_names(listing, component)
+                ]
+            else:
+                candidates = [(component, None, False)]
+
+            for name, isdir, exists in candidates:
+                fullpath = os.path.join(path, name) if path else name
+                if child.terminals and (exists or self.lexists(fullpath)):
+                    for index in child.terminals:
+                        results[index].append(fullpath)
+                if not descend:
+                    continue
+                if isdir is None:
+                    isdir = self.isdir(fullpath)
+                if isdir:
+                    for index in child.dir_terminals:
+                        results[index].append(os.path.join(fullpath, ''))
+                    self._walk(child, fullpath, results)
+
+    def glob_many(self, pathnames: List[str]) -> List[List[str]]:
+        """
+        Equivalent of [glob.glob(p) for p in pathnames]. The patterns are combined into a single tree
+        of path components so that shared parent directories are walked once and literal path
+        components which do not exist are pruned using the listing of their parent
+        """
+        results: List[List[str]] = [[] for _ in pathnames]
+        roots: Dict[str, _PatternNode] = {}
+
+        for index, pathname in enumerate(pathnames):
+            if not pathname:
+                continue
+            root = os.sep if os.path.isabs(pathname) else ''
+            node = roots.setdefault(root, _PatternNode())
+            parts = pathname.split(os.sep)
+            components = [part for part in parts if part]
+            if not components:
+                # the root directory itself
+                results[index].append(root)
+                continue
+            for component in components:
+                node = node.children.setdefault(component, _PatternNode())
+            if parts[-1]:
+                node.terminals.append(index)
+            else:
+                # patterns ending with a slash should match only directories
+                node.dir_terminals.append(index)
+
+        for root, node in roots.items():
+            self._walk(node, root, results)
+        return results
+
+    def glob(self, pathname: str) -> List[str]:
+        """
+        Equivalent of glob.glob(pathname) using the cached listings
+        """
+        return self.glob_many([pathname])[0]
+
+
+class _PatternNode:
+    """
+    A path component in a tree of glob patterns
+    """
+
+    __slots__ = ['children', 'terminals', 'dir_terminals']
+
+    def __init__(self):
+        self.children: Dict[str, _PatternNode] = {}
+        self.terminals: List[int] = []  # indices of the patterns ending at this component
+        self.dir_terminals: List[int] = []  # as above but with a trailing slash
+
+
+def bash_expands(*expressions, cache: Optional[ExpansionCache] = None) -> List[str]:
+    """
+    expand a file glob expression, allowing bash-style brackets.
+
+    Args:
+        expressions: the glob expressions to expand
+        cache: directory listing cache to share between calls
+
+    Returns:
+        a list of files
+
+    Example:
+        >>> bash_expands('./{test,doc}/*py')
+        [...]
+    """
+    from braceexpand import braceexpand
+
+    if cache is None:
+        cache = ExpansionCache()
+    result = []
+    with phase('bash_expands'):
+        for expression in expressions:
+            # match all the brace expansions of an expression in a single walk of the file system
+            eresult = []
+            for fnames in cache.glob_many(list(braceexpand(expression))):
+                eresult.extend(fnames)
+            if not eresult:
+                raise FileNotFoundError('The expression does not match any files', expression)
+            result.extend(eresult)
+        count('bash_expands', files=len(result))
+    return [os.path.abspath(f) for f in result]
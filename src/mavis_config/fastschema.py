@@ -0,0 +1,1165 @@
+# generated from the package JSON schemas by python -m mavis_config.codegen, do not edit
+# fmt: off
+import re
+from numbers import Number
+
+SCHEMA_DIGESTS = {'config': '116b005b80271726636274d7d55bf90bd9a47ce0be4f34958d1a29430f15d857', 'overlay': '86d93718358d8e06fd4fb68315f3f498511e7b48cc00cc379a3d889ae97f23eb'}
+
+_MISSING = object()
+_KEYS_0 = frozenset(['annotate.annotation_filters', 'annotate.draw_fusions_only', 'annotate.draw_non_synonymous_cdna_only', 'annotate.max_orf_cap', 'annotate.min_domain_mapping_match', 'annotate.min_orf_size', 'annotate.skip_illustrate', 'bam_stats.distribution_fraction', 'bam_stats.sample_bin_size', 'bam_stats.sample_cap', 'bam_stats.sample_size', 'cluster.cluster_initial_size_limit', 'cluster.cluster_radius', 'cluster.limit_to_chr', 'cluster.max_files', 'cluster.max_proximity', 'cluster.min_clusters_per_file', 'cluster.split_only', 'cluster.uninformative_filter', 'convert', 'illustrate.domain_color', 'illustrate.domain_mismatch_color', 'illustrate.domain_name_regex_filter', 'illustrate.domain_scaffold_color', 'illustrate.drawing_width_iter_increase', 'illustrate.exon_min_focus_size', 'illustrate.gene1_color', 'illustrate.gene1_color_selected', 'illustrate.gene2_color', 'illustrate.gene2_color_selected', 'illustrate.label_color', 'illustrate.mask_fill', 'illustrate.mask_opacity', 'illustrate.max_drawing_retries', 'illustrate.novel_exon_color', 'illustrate.scaffold_color', 'illustrate.splice_color', 'illustrate.width', 'illustrate.breakpoint_color', 'libraries', 'log', 'log_level', 'output_dir', 'pairing.contig_call_distance', 'pairing.flanking_call_distance', 'pairing.input_call_distance', 'pairing.spanning_call_distance', 'pairing.split_call_distance', 'reference.aligner_reference', 'reference.annotations', 'reference.dgv_annotation', 'reference.masking', 'reference.reference_genome', 'reference.template_metadata', 'skip_stage.validate', 'summary.filter_cdna_synon', 'summary.filter_min_complexity', 'summary.filter_min_flanking_reads', 'summary.filter_min_linking_split_reads', 'summary.filter_min_remapped_reads', 'summary.filter_min_spanning_reads', 'summary.filter_min_split_reads', 'summary.filter_protein_synon', 'summary.filter_trans_homopolymers', 'validate.aligner', 'validate.assembly_kmer_size', 'validate.assembly_max_paths', 'validate.assembly_min_edge_trim_weight', 'validate.assembly_min_exact_match_to_remap', 'validate.assembly_min_remap_coverage', 'validate.assembly_min_remapped_seq', 'validate.assembly_min_uniq', 'validate.assembly_strand_concordance', 'validate.blat_limit_top_aln', 'validate.blat_min_identity', 'validate.call_error', 'validate.clean_aligner_files', 'validate.contig_aln_max_event_size', 'validate.contig_aln_merge_inner_anchor', 'validate.contig_aln_merge_outer_anchor', 'validate.contig_aln_min_anchor_size', 'validate.contig_aln_min_extend_overlap', 'validate.contig_aln_min_query_consumption', 'validate.contig_aln_min_score', 'validate.fetch_min_bin_size', 'validate.fetch_reads_bins', 'validate.fetch_reads_limit', 'validate.filter_secondary_alignments', 'validate.fuzzy_mismatch_number', 'validate.max_sc_preceeding_anchor', 'validate.min_anchor_exact', 'validate.min_anchor_fuzzy', 'validate.min_anchor_match', 'validate.min_call_complexity', 'validate.min_double_aligned_to_estimate_insertion_size', 'validate.min_flanking_pairs_resolution', 'validate.min_linking_split_reads', 'validate.min_mapping_quality', 'validate.min_non_target_aligned_split_reads', 'validate.min_sample_size_to_apply_percentage', 'validate.min_softclipping', 'validate.min_spanning_reads_resolution', 'validate.min_splits_reads_resolution', 'validate.outer_window_min_event_size', 'validate.stdev_count_abnormal', 'validate.trans_fetch_reads_limit', 'validate.trans_min_mapping_quality', 'validate.write_evidence_files'])
+_ENUM_1 = frozenset(['choose_more_annotated', 'choose_transcripts_by_priority'])
+_ENUM_2 = frozenset(['manta', 'delly', 'transabyss', 'pindel', 'chimerascan', 'mavis', 'defuse', 'breakdancer', 'vcf', 'breakseq', 'cnvnator', 'strelka', 'starfusion'])
+_PATTERN_3 = re.compile('^#[a-zA-Z0-9]{6}')
+_KEYS_4 = frozenset(['assign', 'total_batches', 'shards', 'bam_file', 'disease_status', 'median_fragment_size', 'protocol', 'read_length', 'stdev_fragment_size', 'strand_determining_read', 'strand_specific'])
+_KEYS_5 = frozenset(['batch', 'filename', 'start', 'end', 'rows'])
+_ENUM_6 = frozenset(['diseased', 'normal'])
+_ENUM_7 = frozenset(['genome', 'transcriptome'])
+_ENUM_8 = frozenset(['INFO', 'DEBUG'])
+_ENUM_9 = frozenset(['bwa mem', 'blat'])
+_KEYS_14 = frozenset(['illustrate.breakpoint_color', 'illustrate.domain_color', 'illustrate.domain_mismatch_color', 'illustrate.domain_name_regex_filter', 'illustrate.domain_scaffold_color', 'illustrate.drawing_width_iter_increase', 'illustrate.exon_min_focus_size', 'illustrate.gene1_color', 'illustrate.gene1_color_selected', 'illustrate.gene2_color', 'illustrate.gene2_color_selected', 'illustrate.label_color', 'illustrate.mask_fill', 'illustrate.mask_opacity', 'illustrate.max_drawing_retries', 'illustrate.novel_exon_color', 'illustrate.scaffold_color', 'illustrate.splice_color', 'illustrate.width', 'log', 'log_level', 'reference.annotations', 'validate.min_mapping_quality'])
+
+
+def _check_10(v0):
+    if isinstance(v0, dict):
+        v1 = v0.get('skip_stage.validate', False)
+        if v1 is not True:
+            return False
+    if isinstance(v0, dict) and not ('reference.aligner_reference' in v0):
+        return False
+    return True
+
+
+def _check_11(v0):
+    if _check_10(v0):
+        return False
+    return True
+
+
+def _check_12(v0):
+    if isinstance(v0, dict) and not _KEYS_0.issuperset(v0):
+        return False
+    if not isinstance(v0, dict):
+        return False
+    v1 = v0.get('annotate.annotation_filters', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, list):
+            for v2 in v1:
+                if not (isinstance(v2, str) and v2 in _ENUM_1):
+                    return False
+                if not (isinstance(v2, str)):
+                    return False
+        if not (isinstance(v1, list)):
+            return False
+    v1 = v0.get('annotate.draw_fusions_only', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, bool)):
+            return False
+    v1 = v0.get('annotate.draw_non_synonymous_cdna_only', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, bool)):
+            return False
+    v1 = v0.get('annotate.max_orf_cap', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('annotate.min_domain_mapping_match', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('annotate.min_orf_size', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('annotate.skip_illustrate', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, bool)):
+            return False
+    v1 = v0.get('bam_stats.distribution_fraction', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0.01):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('bam_stats.sample_bin_size', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('bam_stats.sample_cap', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('bam_stats.sample_size', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('cluster.cluster_initial_size_limit', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('cluster.cluster_radius', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('cluster.limit_to_chr', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, list):
+            for v2 in v1:
+                if not (isinstance(v2, str)):
+                    return False
+        if not (isinstance(v1, list) or v1 is None):
+            return False
+    v1 = v0.get('cluster.max_files', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 1):
+            return False
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('cluster.max_proximity', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('cluster.min_clusters_per_file', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 1):
+            return False
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('cluster.split_only', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, bool)):
+            return False
+    v1 = v0.get('cluster.uninformative_filter', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, bool)):
+            return False
+    v1 = v0.get('convert', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, dict):
+            for v2 in v1.values():
+                if not isinstance(v2, dict):
+                    return False
+                v3 = v2.get('assume_no_untemplated', _MISSING)
+                if v3 is not _MISSING:
+                    if not (isinstance(v3, bool)):
+                        return False
+                v3 = v2.get('file_type', _MISSING)
+                if v3 is not _MISSING:
+                    if not (isinstance(v3, str) and v3 in _ENUM_2):
+                        return False
+                    if not (isinstance(v3, str)):
+                        return False
+                v3 = v2.get('inputs', _MISSING)
+                if v3 is not _MISSING:
+                    if isinstance(v3, list):
+                        for v4 in v3:
+                            if not (isinstance(v4, str)):
+                                return False
+                    if isinstance(v3, list) and len(v3) < 1:
+                        return False
+                    if not (isinstance(v3, list)):
+                        return False
+                v3 = v2.get('strand_specific', _MISSING)
+                if v3 is not _MISSING:
+                    if not (isinstance(v3, bool)):
+                        return False
+                if isinstance(v2, dict) and not ('inputs' in v2 and 'file_type' in v2):
+                    return False
+                if not (isinstance(v2, dict)):
+                    return False
+        if not (isinstance(v1, dict)):
+            return False
+    v1 = v0.get('illustrate.domain_color', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+    v1 = v0.get('illustrate.domain_mismatch_color', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+    v1 = v0.get('illustrate.domain_name_regex_filter', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.domain_scaffold_color', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+    v1 = v0.get('illustrate.drawing_width_iter_increase', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('illustrate.exon_min_focus_size', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('illustrate.gene1_color', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.gene1_color_selected', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.gene2_color', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.gene2_color_selected', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.label_color', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.mask_fill', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.mask_opacity', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('illustrate.max_drawing_retries', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('illustrate.novel_exon_color', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.scaffold_color', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.splice_color', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.width', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('illustrate.breakpoint_color', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+    v1 = v0.get('libraries', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, dict):
+            for v2 in v1.values():
+                if isinstance(v2, dict) and not _KEYS_4.issuperset(v2):
+                    return False
+                if not isinstance(v2, dict):
+                    return False
+                v3 = v2.get('assign', _MISSING)
+                if v3 is not _MISSING:
+                    if isinstance(v3, list):
+                        for v4 in v3:
+                            if not (isinstance(v4, str)):
+                                return False
+                    if isinstance(v3, list) and len(v3) < 1:
+                        return False
+                    if not (isinstance(v3, list)):
+                        return False
+                v3 = v2.get('total_batches', _MISSING)
+                if v3 is not _MISSING:
+                    if not ((type(v3) is int or type(v3) is float and v3.is_integer())):
+                        return False
+                v3 = v2.get('shards', _MISSING)
+                if v3 is not _MISSING:
+                    if not (isinstance(v3, list)):
+                        return False
+                    if isinstance(v3, list):
+                        for v4 in v3:
+                            if not (isinstance(v4, dict)):
+                                return False
+                            if isinstance(v4, dict) and not _KEYS_5.issuperset(v4):
+                                return False
+                            if isinstance(v4, dict) and not ('batch' in v4 and 'filename' in v4 and 'start' in v4 and 'end' in v4 and 'rows' in v4):
+                                return False
+                            if isinstance(v4, dict):
+                                v5 = v4.get('batch', _MISSING)
+                                if v5 is not _MISSING:
+                                    if not ((type(v5) is int or type(v5) is float and v5.is_integer())):
+                                        return False
+                                    if isinstance(v5, Number) and not isinstance(v5, bool) and not (type(v5) in (int, float) and v5 >= 0):
+                                        return False
+                                v5 = v4.get('filename', _MISSING)
+                                if v5 is not _MISSING:
+                                    if not (isinstance(v5, str)):
+                                        return False
+                                v5 = v4.get('start', _MISSING)
+                                if v5 is not _MISSING:
+                                    if not ((type(v5) is int or type(v5) is float and v5.is_integer())):
+                                        return False
+                                    if isinstance(v5, Number) and not isinstance(v5, bool) and not (type(v5) in (int, float) and v5 >= 0):
+                                        return False
+                                v5 = v4.get('end', _MISSING)
+                                if v5 is not _MISSING:
+                                    if not ((type(v5) is int or type(v5) is float and v5.is_integer())):
+                                        return False
+                                    if isinstance(v5, Number) and not isinstance(v5, bool) and not (type(v5) in (int, float) and v5 >= 0):
+                                        return False
+                                v5 = v4.get('rows', _MISSING)
+                                if v5 is not _MISSING:
+                                    if not ((type(v5) is int or type(v5) is float and v5.is_integer())):
+                                        return False
+                                    if isinstance(v5, Number) and not isinstance(v5, bool) and not (type(v5) in (int, float) and v5 >= 0):
+                                        return False
+                v3 = v2.get('bam_file', _MISSING)
+                if v3 is not _MISSING:
+                    if not (isinstance(v3, str)):
+                        return False
+                v3 = v2.get('disease_status', _MISSING)
+                if v3 is not _MISSING:
+                    if not (isinstance(v3, str) and v3 in _ENUM_6):
+                        return False
+                    if not (isinstance(v3, str)):
+                        return False
+                v3 = v2.get('median_fragment_size', _MISSING)
+                if v3 is not _MISSING:
+                    if not ((type(v3) is int or type(v3) is float and v3.is_integer())):
+                        return False
+                v3 = v2.get('protocol', _MISSING)
+                if v3 is not _MISSING:
+                    if not (isinstance(v3, str) and v3 in _ENUM_7):
+                        return False
+                    if not (isinstance(v3, str)):
+                        return False
+                v3 = v2.get('read_length', _MISSING)
+                if v3 is not _MISSING:
+                    if not ((type(v3) is int or type(v3) is float and v3.is_integer())):
+                        return False
+                v3 = v2.get('stdev_fragment_size', _MISSING)
+                if v3 is not _MISSING:
+                    if not ((type(v3) is int or type(v3) is float and v3.is_integer())):
+                        return False
+                v3 = v2.get('strand_determining_read', _MISSING)
+                if v3 is not _MISSING:
+                    if not ((type(v3) is int or type(v3) is float and v3.is_integer())):
+                        return False
+                v3 = v2.get('strand_specific', _MISSING)
+                if v3 is not _MISSING:
+                    if not (isinstance(v3, bool)):
+                        return False
+                if isinstance(v2, dict) and not ('disease_status' in v2 and 'protocol' in v2 and 'assign' in v2):
+                    return False
+                if not (isinstance(v2, dict)):
+                    return False
+        if isinstance(v1, dict) and len(v1) < 1:
+            return False
+        if not (isinstance(v1, dict)):
+            return False
+    v1 = v0.get('log', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('log_level', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str) and v1 in _ENUM_8):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('output_dir', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('pairing.contig_call_distance', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('pairing.flanking_call_distance', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('pairing.input_call_distance', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('pairing.spanning_call_distance', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('pairing.split_call_distance', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('reference.aligner_reference', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, list):
+            for v2 in v1:
+                if not (isinstance(v2, str)):
+                    return False
+        if isinstance(v1, list) and len(v1) > 1:
+            return False
+        if isinstance(v1, list) and len(v1) < 1:
+            return False
+        if not (isinstance(v1, list)):
+            return False
+    v1 = v0.get('reference.annotations', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, list):
+            for v2 in v1:
+                if not (isinstance(v2, str)):
+                    return False
+        if isinstance(v1, list) and len(v1) < 1:
+            return False
+        if not (isinstance(v1, list)):
+            return False
+    v1 = v0.get('reference.dgv_annotation', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, list):
+            for v2 in v1:
+                if not (isinstance(v2, str)):
+                    return False
+        if isinstance(v1, list) and len(v1) < 1:
+            return False
+        if not (isinstance(v1, list)):
+            return False
+    v1 = v0.get('reference.masking', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, list):
+            for v2 in v1:
+                if not (isinstance(v2, str)):
+                    return False
+        if isinstance(v1, list) and len(v1) < 1:
+            return False
+        if not (isinstance(v1, list)):
+            return False
+    v1 = v0.get('reference.reference_genome', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, list):
+            for v2 in v1:
+                if not (isinstance(v2, str)):
+                    return False
+        if isinstance(v1, list) and len(v1) < 1:
+            return False
+        if not (isinstance(v1, list)):
+            return False
+    v1 = v0.get('reference.template_metadata', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, list):
+            for v2 in v1:
+                if not (isinstance(v2, str)):
+                    return False
+        if isinstance(v1, list) and len(v1) < 1:
+            return False
+        if not (isinstance(v1, list)):
+            return False
+    v1 = v0.get('skip_stage.validate', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, bool)):
+            return False
+    v1 = v0.get('summary.filter_cdna_synon', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, bool)):
+            return False
+    v1 = v0.get('summary.filter_min_complexity', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('summary.filter_min_flanking_reads', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('summary.filter_min_linking_split_reads', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('summary.filter_min_remapped_reads', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('summary.filter_min_spanning_reads', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('summary.filter_min_split_reads', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('summary.filter_protein_synon', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, bool)):
+            return False
+    v1 = v0.get('summary.filter_trans_homopolymers', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, bool)):
+            return False
+    v1 = v0.get('validate.aligner', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str) and v1 in _ENUM_9):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('validate.assembly_kmer_size', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('validate.assembly_max_paths', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.assembly_min_edge_trim_weight', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.assembly_min_exact_match_to_remap', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.assembly_min_remap_coverage', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('validate.assembly_min_remapped_seq', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.assembly_min_uniq', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('validate.assembly_strand_concordance', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('validate.blat_limit_top_aln', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.blat_min_identity', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('validate.call_error', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.clean_aligner_files', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, bool)):
+            return False
+    v1 = v0.get('validate.contig_aln_max_event_size', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.contig_aln_merge_inner_anchor', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.contig_aln_merge_outer_anchor', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.contig_aln_min_anchor_size', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.contig_aln_min_extend_overlap', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.contig_aln_min_query_consumption', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('validate.contig_aln_min_score', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('validate.fetch_min_bin_size', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.fetch_reads_bins', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.fetch_reads_limit', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.filter_secondary_alignments', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, bool)):
+            return False
+    v1 = v0.get('validate.fuzzy_mismatch_number', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.max_sc_preceeding_anchor', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.min_anchor_exact', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.min_anchor_fuzzy', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.min_anchor_match', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('validate.min_call_complexity', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('validate.min_double_aligned_to_estimate_insertion_size', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.min_flanking_pairs_resolution', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.min_linking_split_reads', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.min_mapping_quality', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.min_non_target_aligned_split_reads', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.min_sample_size_to_apply_percentage', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.min_softclipping', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.min_spanning_reads_resolution', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.min_splits_reads_resolution', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.outer_window_min_event_size', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('validate.stdev_count_abnormal', _MISSING)
+    if v1 is not _MISSING:
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('validate.trans_fetch_reads_limit', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer()) or v1 is None):
+            return False
+    v1 = v0.get('validate.trans_min_mapping_quality', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer()) or v1 is None):
+            return False
+    v1 = v0.get('validate.write_evidence_files', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, bool)):
+            return False
+    if not (_check_11(v0)):
+        return False
+    if not (isinstance(v0, dict)):
+        return False
+    return True
+
+
+def _defaults_13(v0):
+    if 'annotate.annotation_filters' not in v0:
+        v0['annotate.annotation_filters'] = ['choose_more_annotated', 'choose_transcripts_by_priority']
+    if 'annotate.draw_fusions_only' not in v0:
+        v0['annotate.draw_fusions_only'] = True
+    if 'annotate.draw_non_synonymous_cdna_only' not in v0:
+        v0['annotate.draw_non_synonymous_cdna_only'] = True
+    if 'annotate.max_orf_cap' not in v0:
+        v0['annotate.max_orf_cap'] = 3
+    if 'annotate.min_domain_mapping_match' not in v0:
+        v0['annotate.min_domain_mapping_match'] = 0.9
+    if 'annotate.min_orf_size' not in v0:
+        v0['annotate.min_orf_size'] = 300
+    if 'annotate.skip_illustrate' not in v0:
+        v0['annotate.skip_illustrate'] = False
+    if 'bam_stats.distribution_fraction' not in v0:
+        v0['bam_stats.distribution_fraction'] = 0.97
+    if 'bam_stats.sample_bin_size' not in v0:
+        v0['bam_stats.sample_bin_size'] = 1000
+    if 'bam_stats.sample_cap' not in v0:
+        v0['bam_stats.sample_cap'] = 1000
+    if 'bam_stats.sample_size' not in v0:
+        v0['bam_stats.sample_size'] = 500
+    if 'cluster.cluster_initial_size_limit' not in v0:
+        v0['cluster.cluster_initial_size_limit'] = 25
+    if 'cluster.cluster_radius' not in v0:
+        v0['cluster.cluster_radius'] = 100
+    if 'cluster.limit_to_chr' not in v0:
+        v0['cluster.limit_to_chr'] = ['1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12', '13', '14', '15', '16', '17', '18', '19', '20', '21', '22', 'X', 'Y']
+    if 'cluster.max_files' not in v0:
+        v0['cluster.max_files'] = 200
+    if 'cluster.max_proximity' not in v0:
+        v0['cluster.max_proximity'] = 5000
+    if 'cluster.min_clusters_per_file' not in v0:
+        v0['cluster.min_clusters_per_file'] = 50
+    if 'cluster.split_only' not in v0:
+        v0['cluster.split_only'] = False
+    if 'cluster.uninformative_filter' not in v0:
+        v0['cluster.uninformative_filter'] = False
+    if 'illustrate.domain_color' not in v0:
+        v0['illustrate.domain_color'] = '#ccccb3'
+    if 'illustrate.domain_mismatch_color' not in v0:
+        v0['illustrate.domain_mismatch_color'] = '#b2182b'
+    if 'illustrate.domain_name_regex_filter' not in v0:
+        v0['illustrate.domain_name_regex_filter'] = '^PF\\d+$'
+    if 'illustrate.domain_scaffold_color' not in v0:
+        v0['illustrate.domain_scaffold_color'] = '#000000'
+    if 'illustrate.drawing_width_iter_increase' not in v0:
+        v0['illustrate.drawing_width_iter_increase'] = 500
+    if 'illustrate.exon_min_focus_size' not in v0:
+        v0['illustrate.exon_min_focus_size'] = 10
+    if 'illustrate.gene1_color' not in v0:
+        v0['illustrate.gene1_color'] = '#657e91'
+    if 'illustrate.gene1_color_selected' not in v0:
+        v0['illustrate.gene1_color_selected'] = '#518dc5'
+    if 'illustrate.gene2_color' not in v0:
+        v0['illustrate.gene2_color'] = '#325556'
+    if 'illustrate.gene2_color_selected' not in v0:
+        v0['illustrate.gene2_color_selected'] = '#4c9677'
+    if 'illustrate.label_color' not in v0:
+        v0['illustrate.label_color'] = '#000000'
+    if 'illustrate.mask_fill' not in v0:
+        v0['illustrate.mask_fill'] = '#ffffff'
+    if 'illustrate.mask_opacity' not in v0:
+        v0['illustrate.mask_opacity'] = 0.7
+    if 'illustrate.max_drawing_retries' not in v0:
+        v0['illustrate.max_drawing_retries'] = 5
+    if 'illustrate.novel_exon_color' not in v0:
+        v0['illustrate.novel_exon_color'] = '#5D3F6A'
+    if 'illustrate.scaffold_color' not in v0:
+        v0['illustrate.scaffold_color'] = '#000000'
+    if 'illustrate.splice_color' not in v0:
+        v0['illustrate.splice_color'] = '#000000'
+    if 'illustrate.width' not in v0:
+        v0['illustrate.width'] = 1000
+    if 'illustrate.breakpoint_color' not in v0:
+        v0['illustrate.breakpoint_color'] = '#000000'
+    if 'log_level' not in v0:
+        v0['log_level'] = 'INFO'
+    if 'pairing.contig_call_distance' not in v0:
+        v0['pairing.contig_call_distance'] = 10
+    if 'pairing.flanking_call_distance' not in v0:
+        v0['pairing.flanking_call_distance'] = 50
+    if 'pairing.input_call_distance' not in v0:
+        v0['pairing.input_call_distance'] = 20
+    if 'pairing.spanning_call_distance' not in v0:
+        v0['pairing.spanning_call_distance'] = 20
+    if 'pairing.split_call_distance' not in v0:
+        v0['pairing.split_call_distance'] = 20
+    if 'skip_stage.validate' not in v0:
+        v0['skip_stage.validate'] = False
+    if 'summary.filter_cdna_synon' not in v0:
+        v0['summary.filter_cdna_synon'] = True
+    if 'summary.filter_min_complexity' not in v0:
+        v0['summary.filter_min_complexity'] = 0.2
+    if 'summary.filter_min_flanking_reads' not in v0:
+        v0['summary.filter_min_flanking_reads'] = 10
+    if 'summary.filter_min_linking_split_reads' not in v0:
+        v0['summary.filter_min_linking_split_reads'] = 1
+    if 'summary.filter_min_remapped_reads' not in v0:
+        v0['summary.filter_min_remapped_reads'] = 5
+    if 'summary.filter_min_spanning_reads' not in v0:
+        v0['summary.filter_min_spanning_reads'] = 5
+    if 'summary.filter_min_split_reads' not in v0:
+        v0['summary.filter_min_split_reads'] = 5
+    if 'summary.filter_protein_synon' not in v0:
+        v0['summary.filter_protein_synon'] = False
+    if 'summary.filter_trans_homopolymers' not in v0:
+        v0['summary.filter_trans_homopolymers'] = True
+    if 'validate.aligner' not in v0:
+        v0['validate.aligner'] = 'blat'
+    if 'validate.assembly_kmer_size' not in v0:
+        v0['validate.assembly_kmer_size'] = 0.74
+    if 'validate.assembly_max_paths' not in v0:
+        v0['validate.assembly_max_paths'] = 8
+    if 'validate.assembly_min_edge_trim_weight' not in v0:
+        v0['validate.assembly_min_edge_trim_weight'] = 3
+    if 'validate.assembly_min_exact_match_to_remap' not in v0:
+        v0['validate.assembly_min_exact_match_to_remap'] = 15
+    if 'validate.assembly_min_remap_coverage' not in v0:
+        v0['validate.assembly_min_remap_coverage'] = 0.9
+    if 'validate.assembly_min_remapped_seq' not in v0:
+        v0['validate.assembly_min_remapped_seq'] = 3
+    if 'validate.assembly_min_uniq' not in v0:
+        v0['validate.assembly_min_uniq'] = 0.1
+    if 'validate.assembly_strand_concordance' not in v0:
+        v0['validate.assembly_strand_concordance'] = 0.51
+    if 'validate.blat_limit_top_aln' not in v0:
+        v0['validate.blat_limit_top_aln'] = 10
+    if 'validate.blat_min_identity' not in v0:
+        v0['validate.blat_min_identity'] = 0.9
+    if 'validate.call_error' not in v0:
+        v0['validate.call_error'] = 10
+    if 'validate.clean_aligner_files' not in v0:
+        v0['validate.clean_aligner_files'] = False
+    if 'validate.contig_aln_max_event_size' not in v0:
+        v0['validate.contig_aln_max_event_size'] = 50
+    if 'validate.contig_aln_merge_inner_anchor' not in v0:
+        v0['validate.contig_aln_merge_inner_anchor'] = 20
+    if 'validate.contig_aln_merge_outer_anchor' not in v0:
+        v0['validate.contig_aln_merge_outer_anchor'] = 15
+    if 'validate.contig_aln_min_anchor_size' not in v0:
+        v0['validate.contig_aln_min_anchor_size'] = 50
+    if 'validate.contig_aln_min_extend_overlap' not in v0:
+        v0['validate.contig_aln_min_extend_overlap'] = 10
+    if 'validate.contig_aln_min_query_consumption' not in v0:
+        v0['validate.contig_aln_min_query_consumption'] = 0.9
+    if 'validate.contig_aln_min_score' not in v0:
+        v0['validate.contig_aln_min_score'] = 0.9
+    if 'validate.fetch_min_bin_size' not in v0:
+        v0['validate.fetch_min_bin_size'] = 50
+    if 'validate.fetch_reads_bins' not in v0:
+        v0['validate.fetch_reads_bins'] = 5
+    if 'validate.fetch_reads_limit' not in v0:
+        v0['validate.fetch_reads_limit'] = 3000
+    if 'validate.filter_secondary_alignments' not in v0:
+        v0['validate.filter_secondary_alignments'] = True
+    if 'validate.fuzzy_mismatch_number' not in v0:
+        v0['validate.fuzzy_mismatch_number'] = 1
+    if 'validate.max_sc_preceeding_anchor' not in v0:
+        v0['validate.max_sc_preceeding_anchor'] = 6
+    if 'validate.min_anchor_exact' not in v0:
+        v0['validate.min_anchor_exact'] = 6
+    if 'validate.min_anchor_fuzzy' not in v0:
+        v0['validate.min_anchor_fuzzy'] = 10
+    if 'validate.min_anchor_match' not in v0:
+        v0['validate.min_anchor_match'] = 0.9
+    if 'validate.min_call_complexity' not in v0:
+        v0['validate.min_call_complexity'] = 0.1
+    if 'validate.min_double_aligned_to_estimate_insertion_size' not in v0:
+        v0['validate.min_double_aligned_to_estimate_insertion_size'] = 2
+    if 'validate.min_flanking_pairs_resolution' not in v0:
+        v0['validate.min_flanking_pairs_resolution'] = 10
+    if 'validate.min_linking_split_reads' not in v0:
+        v0['validate.min_linking_split_reads'] = 2
+    if 'validate.min_mapping_quality' not in v0:
+        v0['validate.min_mapping_quality'] = 5
+    if 'validate.min_non_target_aligned_split_reads' not in v0:
+        v0['validate.min_non_target_aligned_split_reads'] = 1
+    if 'validate.min_sample_size_to_apply_percentage' not in v0:
+        v0['validate.min_sample_size_to_apply_percentage'] = 10
+    if 'validate.min_softclipping' not in v0:
+        v0['validate.min_softclipping'] = 6
+    if 'validate.min_spanning_reads_resolution' not in v0:
+        v0['validate.min_spanning_reads_resolution'] = 5
+    if 'validate.min_splits_reads_resolution' not in v0:
+        v0['validate.min_splits_reads_resolution'] = 3
+    if 'validate.outer_window_min_event_size' not in v0:
+        v0['validate.outer_window_min_event_size'] = 125
+    if 'validate.stdev_count_abnormal' not in v0:
+        v0['validate.stdev_count_abnormal'] = 3
+    if 'validate.trans_fetch_reads_limit' not in v0:
+        v0['validate.trans_fetch_reads_limit'] = 12000
+    if 'validate.trans_min_mapping_quality' not in v0:
+        v0['validate.trans_min_mapping_quality'] = 0
+    if 'validate.write_evidence_files' not in v0:
+        v0['validate.write_evidence_files'] = True
+    v1 = v0.get('convert', _MISSING)
+    if v1 is not _MISSING:
+        for v2 in v1.values():
+            if 'assume_no_untemplated' not in v2:
+                v2['assume_no_untemplated'] = False
+            if 'strand_specific' not in v2:
+                v2['strand_specific'] = False
+    v1 = v0.get('libraries', _MISSING)
+    if v1 is not _MISSING:
+        for v2 in v1.values():
+            if 'strand_determining_read' not in v2:
+                v2['strand_determining_read'] = 2
+            if 'strand_specific' not in v2:
+                v2['strand_specific'] = False
+
+
+def validate_config(config) -> bool:
+    """
+    Check a config against the config schema, setting any default values if it
+    is valid. Invalid configs are not modified
+    """
+    if not _check_12(config):
+        return False
+    _defaults_13(config)
+    return True
+
+
+def _check_15(v0):
+    if isinstance(v0, dict) and not _KEYS_14.issuperset(v0):
+        return False
+    if not isinstance(v0, dict):
+        return False
+    v1 = v0.get('illustrate.breakpoint_color', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.domain_color', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.domain_mismatch_color', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.domain_name_regex_filter', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.domain_scaffold_color', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.drawing_width_iter_increase', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('illustrate.exon_min_focus_size', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('illustrate.gene1_color', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.gene1_color_selected', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.gene2_color', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.gene2_color_selected', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.label_color', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.mask_fill', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.mask_opacity', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 <= 1):
+            return False
+        if isinstance(v1, Number) and not isinstance(v1, bool) and not (type(v1) in (int, float) and v1 >= 0):
+            return False
+        if not (type(v1) in (int, float)):
+            return False
+    v1 = v0.get('illustrate.max_drawing_retries', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('illustrate.novel_exon_color', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.scaffold_color', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.splice_color', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, str) and not _PATTERN_3.search(v1):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('illustrate.width', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    v1 = v0.get('log', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('log_level', _MISSING)
+    if v1 is not _MISSING:
+        if not (isinstance(v1, str) and v1 in _ENUM_8):
+            return False
+        if not (isinstance(v1, str)):
+            return False
+    v1 = v0.get('reference.annotations', _MISSING)
+    if v1 is not _MISSING:
+        if isinstance(v1, list):
+            for v2 in v1:
+                if not (isinstance(v2, str)):
+                    return False
+        if isinstance(v1, list) and len(v1) < 1:
+            return False
+        if not (isinstance(v1, list)):
+            return False
+    v1 = v0.get('validate.min_mapping_quality', _MISSING)
+    if v1 is not _MISSING:
+        if not ((type(v1) is int or type(v1) is float and v1.is_integer())):
+            return False
+    if isinstance(v0, dict) and not ('reference.annotations' in v0):
+        return False
+    if not (isinstance(v0, dict)):
+        return False
+    return True
+
+
+def _defaults_16(v0):
+    if 'illustrate.breakpoint_color' not in v0:
+        v0['illustrate.breakpoint_color'] = '#000000'
+    if 'illustrate.domain_color' not in v0:
+        v0['illustrate.domain_color'] = '#ccccb3'
+    if 'illustrate.domain_mismatch_color' not in v0:
+        v0['illustrate.domain_mismatch_color'] = '#b2182b'
+    if 'illustrate.domain_name_regex_filter' not in v0:
+        v0['illustrate.domain_name_regex_filter'] = '^PF\\d+$'
+    if 'illustrate.domain_scaffold_color' not in v0:
+        v0['illustrate.domain_scaffold_color'] = '#000000'
+    if 'illustrate.drawing_width_iter_increase' not in v0:
+        v0['illustrate.drawing_width_iter_increase'] = 500
+    if 'illustrate.exon_min_focus_size' not in v0:
+        v0['illustrate.exon_min_focus_size'] = 10
+    if 'illustrate.gene1_color' not in v0:
+        v0['illustrate.gene1_color'] = '#657e91'
+    if 'illustrate.gene1_color_selected' not in v0:
+        v0['illustrate.gene1_color_selected'] = '#518dc5'
+    if 'illustrate.gene2_color' not in v0:
+        v0['illustrate.gene2_color'] = '#325556'
+    if 'illustrate.gene2_color_selected' not in v0:
+        v0['illustrate.gene2_color_selected'] = '#4c9677'
+    if 'illustrate.label_color' not in v0:
+        v0['illustrate.label_color'] = '#000000'
+    if 'illustrate.mask_fill' not in v0:
+        v0['illustrate.mask_fill'] = '#ffffff'
+    if 'illustrate.mask_opacity' not in v0:
+        v0['illustrate.mask_opacity'] = 0.7
+    if 'illustrate.max_drawing_retries' not in v0:
+        v0['illustrate.max_drawing_retries'] = 5
+    if 'illustrate.novel_exon_color' not in v0:
+        v0['illustrate.novel_exon_color'] = '#5D3F6A'
+    if 'illustrate.scaffold_color' not in v0:
+        v0['illustrate.scaffold_color'] = '#000000'
+    if 'illustrate.splice_color' not in v0:
+        v0['illustrate.splice_color'] = '#000000'
+    if 'illustrate.width' not in v0:
+        v0['illustrate.width'] = 1000
+    if 'log_level' not in v0:
+        v0['log_level'] = 'INFO'
+    if 'validate.min_mapping_quality' not in v0:
+        v0['validate.min_mapping_quality'] = 5
+
+
+def validate_overlay(config) -> bool:
+    """
+    Check a config against the overlay schema, setting any default values if it
+    is valid. Invalid configs are not modified
+    """
+    if not _check_15(config):
+        return False
+    _defaults_16(config)
+    return True
+
+
+VALIDATORS = {'config': validate_config, 'overlay': validate_overlay}
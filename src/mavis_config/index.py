@@ -0,0 +1,106 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Dict, Iterable, Tuple
+
+from .constants import SUBCOMMAND
+from .util import index_sections, scan_prefix
+
+
+class ConfigIndex(Mapping):
+    """
+    Read-only view of a validated config with the library inputs, the reverse lookup of inputs to
+    libraries and the settings sections indexed up front. Can be passed in place of the config
+    dict to get_library_inputs and get_singularity_bindings.
+
+    The index is built once so the underlying config must not be modified afterwards
+
+    Example:
+        >>> index = ConfigIndex(config)
+        >>> index.library_inputs('lib1')
+        ('/path/to/input.tab',)
+        >>> index.libraries_using('conversion_alias')
+        ('lib1', 'lib2')
+        >>> index.section('cluster.')['max_files']
+        200
+    """
+
+    def __init__(self, config: Dict):
+        self._data = config
+        conversions = config.get('convert', {})
+        library_inputs: Dict[str, Tuple[str, ...]] = {}
+        users: Dict[str, list] = {}
+
+        for library_name, library in config.get('libraries', {}).items():
+            inputs = []
+            for assignment in library['assign']:
+                if assignment in conversions:
+                    users.setdefault(assignment, []).append(library_name)
+                    inputs.extend(conversions[assignment]['inputs'])
+                else:
+                    inputs.append(assignment)
+            for input_file in inputs:
+                users.setdefault(input_file, []).append(library_name)
+            library_inputs[library_name] = tuple(inputs)
+
+        self._library_inputs = library_inputs
+        # a library assigned the same input twice should only be listed once
+        self._users = {k: tuple(dict.fromkeys(v)) for k, v in users.items()}
+
+        self._sections = index_sections(config.items())
+        self._empty = MappingProxyType({})
+
+        references = []
+        for files in self.section('reference.').values():
+            references.extend(files)
+        self._references = tuple(dict.fromkeys(references))
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def library_inputs(self, library_name: str) -> Tuple[str, ...]:
+        """
+        The raw/initial input files for a library (conversion aliases replaced by their inputs)
+        """
+        return self._library_inputs[library_name]
+
+    def libraries_using(self, input_file_or_alias: str) -> Tuple[str, ...]:
+        """
+        The libraries which use an input file or conversion alias, in config order
+        """
+        return self._users.get(input_file_or_alias, ())
+
+    def section(self, prefix: str) -> Mapping:
+        """
+        The settings starting with a given prefix (ex. 'cluster.') with the prefix removed. Only
+        prefixes ending in a dot are indexed, anything else is found by scanning the config
+        """
+        if prefix.endswith('.'):
+            return self._sections.get(prefix, self._empty)
+        return MappingProxyType(scan_prefix(self._data, prefix))
+
+    def stage_settings(self, stage: str) -> Mapping:
+        """
+        The settings section for a given pipeline stage
+        """
+        return self.section(f'{SUBCOMMAND.enforce(stage)}.')
+
+    @property
+    def reference_files(self) -> Tuple[str, ...]:
+        return self._references
+
+    def all_inputs(self) -> Iterable[str]:
+        """
+        All the library inputs, bam files and reference files (may contain duplicates)
+        """
+        for library_name, inputs in self._library_inputs.items():
+            yield from inputs
+            bam_file = self._data['libraries'][library_name].get('bam_file', '')
+            if bam_file:
+                yield bam_file
+        yield from self._references
@@ -0,0 +1,162 @@
+"""
+Optional timing and I/O counters for the slow parts of config setup (schema validation, glob
+expansion, bam checks and row counting). Nothing is recorded unless a recorder is active, in
+which case phase() and count() are a check of an empty list and return immediately
+
+Example:
+    >>> with record() as recorder:
+    ...     validate_config(config)
+    >>> recorder.phases['bash_expands'].seconds
+    0.0123
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+
+class PhaseEvent(NamedTuple):
+    phase: str
+    calls: int = 0
+    seconds: float = 0.0
+    files: int = 0
+    stats: int = 0
+    bytes_read: int = 0
+
+
+class PhaseStats:
+    """
+    Totals for a single phase. seconds is the summed wall time of all calls, so phases run from
+    several threads at once can add up to more than the elapsed time. bytes_read counts the bytes
+    of input files after decompression
+    """
+
+    __slots__ = ['calls', 'seconds', 'files', 'stats', 'bytes_read']
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.files = 0
+        self.stats = 0
+        self.bytes_read = 0
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        values = ', '.join(f'{k}={v!r}' for k, v in self.as_dict().items())
+        return f'PhaseStats({values})'
+
+
+class PhaseRecorder:
+    """
+    Collects the events recorded while it is active, totalled by phase
+
+    Attributes:
+        phases: the totals for each phase which had any events
+        callback: called with each PhaseEvent as it is recorded
+    """
+
+    def __init__(self, callback: Optional[Callable[[PhaseEvent], None]] = None):
+        self.phases: Dict[str, PhaseStats] = {}
+        self.callback = callback
+        self._lock = threading.Lock()
+
+    def add(self, event: PhaseEvent) -> None:
+        with self._lock:
+            stats = self.phases.get(event.phase)
+            if stats is None:
+                stats = self.phases[event.phase] = PhaseStats()
+            stats.calls += event.calls
+            stats.seconds += event.seconds
+            stats.files += event.files
+            stats.stats += event.stats
+            stats.bytes_read += event.bytes_read
+        if self.callback is not None:
+            self.callback(event)
+
+    def as_dict(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self.phases.items()}
+
+
+_RECORDERS: List[PhaseRecorder] = []  # the active recorders, empty unless record() is in use
+_RECORDERS_LOCK = threading.Lock()
+
+
+def enabled() -> bool:
+    """
+    Check if anything is being recorded, for callers which need extra work to compute a count
+    """
+    return bool(_RECORDERS)
+
+
+@contextmanager
+def record(callback: Optional[Callable[[PhaseEvent], None]] = None) -> Iterator[PhaseRecorder]:
+    """
+    Record the phases of everything run (in any thread of this process) inside the block.
+    Work done in worker processes (ex. count_total_rows with processes > 1) is timed but its
+    reads are not counted
+
+    Args:
+        callback: called with each PhaseEvent as it happens
+    """
+    recorder = PhaseRecorder(callback)
+    with _RECORDERS_LOCK:
+        _RECORDERS.append(recorder)
+    try:
+        yield recorder
+    finally:
+        with _RECORDERS_LOCK:
+            _RECORDERS.remove(recorder)
+
+
+def _emit(event: PhaseEvent) -> None:
+    for recorder in list(_RECORDERS):
+        recorder.add(event)
+
+
+class _Timer:
+    __slots__ = ['name', 'start']
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        _emit(PhaseEvent(self.name, calls=1, seconds=time.perf_counter() - self.start))
+        return False
+
+
+class _NullTimer:
+    __slots__ = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def phase(name: str):
+    """
+    Context manager which records the wall time of the block as a call of the named phase
+    """
+    if not _RECORDERS:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def count(name: str, files: int = 0, stats: int = 0, bytes_read: int = 0) -> None:
+    """
+    Add to the file, stat (file system call) and bytes read counts of the named phase
+    """
+    if _RECORDERS:
+        _emit(PhaseEvent(name, files=files, stats=stats, bytes_read=bytes_read))
@@ -0,0 +1,100 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional
+
+from .constants import SUBCOMMAND
+
+
+def validate_config_file(filename: str, stage: str = SUBCOMMAND.SETUP) -> Dict:
+    """
+    Load and validate a single JSON config file
+
+    Returns:
+        the report entry for the config file
+    """
+    from . import validate_config
+
+    start_time = time.perf_counter()
+    error = None
+    try:
+        with open(filename, 'r') as fh:
+            config = json.load(fh)
+        validate_config(config, stage=stage)
+    except Exception as err:
+        error = f'{type(err).__name__}: {err}'
+    return {
+        'config': filename,
+        'status': 'fail' if error else 'pass',
+        'error': error,
+        'duration': round(time.perf_counter() - start_time, 6),
+    }
+
+
+def validate_config_files(
+    filenames: List[str], stage: str = SUBCOMMAND.SETUP, processes: Optional[int] = None
+) -> Dict:
+    """
+    Validate many config files in parallel worker processes
+
+    Returns:
+        the report (per-config status, error and timing) in the same order as the input files
+    """
+    start_time = time.perf_counter()
+    validate = partial(validate_config_file, stage=stage)
+    processes = min(processes or os.cpu_count() or 1, len(filenames))
+
+    if processes <= 1:
+        results = list(map(validate, filenames))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(validate, filenames))
+
+    return {
+        'stage': stage,
+        'total': len(results),
+        'failed': sum(result['status'] != 'pass' for result in results),
+        'duration': round(time.perf_counter() - start_time, 6),
+        'results': results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Validate MAVIS config files and write a JSON report of the results'
+    )
+    parser.add_argument('configs', nargs='+', help='the JSON config files to validate')
+    parser.add_argument(
+        '--stage',
+        default=SUBCOMMAND.SETUP,
+        choices=SUBCOMMAND.values(),
+        help='the pipeline stage to validate the configs for',
+    )
+    parser.add_argument(
+        '-j',
+        '--processes',
+        type=int,
+        default=None,
+        help='number of worker processes (defaults to the number of cores)',
+    )
+    parser.add_argument(
+        '-o', '--report', default='-', help='file to write the JSON report to (defaults to stdout)'
+    )
+    args = parser.parse_args(argv)
+
+    if args.processes is not None and args.processes < 1:
+        parser.error('--processes must be a positive integer')
+
+    report = validate_config_files(args.configs, stage=args.stage, processes=args.processes)
+
+    if args.report == '-':
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.report, 'w') as fh:
+            json.dump(report, fh, indent=2)
+    return 1 if report['failed'] else 0
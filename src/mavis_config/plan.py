@@ -0,0 +1,167 @@
+import gzip
+import io
+import locale
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import IO, Dict, Iterator, List, NamedTuple, Optional
+
+from .counting import RowOffsets, scan_row_offsets
+
+SPLIT_RESOLUTION = 10  # split points per batch-sized group of rows (min_clusters_per_file)
+
+
+class Shard(NamedTuple):
+    """
+    A byte range of an input file to be read by a batch, starting and ending on line boundaries.
+    rows is the number of distinct rows first seen in the range
+    """
+
+    batch: int
+    filename: str
+    start: int
+    end: int
+    rows: int
+
+
+class BatchPlan(NamedTuple):
+    total_batches: int
+    total_rows: int
+    shards: List[Shard]
+
+    def batch(self, batch: int) -> List[Shard]:
+        """
+        The shards to be read by a given batch (0-based)
+        """
+        return [shard for shard in self.shards if shard.batch == batch]
+
+    def to_dict(self) -> Dict:
+        """
+        JSON-compatible form of the plan. The shards can be stored on the library config
+        (config['libraries'][name]['shards'])
+        """
+        return {
+            'total_batches': self.total_batches,
+            'total_rows': self.total_rows,
+            'shards': [shard._asdict() for shard in self.shards],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'BatchPlan':
+        return cls(
+            data['total_batches'],
+            data['total_rows'],
+            [Shard(**shard) for shard in data['shards']],
+        )
+
+
+def _split_files(
+    filenames: List[str], scans: List[RowOffsets], step: int, total_batches: int
+) -> List[Shard]:
+    """
+    Split the (concatenated) files into batches with about the same number of rows each, using
+    the scanned line offsets after every step rows as the possible split points
+    """
+    total_rows = sum(scan.rows for scan in scans)
+    shards: List[Shard] = []
+    batch = 0
+    base = 0  # rows in the previous files
+
+    def boundary(batch: int) -> int:
+        # rows before the end of a batch
+        return round((batch + 1) * total_rows / total_batches)
+
+    for filename, scan in zip(filenames, scans):
+        start_rows, start = 0, 0
+        while batch < total_batches - 1 and base + scan.rows >= boundary(batch):
+            # nearest split point to the boundary (the end of the file is also a split point)
+            index = min(max(0, round((boundary(batch) - base) / step) - 1), len(scan.offsets))
+            rows = (index + 1) * step if index < len(scan.offsets) else scan.rows
+            # after the last row the shard ends with the file, including any trailing comment,
+            # blank or duplicate lines
+            end = scan.offsets[index] if rows < scan.rows else scan.size
+            if rows > start_rows:
+                shards.append(Shard(batch, filename, start, end, rows - start_rows))
+                start_rows, start = rows, end
+            batch += 1
+        if scan.rows > start_rows:
+            shards.append(Shard(batch, filename, start, scan.size, scan.rows - start_rows))
+        base += scan.rows
+    return shards
+
+
+def plan_batches(config: Dict, input_files: List[str], processes: Optional[int] = 1) -> BatchPlan:
+    """
+    Count the rows in the input files for a library (as guess_total_batches does) and split them
+    into byte ranges with a balanced number of rows for each batch, so that downstream jobs can
+    seek to their part of the inputs instead of reading all of them
+
+    Each file is read once in full (the count cannot stop early as guess_total_batches does since
+    the split points are needed), in parallel when processes is more than 1
+
+    Args:
+        config: the validated config
+        input_files: the input files for the library
+        processes: number of worker processes to read the files with (None to use all cores)
+
+    Returns:
+        the plan. total_batches is the same as guess_total_batches would return
+    """
+    from . import _batches_from_rows
+
+    max_files = config['cluster.max_files']
+    min_rows = config['cluster.min_clusters_per_file']
+    step = max(1, min_rows // SPLIT_RESOLUTION)
+
+    unique_files = list(dict.fromkeys(input_files))
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes <= 1 or len(unique_files) < 2:
+        scans = [scan_row_offsets(f, step) for f in unique_files]
+    else:
+        with ProcessPoolExecutor(max_workers=min(processes, len(unique_files))) as pool:
+            scans = list(pool.map(scan_row_offsets, unique_files, [step] * len(unique_files)))
+    scanned = dict(zip(unique_files, scans))
+
+    # files listed more than once are counted (and read) once per listing, as in count_total_rows
+    scans = [scanned[f] for f in input_files]
+    total_rows = sum(scan.rows for scan in scans)
+    total_batches = _batches_from_rows(max_files, min_rows, total_rows)
+    shards = _split_files(list(input_files), scans, step, total_batches) if total_batches else []
+    return BatchPlan(total_batches, total_rows, shards)
+
+
+class _RangeReader(io.RawIOBase):
+    """
+    Read at most size bytes from the current position of a file
+    """
+
+    def __init__(self, fh: IO[bytes], size: int):
+        self._fh = fh
+        self._remaining = size
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._fh.read(min(len(buffer), self._remaining))
+        buffer[: len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+def iter_shard_lines(shard: Shard) -> Iterator[str]:
+    """
+    Read the lines in the byte range of a shard (including any comment, blank or duplicate lines)
+    as they would be read in text mode (with universal newlines)
+    """
+    encoding = locale.getpreferredencoding(False)
+    if shard.filename.endswith('.gz'):
+        fh = gzip.open(shard.filename, 'rb')
+    else:
+        fh = open(shard.filename, 'rb')
+    with fh:
+        # gzip streams cannot seek directly, this decompresses up to the start of the shard
+        fh.seek(shard.start)
+        reader = io.BufferedReader(_RangeReader(fh, shard.end - shard.start))
+        with io.TextIOWrapper(reader, encoding=encoding, newline=None) as text:
+            yield from text
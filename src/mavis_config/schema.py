@@ -0,0 +1,129 @@
+import copy
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+from .constants import SUBCOMMAND
+
+SCHEMAS = ('config', 'overlay')
+
+_VALIDATORS: Dict = {}
+_VALIDATORS_LOCK = threading.Lock()
+
+
+def schema_name(stage: str) -> str:
+    """
+    Get the name of the JSON schema used to validate the config for a given pipeline stage
+    """
+    return 'config' if stage != SUBCOMMAND.OVERLAY else 'overlay'
+
+
+@lru_cache(maxsize=None)
+def _schema_path(name: str) -> str:
+    return os.path.join(os.path.dirname(__file__), f'{name}.json')
+
+
+@lru_cache(maxsize=None)
+def schema_digest(name: str) -> str:
+    """
+    Hash of the JSON schema file contents, used to tell if the generated validators (see
+    codegen) were built from the current schema
+    """
+    with open(_schema_path(name), 'rb') as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def load_schema(name: str) -> Dict:
+    """
+    Read and parse one of the JSON schema files shipped with this package. The result is
+    cached and shared so it must not be modified by the caller
+    """
+    with open(_schema_path(name), 'r') as fh:
+        # ordered the same way snakemake loads it so that error messages are identical
+        return json.load(fh, object_pairs_hook=OrderedDict)
+
+
+def schema_defaults(name: str) -> Dict:
+    """
+    Get the top-level default values from a JSON schema. This is equivalent to validating
+    an empty config with set_default=True but does not require importing snakemake
+    """
+    return {
+        k: copy.deepcopy(v['default'])
+        for k, v in load_schema(name)['properties'].items()
+        if 'default' in v
+    }
+
+
+def _compile_validator(schema: Dict):
+    from jsonschema import validators
+
+    # same default-setting extension snakemake.utils.validate applies
+    Validator = validators.validator_for(schema)
+    validate_properties = Validator.VALIDATORS['properties']
+
+    def set_defaults(validator, properties, instance, schema):
+        for prop, subschema in properties.items():
+            if 'default' in subschema and prop not in instance:
+                # copy so that the cached schema is never shared with (and mutated through) a config
+                instance[prop] = copy.deepcopy(subschema['default'])
+
+        for error in validate_properties(validator, properties, instance, schema):
+            yield error
+
+    return validators.extend(Validator, {'properties': set_defaults})(schema)
+
+
+def get_validator(name: str):
+    """
+    Get the compiled (default-setting) jsonschema validator for a given schema name. Validators
+    are built once per process and then reused
+    """
+    validator = _VALIDATORS.get(name)
+    if validator is None:
+        with _VALIDATORS_LOCK:
+            validator = _VALIDATORS.get(name)
+            if validator is None:
+                validator = _compile_validator(load_schema(name))
+                _VALIDATORS[name] = validator
+    return validator
+
+
+@lru_cache(maxsize=None)
+def get_fast_validator(name: str) -> Optional[Callable[[Dict], bool]]:
+    """
+    Get the generated validation function for a given schema name (see codegen), or None if it
+    was generated from a different version of the schema
+    """
+    from .fastschema import SCHEMA_DIGESTS, VALIDATORS
+
+    if name not in VALIDATORS or SCHEMA_DIGESTS[name] != schema_digest(name):
+        return None
+    return VALIDATORS[name]
+
+
+def validate_schema(config: Dict, name: str) -> None:
+    """
+    Validate a config against one of the package schemas, setting any default values. Valid
+    configs are checked by the generated validators, invalid ones are re-checked by jsonschema for
+    the error message
+
+    Raises:
+        WorkflowError: the config does not conform to the schema (same error snakemake.utils.validate raises)
+    """
+    fast_validator = get_fast_validator(name)
+    if fast_validator is not None and fast_validator(config):
+        return
+
+    from jsonschema.exceptions import ValidationError
+    from snakemake.exceptions import WorkflowError
+
+    try:
+        get_validator(name).validate(config)
+    except ValidationError as err:
+        raise WorkflowError('Error validating config file.', err)
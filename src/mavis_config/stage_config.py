@@ -0,0 +1,141 @@
+"""
+Per-stage, per-library configs for the jobs of a validated project config. Each contains only the
+shared settings (no dotted prefix, reference files, skipped stages), the settings sections of the
+stage and the one library (and the conversions it uses), so the size of the config each job
+loads does not grow with the number of libraries in the project
+
+Example:
+    >>> validate_config(config, stage=SUBCOMMAND.SETUP)
+    >>> paths = export_stage_configs(config, 'output/stage_configs')
+    >>> config = load_stage_config(paths[(SUBCOMMAND.CLUSTER, 'lib1')])
+"""
+
+import json
+import os
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from .constants import SUBCOMMAND
+from .instrument import phase
+from .schema import schema_digest, validate_schema
+from .util import converted_output_path, write_text_atomic
+
+STAGE_CONFIG_VERSION = 1  # bump when the contents of the stage configs change
+
+# settings sections (besides the shared ones) needed by the jobs of each per-library stage
+STAGE_SECTIONS = {
+    SUBCOMMAND.CLUSTER: ('cluster.',),
+    SUBCOMMAND.VALIDATE: ('validate.',),
+    SUBCOMMAND.ANNOTATE: ('annotate.', 'illustrate.'),
+}
+SHARED_SECTIONS = ('reference.', 'skip_stage.')
+
+
+def stage_config_path(directory: str, stage: str, library_name: str) -> str:
+    return os.path.join(directory, stage, f'{library_name}.json')
+
+
+def stage_config(config: Mapping, stage: str, library_name: str) -> Dict:
+    """
+    The subset of a validated config needed by the jobs of a stage for a single library. The
+    config may have been validated for setup, conversion aliases in the library assignments are
+    replaced by their converted outputs as validate_config does for the stage
+    """
+    if stage not in STAGE_SECTIONS:
+        stages = ', '.join(STAGE_SECTIONS)
+        raise ValueError(
+            f'stage configs are only built for the per-library stages ({stages})', stage
+        )
+    prefixes = SHARED_SECTIONS + STAGE_SECTIONS[stage]
+    library = config['libraries'][library_name]
+    conversions = config.get('convert', {})
+
+    result = {}
+    for key, value in config.items():
+        if key in {'libraries', 'convert'}:
+            continue
+        if '.' not in key or key.startswith(prefixes):
+            result[key] = value
+    if conversions:
+        result['convert'] = {
+            alias: conversions[alias] for alias in library['assign'] if alias in conversions
+        }
+        # the same as validate_config does for every stage after setup
+        library = {
+            **library,
+            'assign': [
+                converted_output_path(config['output_dir'], a) if a in conversions else a
+                for a in library['assign']
+            ],
+        }
+    result['libraries'] = {library_name: library}
+    return result
+
+
+def export_stage_configs(
+    config: Mapping,
+    directory: str,
+    stages: Iterable[str] = tuple(STAGE_SECTIONS),
+    libraries: Optional[Iterable[str]] = None,
+) -> Dict[Tuple[str, str], str]:
+    """
+    Write the config for each stage and library to its own file (see stage_config_path). Files
+    which already have the same content are left untouched so that their modification times do
+    not cause snakemake to re-run jobs
+
+    Args:
+        config: the validated config
+        directory: the directory to write the stage configs to
+        stages: the stages to write configs for
+        libraries: the libraries to write configs for (all by default)
+
+    Returns:
+        the path written for each stage and library
+    """
+    header = {'version': STAGE_CONFIG_VERSION, 'schema': schema_digest('config')}
+    library_names = list(config['libraries'] if libraries is None else libraries)
+    paths = {}
+    with phase('export_stage_configs'):
+        for stage in stages:
+            for library_name in library_names:
+                path = stage_config_path(directory, stage, library_name)
+                content = json.dumps(
+                    {
+                        **header,
+                        'stage': stage,
+                        'library': library_name,
+                        'config': stage_config(config, stage, library_name),
+                    },
+                    separators=(',', ':'),
+                )
+                if _read_text(path) != content:
+                    write_text_atomic(path, content)
+                paths[(stage, library_name)] = path
+    return paths
+
+
+def _read_text(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r') as fh:
+            return fh.read()
+    except OSError:
+        return None
+
+
+def load_stage_config(path: str) -> Dict:
+    """
+    Read a config written by export_stage_configs. The config was validated before it was
+    exported so it is not validated again, unless it was written for a different version of the
+    config schema than the one installed
+
+    Raises:
+        ValueError: the file is not a stage config (or is from an incompatible version)
+    """
+    with phase('load_stage_config'):
+        with open(path, 'r') as fh:
+            data = json.load(fh)
+        if not isinstance(data, dict) or data.get('version') != STAGE_CONFIG_VERSION:
+            raise ValueError(f'not a stage config (version {STAGE_CONFIG_VERSION}): {path}')
+        config = data['config']
+        if data.get('schema') != schema_digest('config'):
+            validate_schema(config, 'config')
+        return config
@@ -0,0 +1,191 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple, Type
+
+from .schema import load_schema, schema_defaults
+
+
+class ConfigSection:
+    """
+    Base class for the generated config classes. Each field is a slot, so instances have no
+    per-instance dict. Fields which are not set (optional settings without a default) raise
+    AttributeError and are left out of the dict form
+    """
+
+    __slots__ = ()
+    _schema: str = ''
+    _section: str = ''
+    _fields: Tuple[str, ...] = ()
+
+    def _items(self):
+        for field in self._fields:
+            try:
+                yield field, getattr(self, field)
+            except AttributeError:
+                pass
+
+    def __eq__(self, other):
+        return type(self) is type(other) and list(self._items()) == list(other._items())
+
+    def __repr__(self):
+        values = ', '.join(f'{k}={v!r}' for k, v in self._items())
+        return f'{type(self).__name__}({values})'
+
+    def __reduce__(self):
+        # pickle as a bit mask of the fields which are set and their values. Field names are
+        # not sent since the class is regenerated from the schema on the other side
+        mask = 0
+        values = []
+        for position, field in enumerate(self._fields):
+            try:
+                values.append(getattr(self, field))
+            except AttributeError:
+                continue
+            mask |= 1 << position
+        return (_unpickle, (self._schema, self._section, mask, tuple(values)))
+
+
+def _unpickle(schema: str, section: str, mask: int, values: Tuple) -> ConfigSection:
+    cls = _section_class(schema, section)
+    obj = cls.__new__(cls)
+    remaining = iter(values)
+    for position, field in enumerate(cls._fields):
+        if mask & (1 << position):
+            setattr(obj, field, next(remaining))
+    return obj
+
+
+class TypedConfig(ConfigSection):
+    """
+    Base class for the generated top-level config class. Settings without a prefix are
+    attributes of the config and prefixed settings are grouped into section objects
+    (ex. config['cluster.max_files'] is cfg.cluster.max_files)
+    """
+
+    __slots__ = ()
+    _sections: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, config: Dict, defaults: bool = True) -> 'TypedConfig':
+        """
+        Build a typed config from the dict form of the config
+
+        Args:
+            config: the config (normally after validate_config)
+            defaults: fill in the schema defaults for settings missing from the config
+
+        Raises:
+            KeyError: the config has a setting which is not in the schema
+        """
+        values = schema_defaults(cls._schema) if defaults else {}
+        values.update(config)
+
+        grouped: Dict[str, Dict[str, Any]] = {section: {} for section in cls._sections}
+        top: Dict[str, Any] = {}
+        for key, value in values.items():
+            section, _, name = key.rpartition('.')
+            if section:
+                if section not in grouped:
+                    raise KeyError(f'{key} is not a setting in the {cls._schema} schema')
+                grouped[section][name] = value
+            else:
+                top[key] = value
+
+        obj = cls.__new__(cls)
+        _set_fields(obj, top)
+        for section, section_values in grouped.items():
+            section_cls = _section_class(cls._schema, section)
+            section_obj = section_cls.__new__(section_cls)
+            _set_fields(section_obj, section_values)
+            setattr(obj, section, section_obj)
+        return obj
+
+    def to_dict(self) -> Dict:
+        """
+        Convert back to the dict form (ex. for validate_config or writing as JSON)
+        """
+        config = {}
+        for field, value in self._items():
+            if field in self._sections:
+                for name, section_value in value._items():
+                    config[f'{field}.{name}'] = section_value
+            else:
+                config[field] = value
+        return config
+
+
+def _set_fields(obj: ConfigSection, values: Dict[str, Any]) -> None:
+    for key, value in values.items():
+        if key not in obj._fields:
+            raise KeyError(f'{key} is not a setting in the {obj._schema} schema')
+        setattr(obj, key, value)
+
+
+def _class_name(schema: str, section: str) -> str:
+    parts = [schema] + section.split('_') + ['config' if not section else 'section']
+    return ''.join(part.capitalize() for part in parts if part)
+
+
+@lru_cache(maxsize=None)
+def _layout(schema: str) -> Tuple[Tuple[str, ...], Dict[str, Tuple[str, ...]]]:
+    top: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    for key in load_schema(schema)['properties']:
+        section, _, name = key.rpartition('.')
+        if section:
+            sections.setdefault(section, []).append(name)
+        else:
+            top.append(key)
+    return tuple(top), {k: tuple(v) for k, v in sections.items()}
+
+
+@lru_cache(maxsize=None)
+def _section_class(schema: str, section: str) -> Type[ConfigSection]:
+    if not section:
+        return config_class(schema)
+    fields = _layout(schema)[1][section]
+    return type(
+        _class_name(schema, section),
+        (ConfigSection,),
+        {
+            '__slots__': fields,
+            '__module__': __name__,
+            '_schema': schema,
+            '_section': section,
+            '_fields': fields,
+        },
+    )
+
+
+@lru_cache(maxsize=None)
+def config_class(schema: str = 'config') -> Type[TypedConfig]:
+    """
+    Generate the typed config class for one of the JSON schemas. Classes are cached so every
+    call for the same schema returns the same class
+    """
+    top, sections = _layout(schema)
+    fields = top + tuple(sections)
+    return type(
+        _class_name(schema, ''),
+        (TypedConfig,),
+        {
+            '__slots__': fields,
+            '__module__': __name__,
+            '_schema': schema,
+            '_fields': fields,
+            '_sections': tuple(sections),
+        },
+    )
+
+
+def typed_config(config: Dict, schema: str = 'config', defaults: bool = True) -> TypedConfig:
+    """
+    Convert the dict form of a config to its typed form
+
+    Example:
+        >>> cfg = typed_config({'libraries': {}, 'output_dir': 'output'})
+        >>> cfg.cluster.max_files
+        200
+        >>> typed_config(cfg.to_dict()) == cfg
+        True
+    """
+    return config_class(schema).from_dict(config, defaults=defaults)
@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Tuple
+
+IO_THREADS = 16  # default number of threads for file system checks
+
+
+def write_text_atomic(path: str, text: str) -> None:
+    """
+    Write to a temporary file and then move it into place so that concurrent readers and
+    writers never see a partially written file
+    """
+    dirname = os.path.dirname(os.path.abspath(path))
+    os.makedirs(dirname, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as fh:
+            fh.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    """
+    Write JSON atomically (see write_text_atomic)
+    """
+    write_text_atomic(path, json.dumps(data))
+
+
+def converted_output_path(output_dir: str, alias: str) -> str:
+    """
+    The path the converted input for a conversion alias is written to, which replaces the alias
+    in the library assignments for every stage after setup
+    """
+    return os.path.join(os.path.join(output_dir, 'converted_outputs'), f'{alias}.tab')
+
+
+def scan_prefix(config: Mapping, prefix: str) -> Dict[str, Any]:
+    """
+    The items whose keys start with prefix, with the prefix removed
+    """
+    return {k[len(prefix) :]: v for k, v in config.items() if k.startswith(prefix)}
+
+
+def index_sections(items: Iterable[Tuple[str, Any]]) -> Dict[str, Mapping]:
+    """
+    Group dotted keys by each of their prefixes (ex. 'a.b.c' is in the 'a.' and 'a.b.' sections)
+    with the prefix removed. Sections are returned as read-only views so they can be shared
+    """
+    sections: Dict[str, Dict[str, Any]] = {}
+    for key, value in items:
+        start = key.find('.')
+        while start >= 0:
+            sections.setdefault(key[: start + 1], {})[key[start + 1 :]] = value
+            start = key.find('.', start + 1)
+    return {prefix: MappingProxyType(section) for prefix, section in sections.items()}
@@ -0,0 +1,170 @@
+import copy
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from glob import has_magic
+from typing import Dict, Iterable, List, Optional
+
+from .schema import load_schema
+from .util import IO_THREADS, write_json_atomic
+
+CACHE_FORMAT_VERSION = 1  # bump when the validation logic changes the expanded config
+
+
+@lru_cache(maxsize=None)
+def _schema_version() -> str:
+    schemas = [CACHE_FORMAT_VERSION, load_schema('config'), load_schema('overlay')]
+    return hashlib.sha256(json.dumps(schemas, sort_keys=True).encode('utf8')).hexdigest()
+
+
+def _signature(path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+def _static_prefix(expression: str) -> str:
+    """
+    The directory part of a glob/brace expression before any pattern characters
+    """
+    for index, char in enumerate(expression):
+        if char == '{' or has_magic(char):
+            return os.path.dirname(expression[:index])
+    return os.path.dirname(expression)
+
+
+def _input_expressions(config: Dict) -> Iterable[str]:
+    conversions = config.get('convert', {})
+    for library in config.get('libraries', {}).values():
+        for assignment in library.get('assign', []):
+            if assignment not in conversions:
+                yield assignment
+        if library.get('bam_file'):
+            yield library['bam_file']
+    for conversion in conversions.values():
+        yield from conversion.get('inputs', [])
+    for key, value in config.items():
+        if key.startswith('reference.') and isinstance(value, list):
+            yield from value
+
+
+class ValidationCache:
+    """
+    Cache of validated (and expanded) configs keyed on a hash of the config contents, the stage,
+    the schemas and the working directory. An entry is only used if none of the files it resolved
+    to (or the directories searched for them) have changed since it was validated, which costs
+    one stat per file and directory instead of re-expanding the globs.
+
+    Entries are kept in memory (least recently used are dropped past max_entries) and, if a
+    directory is given, also written there as one JSON file per entry so they can be shared
+    between processes
+    """
+
+    def __init__(
+        self, directory: Optional[str] = None, max_entries: int = 128, io_threads: int = IO_THREADS
+    ):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.io_threads = io_threads
+        self._entries: Dict[str, Dict] = OrderedDict()
+
+    @staticmethod
+    def key(config: Dict, stage: str) -> str:
+        digest = hashlib.sha256()
+        for part in [_schema_version(), stage, os.getcwd(), config]:
+            digest.update(json.dumps(part, sort_keys=True).encode('utf8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.json')
+
+    def _signatures(self, paths: List[str]) -> List[Optional[List[int]]]:
+        if len(paths) < 2 or self.io_threads <= 1:
+            return list(map(_signature, paths))
+        with ThreadPoolExecutor(max_workers=self.io_threads) as pool:
+            return list(pool.map(_signature, paths))
+
+    def _load(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if entry is None and self.directory:
+            try:
+                with open(self._path(key), 'r') as fh:
+                    entry = json.load(fh)
+            except (OSError, ValueError):
+                return None
+        return entry
+
+    def get(self, config: Dict, stage: str) -> Optional[Dict]:
+        """
+        Get a copy of the validated config for an input config, or None if it has not been
+        validated or any of the files it refers to have changed
+        """
+        key = self.key(config, stage)
+        entry = self._load(key)
+        if entry is None:
+            return None
+        paths = list(entry['signatures'])
+        if self._signatures(paths) != [entry['signatures'][p] for p in paths]:
+            self.discard(key)
+            return None
+        self._remember(key, entry)
+        return copy.deepcopy(entry['config'])
+
+    def set(
+        self, config: Dict, stage: str, validated: Dict, directories: Iterable[str] = ()
+    ) -> None:
+        """
+        Store the validated form of an input config
+
+        Args:
+            config: the config as it was before validation
+            stage: the stage it was validated for
+            validated: the config after validation
+            directories: the directories searched while expanding the input globs (see
+                ExpansionCache.searched_directories). Files added to them invalidate the entry
+        """
+        files = set(_input_expressions(validated))
+        directories = {os.path.dirname(f) for f in files} | set(directories)
+        # catch files being added which would match the original glob expressions
+        directories.update(_static_prefix(e) for e in _input_expressions(config))
+        paths = sorted(files | {d or os.curdir for d in directories})
+        entry = {
+            'config': copy.deepcopy(validated),
+            'signatures': dict(zip(paths, self._signatures(paths))),
+        }
+        key = self.key(config, stage)
+        self._remember(key, entry)
+        if self.directory:
+            write_json_atomic(self._path(key), entry)
+
+    def _remember(self, key: str, entry: Dict) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self.directory:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """
+        Forget all entries, including those written to the cache directory
+        """
+        keys = set(self._entries)
+        if self.directory and os.path.isdir(self.directory):
+            keys.update(
+                f[: -len('.json')] for f in os.listdir(self.directory) if f.endswith('.json')
+            )
+        for key in keys:
+            self.discard(key)
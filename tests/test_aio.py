@@ -0,0 +1,110 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import mavis_config
+import pytest
+from mavis_config.aio import (
+    count_total_rows_async,
+    guess_total_batches_async,
+    validate_config_async,
+)
+from mavis_config.counting import RowCountCache
+
+from .util import package_path
+
+EXISTING_FILE = package_path('src/mavis_config/overlay.json')
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@pytest.fixture
+def library_input(tmp_path):
+    p = tmp_path / 'input.txt'
+    p.write_text('\n'.join([str(i) for i in range(800)]) + '\n')
+    return str(p)
+
+
+@pytest.fixture
+def large_input(tmp_path):
+    p = tmp_path / 'large.txt'
+    p.write_text(''.join(f'row{i}\n' for i in range(500000)))
+    return str(p)
+
+
+class TestValidateConfigAsync:
+    def test_updates_config(self):
+        config = {'reference.annotations': [EXISTING_FILE]}
+        run(validate_config_async(config, stage='overlay'))
+        assert config['reference.annotations'] == [os.path.abspath(EXISTING_FILE)]
+        assert 'illustrate.breakpoint_color' in config
+
+    def test_error_leaves_config_unchanged(self):
+        config = {'reference.annotations': ['/does/not/exist']}
+        with pytest.raises(FileNotFoundError):
+            run(validate_config_async(config, stage='overlay'))
+        assert config == {'reference.annotations': ['/does/not/exist']}
+
+    def test_many_concurrently(self):
+        configs = [{'reference.annotations': [EXISTING_FILE]} for _ in range(10)]
+
+        async def validate_all():
+            await asyncio.gather(*[validate_config_async(c, stage='overlay') for c in configs])
+
+        run(validate_all())
+        assert all('illustrate.breakpoint_color' in c for c in configs)
+
+    def test_timeout_stops_thread(self, monkeypatch):
+        expanded = []
+
+        def slow_expands(expression, cache=None):
+            time.sleep(0.02)
+            expanded.append(expression)
+            return [expression]
+
+        monkeypatch.setattr(mavis_config, 'bash_expands', slow_expands)
+        config = {'reference.annotations': [EXISTING_FILE] * 50}
+        executor = ThreadPoolExecutor(max_workers=1)
+        with pytest.raises(asyncio.TimeoutError):
+            run(
+                validate_config_async(
+                    config, stage='overlay', timeout=0.1, executor=executor, io_threads=1
+                )
+            )
+        executor.shutdown(wait=True)
+        assert len(expanded) < 50
+        assert config == {'reference.annotations': [EXISTING_FILE] * 50}
+
+
+class TestCountTotalRowsAsync:
+    def test_count(self, library_input):
+        assert run(count_total_rows_async([library_input, library_input])) == 1600
+
+    def test_limit(self, large_input, library_input):
+        assert run(count_total_rows_async([large_input, library_input], limit=10)) >= 10
+
+    def test_cache(self, tmp_path, library_input):
+        cache = RowCountCache(str(tmp_path / 'cache.json'))
+        run(count_total_rows_async([library_input], cache=cache))
+        assert RowCountCache(str(tmp_path / 'cache.json')).get(library_input) == 800
+
+    def test_timeout(self, large_input):
+        with pytest.raises(asyncio.TimeoutError):
+            run(count_total_rows_async([large_input], timeout=0.001))
+
+
+class TestGuessTotalBatchesAsync:
+    def test_mid_range_jobs(self, library_input):
+        config = {'cluster.min_clusters_per_file': 100, 'cluster.max_files': 100}
+        assert run(guess_total_batches_async(config, [library_input])) == 8
+
+    def test_above_max_jobs(self, library_input):
+        config = {'cluster.min_clusters_per_file': 1, 'cluster.max_files': 100}
+        assert run(guess_total_batches_async(config, [library_input], estimate=True)) == 100
@@ -0,0 +1,36 @@
+import json
+
+from benchmarks.run import compare, main
+
+
+def test_compare():
+    baselines = {'a': {'seconds': 1.0, 'peak_bytes': 1 << 30}, 'b': {'seconds': 1.0}}
+    results = {
+        'a': {'seconds': 1.2, 'peak_bytes': 2 << 30},
+        'b': {'seconds': 2.0, 'peak_bytes': 0},
+        'new': {'seconds': 10.0, 'peak_bytes': 0},
+    }
+    regressions = compare(results, baselines, 0.25)
+    assert len(regressions) == 2
+    assert regressions[0].startswith('a peak_bytes')
+    assert regressions[1].startswith('b seconds')
+
+
+def test_small_differences_ignored():
+    baselines = {'a': {'seconds': 0.0001, 'peak_bytes': 10}}
+    assert not compare({'a': {'seconds': 0.0002, 'peak_bytes': 100}}, baselines, 0.1)
+
+
+def test_save_and_compare(tmp_path):
+    baselines = tmp_path / 'baselines.json'
+    args = ['--scale', 'tiny', '--repeat', '1', '--baselines', str(baselines)]
+    args += ['--only', 'validate_config', 'bash_expands', '--workdir', str(tmp_path / 'work')]
+    assert main(args + ['--save']) == 0
+    saved = json.loads(baselines.read_text())
+    assert set(saved['tiny']) == {'validate_config', 'bash_expands'}
+
+    for result in saved['tiny'].values():
+        result['seconds'] = -1
+        result['peak_bytes'] = 0
+    baselines.write_text(json.dumps(saved))
+    assert main(args + ['--threshold', '1000']) == 1
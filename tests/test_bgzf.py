@@ -0,0 +1,110 @@
+import gzip
+import os
+import struct
+import zlib
+
+import pytest
+from mavis_config import bgzf, counting
+from mavis_config.counting import count_total_rows
+
+from .test_counting import reference_count
+
+EOF_BLOCK = bytes.fromhex('1f8b08040000000000ff0600424302001b0003000000000000000000')
+
+
+def write_bgzf(path, data, block_data_size=1000, index=False):
+    # minimal bgzip: independent deflate blocks with the BC extra field and the empty EOF block
+    offsets = []
+    with open(path, 'wb') as fh:
+        for start in range(0, len(data), block_data_size):
+            chunk = data[start : start + block_data_size]
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            deflated = compressor.compress(chunk) + compressor.flush()
+            header = b'\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00'
+            size = len(header) + 2 + len(deflated) + 8
+            if start:
+                offsets.append(fh.tell())
+            fh.write(header + struct.pack('<H', size - 1) + deflated)
+            fh.write(struct.pack('<II', zlib.crc32(chunk), len(chunk)))
+        fh.write(EOF_BLOCK)
+    if index:
+        with open(f'{path}.gzi', 'wb') as fh:
+            fh.write(struct.pack('<Q', len(offsets)))
+            for i, offset in enumerate(offsets):
+                fh.write(struct.pack('<QQ', offset, (i + 1) * block_data_size))
+    return str(path)
+
+
+@pytest.fixture
+def text():
+    lines = ['#header'] + [f'row{i % 700}\tvalue{i % 3}' for i in range(3000)] + ['', '  ', 'end']
+    return '\n'.join(lines).encode('utf8')
+
+
+class TestBlocks:
+    def test_detects_bgzf(self, tmp_path, text):
+        assert bgzf.is_bgzf(write_bgzf(tmp_path / 'input.tab.gz', text))
+
+    def test_plain_gzip_is_not_bgzf(self, tmp_path, text):
+        path = str(tmp_path / 'input.tab.gz')
+        with gzip.open(path, 'wb') as fh:
+            fh.write(text)
+        assert not bgzf.is_bgzf(path)
+        assert bgzf.block_offsets(path) is None
+
+    def test_index_matches_scan(self, tmp_path, text):
+        path = write_bgzf(tmp_path / 'input.tab.gz', text, index=True)
+        with open(path, 'rb') as fh:
+            scanned = bgzf.scan_block_offsets(fh)
+        assert [0] + bgzf.read_gzi(f'{path}.gzi') == scanned[:-1]  # the EOF block is not indexed
+        assert bgzf.block_offsets(path) == scanned[:-1]
+
+    def test_split_ranges(self):
+        ranges = bgzf.split_ranges(list(range(0, 1000, 10)), 1000, 4)
+        assert len(ranges) == 4
+        assert ranges[0][0] == 0 and ranges[-1][1] == 1000
+        assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+    def test_truncated(self, tmp_path, text):
+        path = write_bgzf(tmp_path / 'input.tab.gz', text)
+        size = os.path.getsize(path)
+        with open(path, 'rb') as fh:
+            with pytest.raises(EOFError):
+                b''.join(bgzf.inflate_range(fh, 0, size - len(EOF_BLOCK) - 5))
+
+
+class TestCountBgzfRows:
+    @pytest.mark.parametrize('processes', [1, 2, 3])
+    @pytest.mark.parametrize('index', [False, True])
+    def test_matches_reference(self, tmp_path, text, processes, index):
+        path = write_bgzf(tmp_path / 'input.tab.gz', text, block_data_size=97, index=index)
+        assert counting._count_bgzf_rows(path, processes=processes) == reference_count([path])
+        assert count_total_rows([path], processes=processes) == reference_count([path])
+
+    @pytest.mark.parametrize('processes', [1, 3])
+    def test_packed_runs(self, tmp_path, monkeypatch, text, processes):
+        monkeypatch.setattr(counting, 'DISTINCT_BUFFER_SIZE', 50)
+        monkeypatch.setattr(counting, 'RUN_FAN_IN', 3)
+        path = write_bgzf(tmp_path / 'input.tab.gz', text, block_data_size=97)
+        assert counting._count_bgzf_rows(path, processes=processes) == reference_count([path])
+
+    def test_stale_index_ignored(self, tmp_path, text):
+        path = write_bgzf(tmp_path / 'input.tab.gz', text, block_data_size=97)
+        with open(f'{path}.gzi', 'wb') as fh:
+            fh.write(struct.pack('<QQQ', 1, 13, 0))
+        assert count_total_rows([path], processes=2) == reference_count([path])
+
+    def test_no_newline_in_range(self, tmp_path):
+        path = write_bgzf(tmp_path / 'input.tab.gz', b'x' * 5000 + b'\nx\n' + b'y' * 5000, 100)
+        assert counting._count_bgzf_rows(path, processes=4) == 3
+
+    def test_multi_member_gzip_uses_serial_path(self, tmp_path, text):
+        path = str(tmp_path / 'input.tab.gz')
+        with open(path, 'wb') as fh:
+            fh.write(gzip.compress(text[:1000]) + gzip.compress(text[1000:]))
+        assert counting._count_bgzf_rows(path, processes=2) is None
+        assert count_total_rows([path], processes=2) == reference_count([path])
+
+    def test_limit(self, tmp_path, text):
+        path = write_bgzf(tmp_path / 'input.tab.gz', text, block_data_size=97)
+        assert count_total_rows([path], limit=10, processes=2) >= 10
@@ -0,0 +1,55 @@
+import pytest
+from mavis_config.bindings import covering_directories, is_subpath
+
+
+class TestIsSubpath:
+    def test_same(self):
+        assert is_subpath('/data', '/data')
+
+    def test_nested(self):
+        assert is_subpath('/data/a/b', '/data')
+
+    def test_shared_prefix(self):
+        assert not is_subpath('/data2/a', '/data')
+
+
+class TestCoveringDirectories:
+    def test_drops_nested(self):
+        assert covering_directories(['/a/b/c', '/a/b', '/a/b-c', '/d', '/a/b/e']) == [
+            '/a/b',
+            '/a/b-c',
+            '/d',
+        ]
+
+    def test_duplicates(self):
+        assert covering_directories(['/a/b', '/a/b/', '/a/./b']) == ['/a/b']
+
+    def test_under_limit(self):
+        assert covering_directories(['/a/b', '/a/c'], max_paths=2) == ['/a/b', '/a/c']
+
+    def test_collapses_deepest_first(self):
+        directories = ['/a/b/c/1', '/a/b/c/2', '/a/b/c/3', '/a/b/d', '/e/f']
+        assert covering_directories(directories, max_paths=3) == ['/a/b/c', '/a/b/d', '/e/f']
+        assert covering_directories(directories, max_paths=2) == ['/a/b', '/e/f']
+
+    def test_never_collapses_root(self):
+        assert covering_directories(['/a/1', '/b/1', '/c/1'], max_paths=1) == ['/a/1', '/b/1', '/c/1']
+
+    def test_excluded_directory_dropped(self):
+        assert covering_directories(['/out/a', '/out', '/data/a'], exclude='/out') == ['/data/a']
+
+    def test_never_collapses_into_excluded_parent(self):
+        directories = ['/data/a', '/data/b', '/data/c', '/other/x', '/other/y']
+        assert covering_directories(directories, max_paths=1, exclude='/data/out') == [
+            '/data/a',
+            '/data/b',
+            '/data/c',
+            '/other',
+        ]
+
+    @pytest.mark.parametrize('max_paths', [1, 5, 10, 50])
+    def test_covers_all(self, max_paths):
+        directories = [f'/data/{i % 7}/{i % 13}/{i}' for i in range(200)]
+        result = covering_directories(directories, max_paths=max_paths)
+        assert len(result) <= max(max_paths, 1)
+        assert all(any(is_subpath(d, r) for r in result) for d in directories)
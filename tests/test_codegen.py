@@ -0,0 +1,107 @@
+import copy
+
+import pytest
+from mavis_config import schema
+from mavis_config.codegen import MODULE_PATH, generate_module
+from mavis_config.schema import get_fast_validator, get_validator, load_schema, validate_schema
+from snakemake.exceptions import WorkflowError
+
+PROBES = [None, True, 0, -1, 1.5, 2.0, 'x', '#abcdef', [], ['x'], {}, {'a': 1}]
+
+LIBRARY = {'assign': ['input.tab'], 'disease_status': 'normal', 'protocol': 'genome'}
+
+
+def jsonschema_valid(config, name):
+    try:
+        get_validator(name).validate(config)
+    except Exception:
+        return False
+    return True
+
+
+def probe_configs(name):
+    if name == 'config':
+        base = {
+            'libraries': {'lib': dict(LIBRARY)},
+            'convert': {'alias': {'inputs': ['input.vcf'], 'file_type': 'vcf'}},
+        }
+    else:
+        base = {'reference.annotations': ['annotations.json']}
+    yield base
+    for prop in load_schema(name)['properties']:
+        for probe in PROBES:
+            config = copy.deepcopy(base)
+            config[prop] = probe
+            yield config
+    if name == 'config':
+        library_schema = load_schema(name)['properties']['libraries']['additionalProperties']
+        for prop in library_schema['properties']:
+            for probe in PROBES:
+                config = copy.deepcopy(base)
+                config['libraries']['lib'][prop] = probe
+                yield config
+
+
+def test_module_up_to_date():
+    # re-generate with python -m mavis_config.codegen if this fails
+    with open(MODULE_PATH, 'r') as fh:
+        assert fh.read() == generate_module()
+
+
+@pytest.mark.parametrize('name', ['config', 'overlay'])
+def test_same_result_as_jsonschema(name):
+    fast_validator = get_fast_validator(name)
+    for config in probe_configs(name):
+        fast_config = copy.deepcopy(config)
+        expected_config = copy.deepcopy(config)
+        valid = jsonschema_valid(expected_config, name)
+        assert fast_validator(fast_config) == valid, config
+        if valid:
+            # same defaults, set in the same order
+            assert list(fast_config.items()) == list(expected_config.items())
+        else:
+            assert fast_config == config
+
+
+@pytest.mark.parametrize(
+    'config,valid',
+    [
+        ({}, True),
+        ({'reference.aligner_reference': ['genome.2bit']}, True),
+        ({'skip_stage.validate': True, 'reference.aligner_reference': ['genome.2bit']}, False),
+        ({'skip_stage.validate': True}, True),
+        ({'libraries': {}}, False),
+        ({'libraries': {'lib': {**LIBRARY, 'other': 1}}}, False),
+        ({'libraries': {'lib': {'assign': ['input.tab']}}}, False),
+    ],
+)
+def test_schema_level_checks(config, valid):
+    assert get_fast_validator('config')(copy.deepcopy(config)) == valid
+    assert jsonschema_valid(copy.deepcopy(config), 'config') == valid
+
+
+def test_defaults_not_shared():
+    first = {}
+    second = {}
+    get_fast_validator('config')(first)
+    get_fast_validator('config')(second)
+    first['cluster.limit_to_chr'].append('MT')
+    assert 'MT' not in second['cluster.limit_to_chr']
+
+
+def test_stale_module_not_used(monkeypatch):
+    get_fast_validator.cache_clear()
+    monkeypatch.setattr(schema, 'schema_digest', lambda name: 'changed')
+    try:
+        assert get_fast_validator('config') is None
+        config = {}
+        validate_schema(config, 'config')
+        assert config['cluster.max_files'] == 200
+    finally:
+        get_fast_validator.cache_clear()
+
+
+def test_invalid_config_error_unchanged():
+    with pytest.raises(WorkflowError) as err:
+        validate_schema({'cluster.max_files': 'many'}, 'config')
+    assert "'many' is not of type 'integer'" in str(err.value)
@@ -0,0 +1,282 @@
+import gzip
+import os
+
+import pytest
+from mavis_config import counting
+from mavis_config.counting import (
+    DistinctCounter,
+    HyperLogLog,
+    RowCountCache,
+    count_rows_by_file,
+    count_total_rows,
+    iter_rows,
+    line_digest,
+)
+
+
+def reference_count(filenames):
+    # the original readlines/set implementation
+    row_count = 0
+    for filename in filenames:
+        opener = gzip.open if filename.endswith('.gz') else open
+        with opener(filename, 'rt') as fh:
+            row_count += len({l for l in fh.readlines() if not l.startswith('#') and l.strip()})
+    return row_count
+
+
+@pytest.fixture
+def plain_input(tmp_path):
+    p = tmp_path / 'input.tab'
+    lines = ['#header', 'a\tb', '', 'a\tb', '   ', 'c\td', '# comment', 'e\tf']
+    p.write_text('\n'.join(lines))  # no trailing newline on the last row
+    return str(p)
+
+
+@pytest.fixture
+def gzip_input(tmp_path):
+    p = tmp_path / 'input.tab.gz'
+    with gzip.open(str(p), 'wt') as fh:
+        for i in range(1000):
+            fh.write(f'row{i % 300}\tvalue\n')
+    return str(p)
+
+
+class TestIterRows:
+    def test_skips_comments_and_blanks(self, plain_input):
+        assert list(iter_rows(plain_input)) == ['a\tb\n', 'a\tb\n', 'c\td\n', 'e\tf']
+
+    def test_small_chunks(self, gzip_input):
+        assert len(list(iter_rows(gzip_input, chunk_size=16))) == 1000
+
+
+class TestCountTotalRows:
+    def test_matches_reference(self, plain_input, gzip_input):
+        filenames = [plain_input, gzip_input]
+        assert count_total_rows(filenames) == reference_count(filenames) == 303
+
+    def test_duplicates_counted_per_file(self, plain_input):
+        assert count_total_rows([plain_input, plain_input]) == 6
+
+    def test_approximate(self, gzip_input):
+        assert abs(count_total_rows([gzip_input], approximate=True) - 300) <= 3
+
+
+class TestLineDigest:
+    def test_fixed_width(self):
+        assert 0 <= line_digest('x' * 10000) < 2**64
+
+    def test_distinct(self):
+        assert line_digest('a\n') != line_digest('a')
+
+
+class TestHyperLogLog:
+    def test_error_bound(self):
+        counter = HyperLogLog()
+        counter.update(f'row{i}\n' for i in range(50000))
+        assert abs(counter.count() - 50000) / 50000 < 0.03
+
+    def test_merge(self):
+        first = HyperLogLog()
+        second = HyperLogLog()
+        first.update(str(i) for i in range(0, 6000))
+        second.update(str(i) for i in range(4000, 10000))
+        first.merge(second)
+        assert abs(first.count() - 10000) / 10000 < 0.03
+
+    def test_bad_precision(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=30)
+
+
+class TestDistinctCounter:
+    @pytest.fixture
+    def small_runs(self, monkeypatch):
+        monkeypatch.setattr(counting, 'DISTINCT_BUFFER_SIZE', 50)
+        monkeypatch.setattr(counting, 'RUN_FAN_IN', 3)
+        monkeypatch.setattr(counting, 'MERGE_SLICE_SIZE', 20)
+
+    def test_merge(self):
+        first = DistinctCounter()
+        second = DistinctCounter()
+        first.update(['1', '2', '3'])
+        second.update(['3', '4'])
+        first.merge(second)
+        assert first.count() == 4
+
+    def test_packed_runs(self, small_runs):
+        counter = DistinctCounter()
+        lines = [f'row{i % 1500}' for i in range(5000)] + [f'row{i}' for i in range(3000)]
+        for start in range(0, len(lines), 7):
+            counter.update(lines[start : start + 7])
+        assert counter.count() == 3000
+        assert counter.count() == 3000
+        assert list(counter.digests()) == sorted(set(map(hash, lines)))
+        counter.add('new')
+        assert counter.count() == 3001
+
+    def test_merge_packed_runs(self, small_runs):
+        first = DistinctCounter()
+        second = DistinctCounter()
+        first.update(str(i) for i in range(0, 600))
+        second.update(str(i) for i in range(400, 1000))
+        first.merge(second)
+        assert first.count() == 1000
+
+    def test_reached(self, small_runs):
+        counter = DistinctCounter()
+        counter.update(str(i) for i in range(30))
+        assert counter.reached(30) and not counter.reached(31)
+        for start in range(0, 1000, 10):
+            counter.update(str(i) for i in range(start, start + 10))
+        # a lower bound once the digests are packed into runs
+        assert counter.reached(200)
+        assert not counter.reached(1001)
+
+
+class TestParallelCountTotalRows:
+    def test_same_as_serial(self, plain_input, gzip_input):
+        filenames = [plain_input, gzip_input, plain_input]
+        assert count_total_rows(filenames, processes=2) == count_total_rows(filenames) == 306
+
+    def test_approximate_same_as_serial(self, plain_input, gzip_input):
+        filenames = [gzip_input, plain_input]
+        assert count_total_rows(filenames, approximate=True, processes=2) == count_total_rows(
+            filenames, approximate=True
+        )
+
+    def test_all_cores(self, plain_input):
+        assert count_total_rows([plain_input, plain_input], processes=None) == 6
+
+    def test_bad_processes(self, plain_input):
+        with pytest.raises(ValueError):
+            count_total_rows([plain_input], processes=0)
+
+
+class TestCountRowsByFile:
+    def test_distinct_files(self, plain_input, gzip_input):
+        counts = count_rows_by_file([plain_input, gzip_input, plain_input])
+        assert counts == {plain_input: 3, gzip_input: 300}
+
+    def test_parallel(self, plain_input, gzip_input):
+        filenames = [gzip_input, plain_input]
+        assert count_rows_by_file(filenames, processes=2) == count_rows_by_file(filenames)
+
+    def test_limit_per_file(self, tmp_path, plain_input, gzip_input):
+        cache = RowCountCache(str(tmp_path / 'cache.json'))
+        counts = count_rows_by_file([plain_input, gzip_input], cache=cache, limit=10)
+        assert counts[plain_input] == 3
+        assert counts[gzip_input] >= 10
+        assert cache.get(plain_input) == 3
+        assert cache.get(gzip_input) is None
+
+
+class TestRowCountCache:
+    def test_reuses_counts(self, tmp_path, plain_input):
+        cache = RowCountCache.for_output_dir(str(tmp_path / 'output'))
+        assert count_total_rows([plain_input], cache=cache) == 3
+        # re-load from disk and poison the count to check it is the cached value being used
+        cache = RowCountCache.for_output_dir(str(tmp_path / 'output'))
+        assert cache.get(plain_input) == 3
+        cache.set(plain_input, 100)
+        assert count_total_rows([plain_input], cache=cache) == 100
+
+    def test_not_rewritten_when_all_cached(self, tmp_path, plain_input):
+        path = str(tmp_path / 'cache.json')
+        count_total_rows([plain_input], cache=RowCountCache(path))
+        os.utime(path, ns=(0, 0))
+        assert count_total_rows([plain_input], cache=RowCountCache(path)) == 3
+        assert os.stat(path).st_mtime_ns == 0
+
+    def test_recounts_changed_file(self, tmp_path, plain_input):
+        cache = RowCountCache(str(tmp_path / 'cache.json'))
+        count_total_rows([plain_input], cache=cache)
+        with open(plain_input, 'a') as fh:
+            fh.write('\nnew\trow\n')
+        assert cache.get(plain_input) is None
+        assert count_total_rows([plain_input], cache=cache) == 4
+
+    def test_separate_approximate_counts(self, tmp_path, plain_input):
+        cache = RowCountCache(str(tmp_path / 'cache.json'))
+        cache.set(plain_input, 100, approximate=True)
+        assert cache.get(plain_input) is None
+
+    def test_evicts_least_recently_used(self, tmp_path, plain_input, gzip_input):
+        other_input = str(tmp_path / 'other.tab')
+        with open(other_input, 'w') as fh:
+            fh.write('x\n')
+        cache = RowCountCache(str(tmp_path / 'cache.json'), max_entries=2)
+        cache.set(plain_input, 1)
+        cache.set(gzip_input, 2)
+        cache.get(plain_input)
+        cache.set(other_input, 3)
+        assert len(cache) == 2
+        assert cache.get(gzip_input) is None
+        assert cache.get(plain_input) == 1
+
+    def test_corrupt_cache_ignored(self, tmp_path, plain_input):
+        path = tmp_path / 'cache.json'
+        path.write_text('{not json')
+        cache = RowCountCache(str(path))
+        assert count_total_rows([plain_input], cache=cache) == 3
+        assert RowCountCache(str(path)).get(plain_input) == 3
+
+
+class TestCountLimit:
+    @pytest.fixture
+    def large_input(self, tmp_path):
+        p = tmp_path / 'large.tab'
+        p.write_text(''.join(f'row{i}\n' for i in range(200000)))
+        return str(p)
+
+    def test_stops_early(self, large_input):
+        rows = count_total_rows([large_input], limit=10)
+        assert 10 <= rows < 200000
+
+    def test_stops_early_with_packed_runs(self, monkeypatch, large_input):
+        monkeypatch.setattr(counting, 'DISTINCT_BUFFER_SIZE', 50)
+        rows = count_total_rows([large_input], limit=1000)
+        assert 1000 <= rows < 200000
+
+    def test_exact_below_limit(self, plain_input, gzip_input):
+        assert count_total_rows([plain_input, gzip_input], limit=1000) == 303
+
+    def test_stops_after_first_file(self, large_input, tmp_path):
+        missing = str(tmp_path / 'does_not_exist.tab')
+        assert count_total_rows([large_input, missing], limit=10) >= 10
+
+    def test_parallel(self, large_input, plain_input):
+        assert count_total_rows([plain_input, large_input], limit=10, processes=2) >= 10
+
+    def test_partial_counts_not_cached(self, tmp_path, large_input):
+        cache = RowCountCache(str(tmp_path / 'cache.json'))
+        count_total_rows([large_input], limit=10, cache=cache)
+        assert cache.get(large_input) is None
+        assert count_total_rows([large_input], cache=cache) == 200000
+        assert cache.get(large_input) == 200000
+
+
+CONTENT_CASES = [
+    b'',
+    b'\n\n\n',
+    b'a\nb\na\n',
+    b'a\nb\na',  # the unterminated final line is distinct from 'a\n'
+    b'a\nb\n#a',
+    b'a\nb\n   ',
+    b'#header\na\n\n  \t\n\x1c\x1d\n\x0b\nb\n # not a comment\n',
+    'café\ncafé\n \n  \nnaïve'.encode('utf8'),
+]
+
+
+class TestSplitRows:
+    @pytest.mark.parametrize('content', CONTENT_CASES)
+    def test_matches_reference(self, tmp_path, content):
+        p = tmp_path / 'input.tab'
+        p.write_bytes(content)
+        assert len(set(counting._split_rows(content, 'utf-8'))) == reference_count([str(p)])
+        assert count_total_rows([str(p)]) == reference_count([str(p)])
+
+    @pytest.mark.parametrize('content', [b'a\r\nb\r\na\n', b'a\rb\n', b'a\n\xff\xfe\n'])
+    def test_falls_back(self, tmp_path, content):
+        # carriage returns are translated and invalid bytes raise, as in text mode
+        with pytest.raises(counting._FallBack):
+            counting._split_rows(content, 'utf-8')
@@ -0,0 +1,102 @@
+import gzip
+import random
+
+import pytest
+from mavis_config import guess_total_batches
+from mavis_config.estimate import estimate_file_rows, estimate_total_rows, gzip_uncompressed_size
+
+ROWS = 50000
+
+
+def random_lines(count, seed=1):
+    rand = random.Random(seed)
+    return ''.join(
+        f'chr{rand.randint(1, 22)}\t{rand.randint(1, 10 ** 8)}\t{"A" * rand.randint(1, 30)}\n'
+        for _ in range(count)
+    )
+
+
+@pytest.fixture
+def plain_input(tmp_path):
+    p = tmp_path / 'input.tab'
+    p.write_text('#header\n' + random_lines(ROWS))
+    return str(p)
+
+
+@pytest.fixture
+def gzip_input(tmp_path):
+    p = tmp_path / 'input.tab.gz'
+    with gzip.open(str(p), 'wt') as fh:
+        fh.write('#header\n' + random_lines(ROWS))
+    return str(p)
+
+
+@pytest.fixture
+def multi_member_input(tmp_path):
+    p = tmp_path / 'multi.tab.gz'
+    with open(str(p), 'wb') as fh:
+        for i in range(10):
+            fh.write(gzip.compress(random_lines(ROWS // 10, seed=i).encode()))
+    return str(p)
+
+
+@pytest.fixture
+def duplicated_input(tmp_path):
+    p = tmp_path / 'duplicated.tab'
+    p.write_text(random_lines(ROWS // 100) * 100)
+    return str(p)
+
+
+def assert_within(estimate, expected):
+    assert not estimate.exact
+    assert estimate.lower <= expected <= estimate.upper
+    assert abs(estimate.rows - expected) / expected < 0.1
+
+
+class TestEstimateFileRows:
+    def test_small_file_exact(self, plain_input):
+        estimate = estimate_file_rows(plain_input, samples=64)
+        assert estimate.exact
+        assert estimate.rows == ROWS
+
+    def test_plain(self, plain_input):
+        assert_within(estimate_file_rows(plain_input, samples=8, sample_size=4096), ROWS)
+
+    def test_gzip(self, gzip_input):
+        assert_within(estimate_file_rows(gzip_input, samples=8, sample_size=4096), ROWS)
+
+    def test_multi_member_gzip(self, multi_member_input):
+        assert_within(estimate_file_rows(multi_member_input, samples=8, sample_size=4096), ROWS)
+
+    def test_duplicates_counted_exactly(self, duplicated_input):
+        estimate = estimate_file_rows(duplicated_input, samples=8, sample_size=4096)
+        assert estimate.exact
+        assert estimate.rows == ROWS // 100
+
+    def test_isize(self, gzip_input, plain_input):
+        assert gzip_uncompressed_size(gzip_input) == len(open(plain_input, 'rb').read())
+
+
+def test_estimate_total_rows(plain_input, gzip_input):
+    estimate = estimate_total_rows([plain_input, gzip_input], samples=8, sample_size=4096)
+    assert estimate.lower <= ROWS * 2 <= estimate.upper
+
+
+class TestGuessTotalBatchesEstimate:
+    def test_above_max_files(self, plain_input):
+        config = {'cluster.min_clusters_per_file': 10, 'cluster.max_files': 100}
+        assert guess_total_batches(config, [plain_input], estimate=True) == 100
+
+    def test_below_max_files(self, plain_input):
+        config = {'cluster.min_clusters_per_file': 10000, 'cluster.max_files': 100}
+        assert guess_total_batches(config, [plain_input], estimate=True) == 5
+
+    def test_straddles_boundary(self, plain_input):
+        config = {'cluster.min_clusters_per_file': 500, 'cluster.max_files': 100}
+        assert guess_total_batches(config, [plain_input], estimate=True) == 100
+
+    def test_duplicates(self, duplicated_input):
+        config = {'cluster.min_clusters_per_file': 100, 'cluster.max_files': 100}
+        expected = guess_total_batches(config, [duplicated_input])
+        assert expected == 5
+        assert guess_total_batches(config, [duplicated_input], estimate=True) == expected
@@ -0,0 +1,137 @@
+import os
+from glob import glob
+
+import pytest
+from mavis_config.expand import ExpansionCache, bash_expands
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for dirname in ['a', 'b', 'a/nested', 'c.d']:
+        (tmp_path / dirname).mkdir()
+    for filename in ['a/1.tab', 'a/2.tab', 'a/.hidden.tab', 'b/1.tab', 'b/3.txt', 'top.tab']:
+        (tmp_path / filename).write_text('x')
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize(
+    'pattern',
+    [
+        '*',
+        '*/*.tab',
+        'a/*',
+        'a/.*',
+        '*/',
+        '[ab]/1.tab',
+        'a/1.tab',
+        'a/missing.tab',
+        'missing/*',
+        '*/nested',
+        'a/1.tab/*',
+        '?/*.t?t',
+        'a/',
+    ],
+)
+def test_matches_glob(tree, pattern):
+    pattern = os.path.join(tree, pattern)
+    assert ExpansionCache().glob(pattern) == glob(pattern)
+
+
+def test_relative_pattern(tree, monkeypatch):
+    monkeypatch.chdir(tree)
+    assert ExpansionCache().glob('*/*.tab') == glob('*/*.tab')
+
+
+def test_lists_each_directory_once(tree, scandir_calls):
+    cache = ExpansionCache()
+    bash_expands(os.path.join(tree, '{a,b}/1.tab'), cache=cache)
+    bash_expands(os.path.join(tree, '*/*.tab'), cache=cache)
+    bash_expands(os.path.join(tree, 'a/2.tab'), cache=cache)
+    assert len(scandir_calls) == len(set(scandir_calls))
+
+
+def test_invalidate(tree):
+    cache = ExpansionCache()
+    pattern = os.path.join(tree, 'b/*.tab')
+    assert len(cache.glob(pattern)) == 1
+    with open(os.path.join(tree, 'b', '2.tab'), 'w') as fh:
+        fh.write('x')
+    assert len(cache.glob(pattern)) == 1
+    cache.invalidate(os.path.join(tree, 'b'))
+    assert len(cache.glob(pattern)) == 2
+
+
+def test_invalidate_all(tree):
+    cache = ExpansionCache()
+    filename = os.path.join(tree, 'new.tab')
+    assert not cache.lexists(filename)
+    with open(filename, 'w') as fh:
+        fh.write('x')
+    cache.invalidate()
+    assert cache.lexists(filename)
+
+
+def test_searched_directories(tree):
+    cache = ExpansionCache()
+    cache.glob(os.path.join(tree, '*', '1.tab'))
+    # b/1.tab and a/1.tab exist so only the listed directory and the one missing 1.tab count
+    expected = [tree, os.path.join(tree, 'c.d')]
+    assert cache.searched_directories() == sorted(expected)
+
+
+def test_bash_expands_missing(tree):
+    with pytest.raises(FileNotFoundError):
+        bash_expands(os.path.join(tree, '{a,b}/*.bam'), cache=ExpansionCache())
+
+
+@pytest.fixture
+def batches(tmp_path):
+    for i in range(1, 51, 3):
+        batch = tmp_path / f'batch_{i:04d}'
+        batch.mkdir()
+        for j in range(3):
+            (batch / f'{j}.tab').write_text('x')
+    return str(tmp_path)
+
+
+@pytest.fixture
+def scandir_calls(monkeypatch):
+    calls = []
+    scandir = os.scandir
+
+    def counting_scandir(path):
+        calls.append(path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, 'scandir', counting_scandir)
+    return calls
+
+
+class TestGlobMany:
+    def test_matches_glob(self, tree):
+        patterns = [os.path.join(tree, p) for p in ['*/*.tab', 'a/1.tab', 'a/', '*', 'x/*', '']]
+        assert ExpansionCache().glob_many(patterns) == [glob(p) for p in patterns]
+
+    def test_root(self):
+        assert ExpansionCache().glob('/') == glob('/')
+
+    def test_brace_expansion(self, batches):
+        from braceexpand import braceexpand
+
+        expression = os.path.join(batches, 'batch_{0001..0050}/*.tab')
+        expected = [os.path.abspath(f) for n in braceexpand(expression) for f in glob(n)]
+        assert len(expected) == 17 * 3
+        assert bash_expands(expression) == expected
+
+    def test_prunes_missing_directories(self, batches, scandir_calls):
+        bash_expands(os.path.join(batches, 'batch_{0001..0050}/*.tab'))
+        # the parent directory plus each of the 17 existing batch directories
+        assert len(scandir_calls) == 18
+
+    def test_literal_path_does_not_list_parents(self, batches, scandir_calls):
+        bash_expands(os.path.join(batches, 'batch_0001', '0.tab'))
+        assert scandir_calls == []
+
+    def test_missing(self, batches):
+        with pytest.raises(FileNotFoundError):
+            bash_expands(os.path.join(batches, 'batch_{0002..0003}/*.tab'))
@@ -0,0 +1,65 @@
+from types import MappingProxyType
+
+import pytest
+from mavis_config import ConfigIndex, get_library_inputs, get_singularity_bindings
+
+
+@pytest.fixture
+def config():
+    return {
+        'output_dir': '/output',
+        'libraries': {
+            'lib1': {'assign': ['/data/a.tab', 'conv1'], 'bam_file': '/bams/lib1.bam'},
+            'lib2': {'assign': ['conv1', '/data/b.tab', '/data/b.tab']},
+        },
+        'convert': {'conv1': {'inputs': ['/raw/x.vcf', '/raw/y.vcf']}},
+        'reference.annotations': ['/ref/annotations.json'],
+        'reference.reference_genome': ['/ref/hg19.fa'],
+        'cluster.max_files': 200,
+        'cluster.min_clusters_per_file': 50,
+        'validate.min_call_complexity': 0.1,
+    }
+
+
+class TestConfigIndex:
+    def test_library_inputs(self, config):
+        index = ConfigIndex(config)
+        for library_name in config['libraries']:
+            assert list(index.library_inputs(library_name)) == get_library_inputs(
+                config, library_name
+            )
+            assert get_library_inputs(index, library_name) == get_library_inputs(
+                config, library_name
+            )
+
+    def test_libraries_using(self, config):
+        index = ConfigIndex(config)
+        assert index.libraries_using('conv1') == ('lib1', 'lib2')
+        assert index.libraries_using('/raw/x.vcf') == ('lib1', 'lib2')
+        assert index.libraries_using('/data/a.tab') == ('lib1',)
+        assert index.libraries_using('/data/b.tab') == ('lib2',)
+        assert index.libraries_using('/data/missing.tab') == ()
+
+    def test_sections(self, config):
+        index = ConfigIndex(config)
+        assert dict(index.section('cluster.')) == {'max_files': 200, 'min_clusters_per_file': 50}
+        assert dict(index.stage_settings('validate')) == {'min_call_complexity': 0.1}
+        assert dict(index.stage_settings('annotate')) == {}
+        assert isinstance(index.section('cluster.'), MappingProxyType)
+        with pytest.raises(KeyError):
+            index.stage_settings('not_a_stage')
+
+    def test_read_only_mapping(self, config):
+        index = ConfigIndex(config)
+        assert index['output_dir'] == '/output'
+        assert len(index) == len(config)
+        assert dict(index) == config
+        with pytest.raises(TypeError):
+            index['output_dir'] = '/other'
+
+    def test_singularity_bindings(self, config):
+        index = ConfigIndex(config)
+        assert get_singularity_bindings(index) == get_singularity_bindings(config)
+        assert get_singularity_bindings(index, max_binds=1) == get_singularity_bindings(
+            config, max_binds=1
+        )
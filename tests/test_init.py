@@ -1,12 +1,21 @@
+import subprocess
+import sys
+
 import pytest
 from mavis_config import (
     DEFAULTS,
+    ConfigIndex,
+    ImmutableDict,
+    _saturation_rows,
     get_by_prefix,
     get_library_inputs,
     get_singularity_bindings,
+    guess_cohort_batches,
     guess_total_batches,
 )
 
+from mavis_config.counting import RowCountCache
+
 from .util import package_path
 
 
@@ -74,6 +83,55 @@ class TestGuessTotalBatches:
         )
         assert batches == 8
 
+    def test_parallel_counting(self, library_input):
+        batches = guess_total_batches(
+            {'cluster.min_clusters_per_file': 100, 'cluster.max_files': 100},
+            [library_input, library_input],
+            processes=2,
+        )
+        assert batches == 16
+
+
+class TestGuessCohortBatches:
+    @pytest.fixture
+    def cohort(self, tmp_path, library_input):
+        other = tmp_path / 'other.txt'
+        other.write_text(''.join(f'{i}\n' for i in range(250)))
+        return {
+            'cluster.min_clusters_per_file': 100,
+            'cluster.max_files': 10,
+            'libraries': {
+                'first': {'assign': [library_input, 'conversion_alias']},
+                'second': {'assign': [str(other)]},
+                'third': {'assign': ['conversion_alias', str(other)]},
+            },
+            'convert': {'conversion_alias': {'inputs': [library_input]}},
+        }
+
+    def test_same_as_per_library(self, cohort):
+        expected = {
+            name: guess_total_batches(cohort, get_library_inputs(cohort, name))
+            for name in cohort['libraries']
+        }
+        assert guess_cohort_batches(cohort) == expected == {'first': 10, 'second': 3, 'third': 10}
+
+    def test_parallel(self, cohort):
+        assert guess_cohort_batches(cohort, processes=2) == guess_cohort_batches(cohort)
+
+    def test_counts_shared_inputs_once(self, tmp_path, cohort, library_input):
+        cache = RowCountCache(str(tmp_path / 'cache.json'))
+        cohort['cluster.max_files'] = 100
+        guess_cohort_batches(cohort, cache=cache)
+        assert len(cache) == 2
+        assert cache.get(library_input) == 800
+
+
+@pytest.mark.parametrize('max_files,min_rows', [(1, 1), (100, 1), (100, 50), (7, 3), (200, 2)])
+def test_saturation_rows(max_files, min_rows):
+    threshold = _saturation_rows(max_files, min_rows)
+    assert round(threshold / max_files) >= min_rows
+    assert threshold == 0 or round((threshold - 1) / max_files) < min_rows
+
 
 @pytest.fixture
 def bindings(library_input):
@@ -123,3 +181,108 @@ class TestGetSingularityBindings:
 
     def test_no_ro_output_subdirs(self, bindings):
         assert '/output_dir/but/yet/another:/output_dir/but/yet/another:ro' not in bindings
+
+    def test_output_dir_first(self, bindings):
+        assert bindings[0] == '/output_dir:/output_dir'
+
+    def test_no_duplicates(self, bindings):
+        assert len(bindings) == len(set(bindings))
+
+
+def test_import_does_not_load_snakemake():
+    code = (
+        'import sys, mavis_config; print("snakemake" in sys.modules, "braceexpand" in sys.modules)'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', code], check=True, stdout=subprocess.PIPE, universal_newlines=True
+    )
+    assert result.stdout.strip() == 'False False'
+
+
+def test_defaults_match_snakemake_validate():
+    from snakemake.utils import validate as snakemake_validate
+
+    expected = {}
+    snakemake_validate(expected, package_path('src/mavis_config/config.json'), set_default=True)
+    assert dict(DEFAULTS) == expected
+
+
+class TestGetSingularityBindingsMinimal:
+    @pytest.fixture
+    def config(self):
+        return {
+            'reference.annotations': ['/ref/annotations/somefile.txt'],
+            'reference.masking': ['/ref/somefile.txt'],
+            'libraries': {
+                f'lib{i}': {
+                    'assign': [f'/data/batch/{i}/file.tab', f'/output_dir2/{i}.tab'],
+                    'bam_file': f'/bams/{i}/lib.bam',
+                }
+                for i in range(10)
+            },
+            'output_dir': '/output_dir',
+        }
+
+    def test_nested_directories_collapsed(self, config):
+        assert get_singularity_bindings(config) == [
+            '/output_dir:/output_dir',
+            *[f'/bams/{i}:/bams/{i}:ro' for i in range(10)],
+            *[f'/data/batch/{i}:/data/batch/{i}:ro' for i in range(10)],
+            '/output_dir2:/output_dir2:ro',
+            '/ref:/ref:ro',
+        ]
+
+    def test_max_binds(self, config):
+        assert get_singularity_bindings(config, max_binds=4) == [
+            '/output_dir:/output_dir',
+            '/bams:/bams:ro',
+            '/data/batch:/data/batch:ro',
+            '/output_dir2:/output_dir2:ro',
+            '/ref:/ref:ro',
+        ]
+
+    def test_max_binds_does_not_cover_output_dir(self):
+        config = {
+            'libraries': {
+                name: {'assign': [f'/data/{name}/file.tab'], 'bam_file': f'/data/{name}/lib.bam'}
+                for name in ['a', 'b', 'c']
+            },
+            'output_dir': '/data/out',
+        }
+        assert get_singularity_bindings(config, max_binds=1) == [
+            '/data/out:/data/out',
+            '/data/a:/data/a:ro',
+            '/data/b:/data/b:ro',
+            '/data/c:/data/c:ro',
+        ]
+
+
+class TestSections:
+    def test_section_is_shared_view(self):
+        section = DEFAULTS.section('bam_stats.')
+        assert section is DEFAULTS.section('bam_stats.')
+        assert dict(section) == get_by_prefix(dict(DEFAULTS), 'bam_stats.')
+        with pytest.raises(TypeError):
+            section['sample_size'] = 1
+
+    def test_get_by_prefix_uses_index(self):
+        assert get_by_prefix(DEFAULTS, 'cluster.') is DEFAULTS.section('cluster.')
+
+    def test_prefix_repeated_in_key(self):
+        config = {'a.b.a.c': 1, 'a.d': 2, 'b.a.e': 3}
+        assert get_by_prefix(config, 'a.') == {'b.a.c': 1, 'd': 2}
+        indexed = ImmutableDict(config)
+        assert dict(indexed.section('a.')) == {'b.a.c': 1, 'd': 2}
+        assert dict(indexed.section('a.b.')) == {'a.c': 1}
+        assert dict(indexed.section('missing.')) == {}
+
+    def test_non_section_prefix(self):
+        indexed = ImmutableDict({'cluster.max_files': 1, 'clusters': 2, 'other': 3})
+        assert dict(indexed.section('cluster')) == {'.max_files': 1, 's': 2}
+
+    def test_non_section_prefix_config_index(self):
+        config = {'cluster.max_files': 1, 'clusters': 2, 'other': 3}
+        expected = {'.max_files': 1, 's': 2}
+        assert dict(ConfigIndex(config).section('cluster')) == expected
+        assert dict(get_by_prefix(ConfigIndex(config), 'cluster')) == expected
+        assert get_by_prefix(config, 'cluster') == expected
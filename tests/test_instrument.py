@@ -0,0 +1,83 @@
+import gzip
+import os
+
+import pytest
+from mavis_config import DEFAULTS, bash_expands, guess_total_batches, record, validate_config
+from mavis_config.counting import iter_row_chunks
+from mavis_config.instrument import _NULL_TIMER, PhaseEvent, count, phase
+
+from .util import package_path
+
+EXISTING_FILE = package_path('src/mavis_config/overlay.json')
+
+
+def test_disabled_is_noop():
+    assert phase('anything') is _NULL_TIMER
+    with record() as recorder:
+        pass
+    count('anything', files=1)
+    assert recorder.phases == {}
+
+
+def test_phase_and_counts():
+    events = []
+    with record(events.append) as recorder:
+        with phase('a'):
+            count('a', files=2, stats=3, bytes_read=4)
+        with phase('a'):
+            pass
+    stats = recorder.phases['a']
+    assert stats.calls == 2
+    assert stats.seconds >= 0
+    assert (stats.files, stats.stats, stats.bytes_read) == (2, 3, 4)
+    assert len(events) == 3
+    assert all(isinstance(e, PhaseEvent) for e in events)
+
+
+def test_nested_recorders():
+    with record() as outer:
+        with record() as inner:
+            count('a', files=1)
+        count('a', files=1)
+    assert outer.phases['a'].files == 2
+    assert inner.phases['a'].files == 1
+
+
+def test_bash_expands():
+    with record() as recorder:
+        result = bash_expands(os.path.join(os.path.dirname(EXISTING_FILE), '*.json'))
+    stats = recorder.phases['bash_expands']
+    assert stats.calls == 1
+    assert stats.files == len(result)
+    assert stats.stats >= 1
+
+
+def test_validate_config_phases():
+    with record() as recorder:
+        validate_config({'reference.annotations': [EXISTING_FILE]}, stage='overlay')
+    assert {'validate_config', 'validate_config.schema', 'validate_config.files'} <= set(
+        recorder.phases
+    )
+    assert recorder.as_dict()['validate_config']['calls'] == 1
+
+
+def test_guess_total_batches_reads(tmp_path):
+    filename = tmp_path / 'rows.tab'
+    filename.write_text('#header\n' + ''.join(f'{i}\n' for i in range(100)))
+    with record() as recorder:
+        guess_total_batches(DEFAULTS, [str(filename)])
+    assert recorder.phases['guess_total_batches'].calls == 1
+    assert recorder.phases['count_total_rows'].files == 1
+    assert recorder.phases['read_rows'].files == 1
+    assert recorder.phases['read_rows'].bytes_read == os.path.getsize(filename)
+
+
+@pytest.mark.parametrize('suffix', ['.tab', '.tab.gz'])
+def test_bytes_read_counts_bytes(tmp_path, suffix):
+    data = ''.join(f'{i}\tcafé\n' for i in range(1000)).encode('utf8')
+    filename = str(tmp_path / f'rows{suffix}')
+    with open(filename, 'wb') as fh:
+        fh.write(gzip.compress(data) if suffix.endswith('.gz') else data)
+    with record() as recorder:
+        list(iter_row_chunks(filename, chunk_size=1024))
+    assert recorder.phases['read_rows'].bytes_read == len(data)
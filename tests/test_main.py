@@ -0,0 +1,46 @@
+import json
+
+import pytest
+from mavis_config.main import main
+
+from .util import package_path
+
+EXISTING_FILE = package_path('src/mavis_config/overlay.json')
+
+
+@pytest.fixture
+def configs(tmp_path):
+    valid = tmp_path / 'valid.json'
+    valid.write_text(json.dumps({'reference.annotations': [EXISTING_FILE]}))
+    invalid = tmp_path / 'invalid.json'
+    invalid.write_text(json.dumps({'reference.annotations': ['/does/not/exist']}))
+    malformed = tmp_path / 'malformed.json'
+    malformed.write_text('{')
+    return [str(valid), str(invalid), str(malformed)]
+
+
+def test_report(configs, tmp_path):
+    report_file = tmp_path / 'report.json'
+    exit_code = main(configs + ['--stage', 'overlay', '-j', '2', '-o', str(report_file)])
+    report = json.loads(report_file.read_text())
+    assert exit_code == 1
+    assert report['stage'] == 'overlay'
+    assert report['total'] == 3
+    assert report['failed'] == 2
+    assert [r['config'] for r in report['results']] == configs
+    assert [r['status'] for r in report['results']] == ['pass', 'fail', 'fail']
+    assert report['results'][0]['error'] is None
+    assert report['results'][1]['error'].startswith('FileNotFoundError')
+    assert report['results'][2]['error'].startswith('JSONDecodeError')
+    assert all(r['duration'] >= 0 for r in report['results'])
+
+
+def test_all_valid_stdout(configs, capsys):
+    exit_code = main(configs[:1] + ['--stage', 'overlay', '-j', '1'])
+    assert exit_code == 0
+    assert json.loads(capsys.readouterr().out)['failed'] == 0
+
+
+def test_bad_stage(configs):
+    with pytest.raises(SystemExit):
+        main(configs + ['--stage', 'other'])
@@ -0,0 +1,139 @@
+import gzip
+import json
+
+import pytest
+from mavis_config import BatchPlan, count_total_rows, guess_total_batches, plan_batches
+from mavis_config.plan import iter_shard_lines
+from mavis_config.schema import validate_schema
+from snakemake.exceptions import WorkflowError
+
+CONFIG = {'cluster.max_files': 4, 'cluster.min_clusters_per_file': 50}
+
+
+def read_shards(shards):
+    lines = []
+    for shard in shards:
+        lines.extend(iter_shard_lines(shard))
+    return lines
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    first = tmp_path / 'first.tab'
+    first.write_text(
+        '#header\n' + ''.join(f'row{i % 250}\tx\n' if i % 9 else '\n' for i in range(400))
+    )
+    second = tmp_path / 'second.tab.gz'
+    with gzip.open(str(second), 'wt') as fh:
+        fh.write('#header\n')
+        for i in range(300):
+            fh.write(f'other{i}\ty\n')
+    return [str(first), str(second)]
+
+
+class TestPlanBatches:
+    def test_totals(self, inputs):
+        plan = plan_batches(CONFIG, inputs)
+        assert plan.total_rows == count_total_rows(inputs) == 539
+        assert plan.total_batches == guess_total_batches(CONFIG, inputs) == 4
+        assert sum(shard.rows for shard in plan.shards) == plan.total_rows
+
+    def test_shards_cover_inputs(self, inputs):
+        plan = plan_batches(CONFIG, inputs)
+        for filename in inputs:
+            shards = [s for s in plan.shards if s.filename == filename]
+            assert shards[0].start == 0
+            for previous, shard in zip(shards, shards[1:]):
+                assert previous.end == shard.start
+            opener = gzip.open if filename.endswith('.gz') else open
+            with opener(filename, 'rt') as fh:
+                content = fh.read()
+            assert shards[-1].end == len(content.encode())
+            assert ''.join(read_shards(shards)) == content
+
+    @pytest.mark.parametrize('newline', ['\r', '\r\n', '\n\r'])
+    def test_universal_newlines(self, tmp_path, newline):
+        p = tmp_path / 'input.tab'
+        p.write_bytes(
+            ''.join(
+                f'row{i % 250}{newline}' if i % 9 else f'#c{newline}' for i in range(400)
+            ).encode()
+        )
+        filename = str(p)
+        plan = plan_batches(CONFIG, [filename])
+        assert plan.total_rows == count_total_rows([filename])
+        assert plan.total_batches == guess_total_batches(CONFIG, [filename]) > 1
+        with open(filename, 'rt') as fh:
+            lines = fh.readlines()
+        assert read_shards(plan.shards) == lines
+        seen = set()
+        for shard in plan.shards:
+            rows = {l for l in iter_shard_lines(shard) if not l.startswith('#') and l.strip()}
+            assert len(rows - seen) == shard.rows
+            seen.update(rows)
+
+    def test_trailing_lines_after_split(self, tmp_path):
+        # the first file ends on a batch boundary followed by lines which are not new rows
+        first = tmp_path / 'first.tab'
+        first.write_text(''.join(f'row{i}\n' for i in range(100)) + '#c\nrow0\n\n')
+        second = tmp_path / 'second.tab'
+        second.write_text(''.join(f'other{i}\n' for i in range(100)))
+        inputs = [str(first), str(second)]
+        plan = plan_batches(CONFIG, inputs)
+        assert plan.total_batches == 4
+        shards = [s for s in plan.shards if s.filename == inputs[0]]
+        assert shards[-1].end == first.stat().st_size
+        assert ''.join(read_shards(shards)) == first.read_text()
+
+    def test_balanced(self, inputs):
+        plan = plan_batches(CONFIG, inputs)
+        rows = [sum(s.rows for s in plan.batch(b)) for b in range(plan.total_batches)]
+        assert len(rows) == 4
+        assert max(rows) - min(rows) <= 10  # split points every min_clusters_per_file / 10 rows
+
+    def test_batch_rows_match_shard_ranges(self, inputs):
+        plan = plan_batches(CONFIG, inputs)
+        seen = {filename: set() for filename in inputs}
+        for shard in plan.shards:
+            rows = 0
+            for line in iter_shard_lines(shard):
+                if line.startswith('#') or not line.strip() or line in seen[shard.filename]:
+                    continue
+                seen[shard.filename].add(line)
+                rows += 1
+            assert rows == shard.rows
+
+    def test_parallel(self, inputs):
+        assert plan_batches(CONFIG, inputs, processes=2) == plan_batches(CONFIG, inputs)
+
+    def test_single_batch(self, inputs):
+        plan = plan_batches({**CONFIG, 'cluster.min_clusters_per_file': 1000}, inputs)
+        assert plan.total_batches == 1
+        assert [(s.batch, s.start) for s in plan.shards] == [(0, 0), (0, 0)]
+
+    def test_empty(self, tmp_path):
+        p = tmp_path / 'empty.tab'
+        p.write_text('#header\n')
+        assert plan_batches(CONFIG, [str(p)]) == BatchPlan(0, 0, [])
+
+    def test_round_trip(self, inputs):
+        plan = plan_batches(CONFIG, inputs)
+        assert BatchPlan.from_dict(json.loads(json.dumps(plan.to_dict()))) == plan
+
+    def test_shards_in_config_schema(self, inputs):
+        plan = plan_batches(CONFIG, inputs)
+        config = {
+            'libraries': {
+                'lib': {
+                    'assign': inputs,
+                    'disease_status': 'normal',
+                    'protocol': 'genome',
+                    'total_batches': plan.total_batches,
+                    'shards': plan.to_dict()['shards'],
+                }
+            }
+        }
+        validate_schema(config, 'config')
+        config['libraries']['lib']['shards'][0]['start'] = -1
+        with pytest.raises(WorkflowError):
+            validate_schema(config, 'config')
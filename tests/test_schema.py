@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from mavis_config.schema import get_validator, load_schema, schema_name, validate_schema
+from snakemake.exceptions import WorkflowError
+from snakemake.utils import validate as snakemake_validate
+
+from .util import package_path
+
+
+@pytest.fixture
+def invalid_config():
+    return {
+        'reference.annotations': ['somefile'],
+        'skip_stage.validate': True,
+        'libraries': {'AAAA': {'protocol': 'genome'}},
+    }
+
+
+class TestSchemaName:
+    def test_overlay(self):
+        assert schema_name('overlay') == 'overlay'
+
+    def test_other_stages(self):
+        assert schema_name('setup') == 'config'
+        assert schema_name('cluster') == 'config'
+
+
+class TestGetValidator:
+    def test_reused_between_calls(self):
+        assert get_validator('config') is get_validator('config')
+
+    def test_separate_per_schema(self):
+        assert get_validator('config') is not get_validator('overlay')
+
+    def test_thread_safe(self):
+        with ThreadPoolExecutor(8) as pool:
+            validators = list(pool.map(get_validator, ['overlay'] * 32))
+        assert all(v is validators[0] for v in validators)
+
+
+class TestValidateSchema:
+    def test_sets_defaults(self):
+        config = {'reference.annotations': ['somefile']}
+        validate_schema(config, 'overlay')
+        assert config['illustrate.breakpoint_color'] == '#000000'
+
+    def test_defaults_not_shared_with_schema(self):
+        config = {}
+        validate_schema(config, 'config')
+        config['annotate.annotation_filters'].append('something')
+        schema = load_schema('config')
+        assert 'something' not in schema['properties']['annotate.annotation_filters']['default']
+
+    def test_same_error_as_snakemake(self, invalid_config):
+        with pytest.raises(WorkflowError) as expected:
+            snakemake_validate(invalid_config, package_path('src/mavis_config/config.json'))
+        with pytest.raises(WorkflowError) as err:
+            validate_schema(invalid_config, 'config')
+        assert str(err.value) == str(expected.value)
@@ -0,0 +1,150 @@
+import copy
+import json
+import os
+
+import pytest
+from mavis_config import export_stage_configs, get_by_prefix, load_stage_config, validate_config
+from mavis_config.constants import SUBCOMMAND
+from mavis_config.schema import validate_schema
+from mavis_config.stage_config import stage_config, stage_config_path
+
+
+@pytest.fixture
+def config():
+    config = {
+        'output_dir': 'output',
+        'reference.annotations': ['annotations.json'],
+        'libraries': {
+            'lib1': {
+                'assign': ['lib1.tab', 'alias'],
+                'disease_status': 'normal',
+                'protocol': 'genome',
+            },
+            'lib2': {'assign': ['lib2.tab'], 'disease_status': 'diseased', 'protocol': 'genome'},
+        },
+        'convert': {
+            'alias': {'inputs': ['input.vcf'], 'file_type': 'vcf'},
+            'other': {'inputs': ['other.vcf'], 'file_type': 'vcf'},
+        },
+    }
+    validate_schema(config, 'config')
+    return config
+
+
+class TestStageConfig:
+    def test_only_stage_and_library(self, config):
+        result = stage_config(config, SUBCOMMAND.CLUSTER, 'lib1')
+        assert list(result['libraries']) == ['lib1']
+        assert list(result['convert']) == ['alias']
+        assert result['cluster.max_files'] == config['cluster.max_files']
+        assert result['output_dir'] == 'output'
+        assert result['reference.annotations'] == ['annotations.json']
+        assert 'skip_stage.validate' in result
+        assert not get_by_prefix(result, 'validate.')
+        assert not get_by_prefix(result, 'annotate.')
+
+    def test_annotate_includes_illustrate(self, config):
+        result = stage_config(config, SUBCOMMAND.ANNOTATE, 'lib2')
+        assert get_by_prefix(result, 'illustrate.') == get_by_prefix(config, 'illustrate.')
+        assert result['convert'] == {}
+
+    def test_still_valid(self, config):
+        result = stage_config(config, SUBCOMMAND.VALIDATE, 'lib1')
+        validate_schema(result, 'config')
+
+    def test_not_per_library_stage(self, config):
+        with pytest.raises(ValueError):
+            stage_config(config, SUBCOMMAND.PAIR, 'lib1')
+
+
+class TestExportStageConfigs:
+    def test_round_trip(self, tmp_path, config):
+        paths = export_stage_configs(config, str(tmp_path))
+        assert len(paths) == 6
+        path = paths[(SUBCOMMAND.CLUSTER, 'lib2')]
+        assert path == stage_config_path(str(tmp_path), SUBCOMMAND.CLUSTER, 'lib2')
+        assert load_stage_config(path) == stage_config(config, SUBCOMMAND.CLUSTER, 'lib2')
+
+    def test_unchanged_files_not_rewritten(self, tmp_path, config):
+        paths = export_stage_configs(config, str(tmp_path), stages=[SUBCOMMAND.CLUSTER])
+        path = paths[(SUBCOMMAND.CLUSTER, 'lib1')]
+        os.utime(path, ns=(0, 0))
+        export_stage_configs(config, str(tmp_path), stages=[SUBCOMMAND.CLUSTER])
+        assert os.stat(path).st_mtime_ns == 0
+        config['cluster.max_files'] = 5
+        export_stage_configs(config, str(tmp_path), stages=[SUBCOMMAND.CLUSTER])
+        assert os.stat(path).st_mtime_ns != 0
+        assert load_stage_config(path)['cluster.max_files'] == 5
+
+    def test_selected_libraries(self, tmp_path, config):
+        paths = export_stage_configs(config, str(tmp_path), libraries=['lib2'])
+        assert sorted(paths) == [(stage, 'lib2') for stage in ['annotate', 'cluster', 'validate']]
+
+
+class TestLoadStageConfig:
+    def test_not_stage_config(self, tmp_path):
+        path = tmp_path / 'config.json'
+        path.write_text(json.dumps({'output_dir': 'output'}))
+        with pytest.raises(ValueError):
+            load_stage_config(str(path))
+
+    def test_revalidated_for_other_schema(self, tmp_path, config):
+        path = export_stage_configs(config, str(tmp_path), stages=[SUBCOMMAND.CLUSTER])[
+            (SUBCOMMAND.CLUSTER, 'lib1')
+        ]
+        with open(path, 'r') as fh:
+            data = json.load(fh)
+        data['schema'] = 'older'
+        del data['config']['cluster.max_files']
+        with open(path, 'w') as fh:
+            json.dump(data, fh)
+        assert load_stage_config(path)['cluster.max_files'] == 200
+
+
+class TestMatchesStageValidation:
+    @pytest.fixture
+    def project(self, tmp_path):
+        paths = {}
+        for name in [
+            'annotations.json',
+            'genome.fa',
+            'aligner.2bit',
+            'lib.tab',
+            'lib.bam',
+            'in.vcf',
+        ]:
+            paths[name] = str(tmp_path / name)
+            with open(paths[name], 'w') as fh:
+                fh.write('\n')
+        return {
+            'output_dir': str(tmp_path / 'output'),
+            'reference.annotations': [paths['annotations.json']],
+            'reference.reference_genome': [paths['genome.fa']],
+            'reference.aligner_reference': [paths['aligner.2bit']],
+            'libraries': {
+                'lib': {
+                    'assign': [paths['lib.tab'], 'alias'],
+                    'bam_file': paths['lib.bam'],
+                    'disease_status': 'normal',
+                    'protocol': 'genome',
+                }
+            },
+            'convert': {'alias': {'inputs': [paths['in.vcf']], 'file_type': 'vcf'}},
+        }
+
+    @pytest.mark.parametrize(
+        'stage', [SUBCOMMAND.CLUSTER, SUBCOMMAND.VALIDATE, SUBCOMMAND.ANNOTATE]
+    )
+    def test_exported_after_setup(self, tmp_path, project, stage):
+        setup_config = copy.deepcopy(project)
+        validate_config(setup_config, stage=SUBCOMMAND.SETUP)
+        paths = export_stage_configs(setup_config, str(tmp_path / 'stages'), stages=[stage])
+        exported = load_stage_config(paths[(stage, 'lib')])
+
+        expected = copy.deepcopy(project)
+        validate_config(expected, stage=stage)
+        assert exported['libraries'] == expected['libraries']
+        assert exported['libraries']['lib']['assign'][1].endswith('converted_outputs/alias.tab')
+        for key, value in exported.items():
+            if key not in {'libraries', 'convert'}:
+                assert value == expected[key], key
@@ -0,0 +1,67 @@
+import pickle
+
+import pytest
+from mavis_config import DEFAULTS, typed_config
+from mavis_config.typed import config_class
+
+
+@pytest.fixture
+def config():
+    return {
+        'libraries': {'lib1': {'assign': ['input.tab'], 'disease_status': 'normal'}},
+        'output_dir': 'output',
+        'cluster.max_files': 10,
+        'reference.annotations': ['annotations.json'],
+    }
+
+
+class TestTypedConfig:
+    def test_attribute_access(self, config):
+        cfg = typed_config(config)
+        assert cfg.cluster.max_files == 10
+        assert cfg.cluster.min_clusters_per_file == DEFAULTS['cluster.min_clusters_per_file']
+        assert cfg.output_dir == 'output'
+        assert cfg.reference.annotations == ['annotations.json']
+
+    def test_slotted(self, config):
+        cfg = typed_config(config)
+        assert not hasattr(cfg, '__dict__')
+        assert not hasattr(cfg.validate, '__dict__')
+        with pytest.raises(AttributeError):
+            cfg.cluster.not_a_setting = 1
+
+    def test_unset_optional(self, config):
+        cfg = typed_config(config)
+        with pytest.raises(AttributeError):
+            cfg.reference.reference_genome
+        assert 'reference.reference_genome' not in cfg.to_dict()
+
+    def test_dict_round_trip(self, config):
+        cfg = typed_config(config)
+        assert cfg.to_dict() == {**DEFAULTS, **config}
+        assert typed_config(cfg.to_dict()) == cfg
+
+    def test_without_defaults(self, config):
+        assert typed_config(config, defaults=False).to_dict() == config
+
+    def test_unknown_setting(self, config):
+        config['cluster.not_a_setting'] = 1
+        with pytest.raises(KeyError):
+            typed_config(config)
+        with pytest.raises(KeyError):
+            typed_config({'not_a_section.setting': 1})
+
+    def test_pickle(self, config):
+        cfg = typed_config(config)
+        data = pickle.dumps(cfg)
+        assert pickle.loads(data) == cfg
+        assert len(data) < len(pickle.dumps(cfg.to_dict()))
+
+    def test_class_cached(self):
+        assert config_class('config') is config_class('config')
+        assert config_class('overlay') is not config_class('config')
+
+    def test_overlay(self):
+        cfg = typed_config({'illustrate.width': 1000}, schema='overlay')
+        assert cfg.illustrate.width == 1000
+        assert pickle.loads(pickle.dumps(cfg)) == cfg
@@ -154,3 +154,46 @@ class TestSetup:
         )
         assert conf['libraries']['AAAA']['assign'] == ['dlly']
         assert conf['convert']['dlly']['inputs'] == [main, overlay]
+
+
+class TestBamFiles:
+    @pytest.fixture
+    def config(self):
+        return {
+            'reference.annotations': [EXISTING_FILE],
+            'reference.aligner_reference': [EXISTING_FILE],
+            'reference.reference_genome': [EXISTING_FILE],
+            'libraries': {
+                name: {
+                    'disease_status': 'diseased',
+                    'protocol': 'genome',
+                    'assign': [EXISTING_FILE],
+                    'bam_file': EXISTING_FILE,
+                }
+                for name in ['AAAA', 'BBBB', 'CCCC', 'DDDD']
+            },
+        }
+
+    def test_ok(self, config):
+        with not_raises(FileNotFoundError):
+            validate_config(config, stage='setup')
+
+    @pytest.mark.parametrize('io_threads', [1, 4])
+    def test_first_missing_library_reported(self, config, io_threads):
+        config['libraries']['BBBB']['bam_file'] = '/does/not/exist.bam'
+        del config['libraries']['DDDD']['bam_file']
+        with pytest.raises(FileNotFoundError) as err:
+            validate_config(config, stage='setup', io_threads=io_threads)
+        assert 'missing bam file for library (BBBB)' in str(err.value)
+
+    def test_missing_assignment_before_bam(self, config):
+        config['libraries']['CCCC']['bam_file'] = '/does/not/exist.bam'
+        config['libraries']['BBBB']['assign'] = ['/does/not/exist.tab']
+        with pytest.raises(FileNotFoundError) as err:
+            validate_config(config, stage='setup')
+        assert 'cannot find the expected input file /does/not/exist.tab' in str(err.value)
+
+    def test_missing_reference(self, config):
+        config['reference.masking'] = ['/does/not/exist.tab']
+        with pytest.raises(FileNotFoundError):
+            validate_config(config, stage='setup')
@@ -0,0 +1,119 @@
+import copy
+import os
+
+import mavis_config
+import pytest
+from mavis_config import validate_config
+from mavis_config.validation_cache import ValidationCache
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    data = tmp_path / 'data'
+    data.mkdir()
+    for name in ['a.tab', 'b.tab', 'annotations.json']:
+        (data / name).write_text('x')
+    return str(data)
+
+
+@pytest.fixture
+def config(inputs):
+    return {
+        'reference.annotations': [os.path.join(inputs, 'annotations.json')],
+        'skip_stage.validate': True,
+        'libraries': {
+            'AAAA': {
+                'disease_status': 'diseased',
+                'protocol': 'genome',
+                'assign': [os.path.join(inputs, '*.tab')],
+            }
+        },
+    }
+
+
+@pytest.fixture
+def no_validation(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('expected the cached result to be used')
+
+    monkeypatch.setattr(mavis_config, '_validate_config', fail)
+
+
+def validated(config, cache, stage='setup'):
+    config = copy.deepcopy(config)
+    validate_config(config, stage=stage, result_cache=cache)
+    return config
+
+
+def touch_later(path):
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class TestValidationCache:
+    def test_reuses_result(self, config, request):
+        cache = ValidationCache()
+        expected = validated(config, cache)
+        request.getfixturevalue('no_validation')
+        assert validated(config, cache) == expected
+        assert len(expected['libraries']['AAAA']['assign']) == 2
+
+    def test_different_stage(self, config):
+        cache = ValidationCache()
+        validated(config, cache)
+        assert cache.get(config, 'cluster') is None
+        assert cache.get(config, 'setup') is not None
+
+    def test_changed_file(self, config, inputs):
+        cache = ValidationCache()
+        validated(config, cache)
+        touch_later(os.path.join(inputs, 'a.tab'))
+        assert cache.get(config, 'setup') is None
+
+    def test_new_file_matching_glob(self, config, inputs):
+        cache = ValidationCache()
+        validated(config, cache)
+        with open(os.path.join(inputs, 'c.tab'), 'w') as fh:
+            fh.write('x')
+        touch_later(inputs)
+        assert cache.get(config, 'setup') is None
+        assert len(validated(config, cache)['libraries']['AAAA']['assign']) == 3
+
+    def test_new_file_below_glob_directory(self, config, inputs):
+        for name in ['a', 'b']:
+            os.mkdir(os.path.join(inputs, name))
+        with open(os.path.join(inputs, 'a', 'x.tab'), 'w') as fh:
+            fh.write('x')
+        config['libraries']['AAAA']['assign'] = [os.path.join(inputs, '*', 'x.tab')]
+        cache = ValidationCache()
+        assert len(validated(config, cache)['libraries']['AAAA']['assign']) == 1
+        with open(os.path.join(inputs, 'b', 'x.tab'), 'w') as fh:
+            fh.write('x')
+        touch_later(os.path.join(inputs, 'b'))
+        assert cache.get(config, 'setup') is None
+        assert len(validated(config, cache)['libraries']['AAAA']['assign']) == 2
+
+    def test_on_disk(self, config, tmp_path, request):
+        directory = str(tmp_path / 'cache')
+        expected = validated(config, ValidationCache(directory))
+        request.getfixturevalue('no_validation')
+        assert validated(config, ValidationCache(directory)) == expected
+
+    def test_clear(self, config, tmp_path):
+        directory = str(tmp_path / 'cache')
+        validated(config, ValidationCache(directory))
+        ValidationCache(directory).clear()
+        assert os.listdir(directory) == []
+
+    def test_evicts(self, config):
+        cache = ValidationCache(max_entries=1)
+        validated(config, cache)
+        validated(config, cache, stage='cluster')
+        assert cache.get(config, 'setup') is None
+
+    def test_failed_validation_not_cached(self, config):
+        cache = ValidationCache()
+        config['reference.annotations'] = ['/does/not/exist']
+        with pytest.raises(FileNotFoundError):
+            validated(config, cache)
+        assert cache.get(config, 'setup') is None